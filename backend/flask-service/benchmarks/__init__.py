@@ -0,0 +1,7 @@
+"""
+Performance tooling for the Flask service.
+
+Modules in this package are run as scripts from the service root, e.g.:
+
+    python -m benchmarks.loadtest --base-url http://localhost:5000
+"""
@@ -0,0 +1,423 @@
+"""
+End-to-end load harness for the Flask API.
+
+Drives a running instance of the service (backed by a real Postgres and
+Redis, e.g. ``docker-compose up postgres redis backend``) through a
+sequence of realistic phases:
+
+    auth       register burst followed by a login burst
+    create     hosts create meetings (some with a waiting room)
+    join       join storm: every attendee joins the same meeting at once
+    approve    hosts drain their waiting rooms
+    steady     weighted mix of list polling, lookups, approvals and logins
+               (--mix telemetry / refresh / search drive stats ingestion,
+               token rotation or full-text search instead)
+
+Per-endpoint p50/p95/p99 latency and throughput are printed and written
+as JSON. When a baseline file exists the run is compared against it and
+the process exits non-zero on regression, so it can gate a deploy.
+
+Usage:
+    python -m benchmarks.loadtest --base-url http://localhost:5000 \\
+        --users 200 --concurrency 32 --duration 60
+    python -m benchmarks.loadtest --save-baseline
+"""
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, UTC
+from urllib.parse import urlparse
+
+from .stats import compare, format_table, load_results, save_results, summarize
+
+DEFAULT_BASELINE = 'benchmarks/baselines/loadtest.json'
+PASSWORD = 'Load-test1!'
+
+# Weighted action mixes for the steady phase
+MIXES = {
+    'dashboard': {
+        'list_meetings': 60,
+        'get_meeting': 20,
+        'waiting_room': 10,
+        'login': 5,
+        'create_meeting': 5
+    },
+    'polling': {
+        'list_meetings': 80,
+        'get_meeting': 20
+    },
+    'auth': {
+        'login': 70,
+        'register': 30
+    },
+    'telemetry': {
+        'telemetry': 90,
+        'get_meeting': 10
+    },
+    'refresh': {
+        'refresh': 100
+    },
+    'search': {
+        'search': 80,
+        'list_meetings': 20
+    }
+}
+
+# Search queries for the search mix; created meetings are titled "Load meeting <run id>"
+SEARCH_QUERIES = ['load meeting', 'generated', '"load meeting"', 'benchmarks -nothing', 'meeting']
+
+
+class Recorder:
+    """Thread-safe collector of per-endpoint latency samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.window = {}
+
+    def record(self, label, started, elapsed_ms, status):
+        with self._lock:
+            self.samples[label].append(elapsed_ms)
+            self.statuses[label][str(status)] += 1
+            if status == 0 or status >= 500:
+                self.errors[label] += 1
+            first, last = self.window.get(label, (started, started))
+            self.window[label] = (min(first, started), max(last, started + elapsed_ms / 1000.0))
+
+    def summaries(self):
+        result = {}
+        for label, samples in self.samples.items():
+            first, last = self.window[label]
+            summary = summarize(samples, errors=self.errors[label], elapsed_s=max(last - first, 1e-6))
+            summary['statuses'] = dict(self.statuses[label])
+            result[label] = summary
+        return result
+
+
+class Client:
+    """Minimal keep-alive JSON client; one instance per worker thread."""
+
+    def __init__(self, base_url, recorder, timeout=30):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.conn_cls = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+        self.recorder = recorder
+        self.timeout = timeout
+        self.conn = None
+
+    def request(self, label, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+
+        started = time.time()
+        t0 = time.perf_counter()
+        status, data = 0, None
+        try:
+            if self.conn is None:
+                self.conn = self.conn_cls(self.host, self.port, timeout=self.timeout)
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            raw = response.read()
+            status = response.status
+            if raw:
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    data = None
+        except (OSError, http.client.HTTPException):
+            if self.conn is not None:
+                self.conn.close()
+            self.conn = None
+        finally:
+            self.recorder.record(label, started, (time.perf_counter() - t0) * 1000.0, status)
+        return status, data
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = Recorder()
+        self.run_id = uuid.uuid4().hex[:8]
+        self.users = []
+        self.meetings = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # -- helpers ---------------------------------------------------------
+
+    def client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = Client(self.args.base_url, self.recorder)
+            self._local.client = client
+        return client
+
+    def run_parallel(self, fn, items):
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            return list(pool.map(fn, items))
+
+    def new_user(self, index):
+        tag = f'{self.run_id}-{index}'
+        return {
+            'email': f'load-{tag}@example.com',
+            'name': f'load {tag}',
+            'password': PASSWORD,
+            'token': None,
+            'refresh_token': None
+        }
+
+    # -- actions ---------------------------------------------------------
+
+    def register(self, user):
+        status, data = self.client().request('POST /api/auth/register', 'POST', '/api/auth/register', {
+            'email': user['email'],
+            'name': user['name'],
+            'password': user['password']
+        })
+        if status == 201 and data:
+            user['token'] = data['token']
+            user['refresh_token'] = data.get('refresh_token')
+            user['id'] = data['user']['id']
+        return user
+
+    def login(self, user):
+        status, data = self.client().request('POST /api/auth/login', 'POST', '/api/auth/login', {
+            'email': user['email'],
+            'password': user['password']
+        })
+        if status == 200 and data:
+            user['token'] = data['token']
+            user['refresh_token'] = data.get('refresh_token')
+            user['id'] = data['user']['id']
+        return user
+
+    def refresh(self, user):
+        # Rotation consumes the refresh token, so a user must not refresh concurrently
+        with user.setdefault('lock', threading.Lock()):
+            if not user.get('refresh_token'):
+                return
+            status, data = self.client().request('POST /api/auth/refresh', 'POST', '/api/auth/refresh', {
+                'refresh_token': user['refresh_token']
+            })
+            if status == 200 and data:
+                user['token'] = data['token']
+                user['refresh_token'] = data['refresh_token']
+
+    def create_meeting(self, host, requires_approval=False):
+        start = datetime.now(UTC) + timedelta(minutes=1)
+        status, data = self.client().request('POST /api/meetings/create', 'POST', '/api/meetings/create', {
+            'title': f'Load meeting {self.run_id}',
+            'description': 'Generated by benchmarks.loadtest',
+            'start_time': start.isoformat(),
+            'end_time': (start + timedelta(hours=2)).isoformat(),
+            'requires_approval': requires_approval
+        }, token=host['token'])
+        if status == 201 and data:
+            meeting = {'id': data['id'], 'host': host, 'requires_approval': requires_approval}
+            with self._lock:
+                self.meetings.append(meeting)
+            return meeting
+        return None
+
+    def join_meeting(self, user, meeting):
+        return self.client().request(
+            'GET /api/meetings/join/<id>', 'GET', f"/api/meetings/join/{meeting['id']}", token=user['token']
+        )
+
+    def list_meetings(self, user):
+        return self.client().request('GET /api/meetings/list', 'GET', '/api/meetings/list', token=user['token'])
+
+    def get_meeting(self, user, meeting):
+        return self.client().request(
+            'GET /api/meetings/<id>', 'GET', f"/api/meetings/{meeting['id']}", token=user['token']
+        )
+
+    def search(self, user, rng):
+        query = rng.choice(SEARCH_QUERIES).replace(' ', '+').replace('"', '%22')
+        return self.client().request(
+            'GET /api/meetings/search', 'GET', f'/api/meetings/search?q={query}&limit=20', token=user['token']
+        )
+
+    def post_telemetry(self, user, meeting, rng, samples=50):
+        # One client stats batch: a sample per 100 ms over the last few seconds
+        now = time.time()
+        batch = [{
+            'ts': now - i * 0.1,
+            'rtt_ms': rng.uniform(20, 300),
+            'jitter_ms': rng.uniform(0, 30),
+            'packet_loss': rng.uniform(0, 0.05)
+        } for i in range(samples)]
+        return self.client().request(
+            'POST /api/meetings/<id>/telemetry', 'POST', f"/api/meetings/{meeting['id']}/telemetry",
+            body={'samples': batch}, token=user['token']
+        )
+
+    def drain_waiting_room(self, meeting):
+        host = meeting['host']
+        status, data = self.client().request(
+            'GET /api/meetings/<id>/waiting-room', 'GET',
+            f"/api/meetings/{meeting['id']}/waiting-room", token=host['token']
+        )
+        if status != 200 or not data:
+            return
+        for waiting in data.get('waiting_participants', []):
+            self.client().request(
+                'POST /api/meetings/<id>/participants/<pid>/approve', 'POST',
+                f"/api/meetings/{meeting['id']}/participants/{waiting['id']}/approve", token=host['token']
+            )
+
+    # -- phases ----------------------------------------------------------
+
+    def phase_auth(self):
+        users = [self.new_user(i) for i in range(self.args.users)]
+        self.users = [u for u in self.run_parallel(self.register, users) if u.get('token')]
+        self.run_parallel(self.login, self.users)
+
+    def phase_create(self):
+        host_count = max(1, len(self.users) // self.args.attendees_per_host)
+        hosts = self.users[:host_count]
+        self.run_parallel(lambda pair: self.create_meeting(pair[1], requires_approval=pair[0] % 2 == 1),
+                          list(enumerate(hosts)))
+
+    def phase_join(self):
+        if not self.meetings:
+            return
+        host_ids = {m['host']['id'] for m in self.meetings}
+        attendees = [u for u in self.users if u.get('id') not in host_ids]
+        # Every attendee hits the same waiting-room meeting simultaneously
+        target = next((m for m in self.meetings if m['requires_approval']), self.meetings[0])
+        barrier = threading.Barrier(min(len(attendees), self.args.concurrency) or 1)
+
+        def storm(user):
+            try:
+                barrier.wait(timeout=10)
+            except threading.BrokenBarrierError:
+                pass
+            self.join_meeting(user, target)
+
+        self.run_parallel(storm, attendees)
+
+    def phase_approve(self):
+        self.run_parallel(self.drain_waiting_room, [m for m in self.meetings if m['requires_approval']])
+
+    def phase_steady(self):
+        if not self.users:
+            return
+        mix = MIXES[self.args.mix]
+        actions = list(mix.keys())
+        weights = list(mix.values())
+        deadline = time.monotonic() + self.args.duration
+        counter = [0]
+
+        def worker(_):
+            rng = random.Random()
+            while time.monotonic() < deadline:
+                action = rng.choices(actions, weights)[0]
+                user = rng.choice(self.users)
+                meeting = rng.choice(self.meetings) if self.meetings else None
+                if action == 'list_meetings':
+                    self.list_meetings(user)
+                elif action == 'get_meeting' and meeting:
+                    self.get_meeting(meeting['host'], meeting)
+                elif action == 'waiting_room' and meeting:
+                    self.drain_waiting_room(meeting)
+                elif action == 'telemetry' and meeting:
+                    self.post_telemetry(meeting['host'], meeting, rng)
+                elif action == 'search':
+                    self.search(user, rng)
+                elif action == 'login':
+                    self.login(user)
+                elif action == 'refresh':
+                    self.refresh(user)
+                elif action == 'create_meeting':
+                    self.create_meeting(user)
+                elif action == 'register':
+                    with self._lock:
+                        counter[0] += 1
+                        index = self.args.users + counter[0]
+                    self.register(self.new_user(index))
+
+        self.run_parallel(worker, range(self.args.concurrency))
+
+    def run(self):
+        phases = [p.strip() for p in self.args.phases.split(',') if p.strip()]
+        timings = {}
+        for phase in phases:
+            started = time.perf_counter()
+            getattr(self, f'phase_{phase}')()
+            timings[phase] = round(time.perf_counter() - started, 3)
+            print(f'phase {phase:<8} {timings[phase]:>8.2f}s', file=sys.stderr)
+        return {
+            'meta': {
+                'run_id': self.run_id,
+                'base_url': self.args.base_url,
+                'users': self.args.users,
+                'concurrency': self.args.concurrency,
+                'mix': self.args.mix,
+                'duration': self.args.duration,
+                'phases': timings,
+                'finished_at': datetime.now(UTC).isoformat()
+            },
+            'endpoints': self.recorder.summaries()
+        }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the meeting API')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--users', type=int, default=100, help='users registered in the auth phase')
+    parser.add_argument('--attendees-per-host', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to run the steady phase')
+    parser.add_argument('--mix', choices=sorted(MIXES), default='dashboard')
+    parser.add_argument('--phases', default='auth,create,join,approve,steady')
+    parser.add_argument('--output', default='benchmarks/results/loadtest.json')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed relative p95/throughput change')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = LoadTest(args).run()
+    endpoints = results['endpoints']
+
+    print(format_table(endpoints))
+    save_results(args.output, results)
+
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    baseline = load_results(args.baseline)
+    if not baseline:
+        print(f'No baseline at {args.baseline}; skipping comparison')
+        return 0
+
+    rows = compare(endpoints, baseline.get('endpoints', {}), tolerance=args.tolerance)
+    regressions = [r for r in rows if r['regressed']]
+    for row in rows:
+        print(f"{row['name']:<48} {row['status']:<10} "
+              f"p95 {row.get('latency_delta', 0):+.1%}  rps {row.get('throughput_delta', 0):+.1%}")
+    if regressions:
+        print(f'{len(regressions)} endpoint(s) regressed beyond {args.tolerance:.0%}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
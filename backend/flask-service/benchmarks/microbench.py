@@ -0,0 +1,490 @@
+"""
+Microbenchmarks for hot Python-level functions in the Flask service.
+
+Each case isolates one function (token decoding, input validation,
+sanitization, serialization, socket relays) so that per-commit deltas are
+not drowned out by network or database noise. The database is an
+in-memory SQLite instance and Redis is never dialed; nothing here needs
+a running service.
+
+Results are written as JSON keyed by case name and tagged with the
+current git commit, so two runs can be compared directly:
+
+    python -m benchmarks.microbench
+    python -m benchmarks.microbench --filter to_dict --compare benchmarks/results/micro-<sha>.json
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, UTC
+
+from .stats import compare, load_results, save_results
+
+CASES = {}
+
+
+def bench(name):
+    """Register a benchmark case. The decorated setup returns the callable to time."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def measure(fn, min_time=0.2, repeat=5):
+    """
+    Time fn, auto-calibrating the loop count so each repeat runs >= min_time.
+
+    Returns:
+        Dictionary of per-call timings in microseconds
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    runs = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - start) / number)
+
+    return {
+        'loops': number,
+        'repeat': repeat,
+        'min_us': round(min(runs) * 1e6, 4),
+        'median_us': round(statistics.median(runs) * 1e6, 4),
+        'stdev_us': round(statistics.pstdev(runs) * 1e6, 4),
+        'ops_per_sec': round(1.0 / statistics.median(runs), 1)
+    }
+
+
+class Fixtures:
+    """Lazily built application, database rows and tokens shared by cases."""
+
+    def __init__(self):
+        from src import create_app, db
+        from src.config import TestConfig
+        from src.models import User
+
+        self.app = app = create_app(TestConfig)
+        self.db = db
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.user = User.query.filter_by(email='bench@example.com').first()
+        if not self.user:
+            self.user = User(email='bench@example.com', name='bench user', password='Bench-pass1!')
+            db.session.add(self.user)
+            db.session.commit()
+
+        import jwt
+        self.token = jwt.encode({
+            'user_id': self.user.id,
+            'email': self.user.email,
+            'exp': datetime.now(UTC) + timedelta(hours=1),
+            'iat': datetime.now(UTC),
+            'type': 'access'
+        }, app.config['JWT_SECRET_KEY'], algorithm='HS256')
+
+
+_fixtures = None
+
+
+def fixtures():
+    global _fixtures
+    if _fixtures is None:
+        _fixtures = Fixtures()
+    return _fixtures
+
+
+def _now():
+    return datetime.now(UTC)
+
+
+# -- authentication ------------------------------------------------------
+
+@bench('auth.jwt_decode')
+def _jwt_decode():
+    import jwt
+    fx = fixtures()
+    secret = fx.app.config['JWT_SECRET_KEY']
+    return lambda: jwt.decode(fx.token, secret, algorithms=['HS256'])
+
+
+@bench('auth.issue_token_pair')
+def _issue_token_pair():
+    from src import tokens
+    fx = fixtures()
+    return lambda: tokens.issue(fx.user)
+
+
+@bench('auth.decode_access')
+def _decode_access():
+    # Signature and claims checks only; the revocation MGET needs Redis
+    from src import tokens
+    fx = fixtures()
+    tokens.redis = None
+    token = tokens.issue(fx.user)['token']
+    return lambda: tokens.decode_access(token)
+
+
+@bench('auth.token_required')
+def _token_required():
+    from src.routes.meetings import token_required
+    fx = fixtures()
+
+    @token_required
+    def view(current_user):
+        return current_user
+
+    headers = {'Authorization': f'Bearer {fx.token}'}
+
+    def run():
+        with fx.app.test_request_context('/', headers=headers):
+            view()
+    return run
+
+
+# -- validation ----------------------------------------------------------
+
+def _register_body(**overrides):
+    return {'email': ' Someone.Name+tag@Example-Domain.com', 'name': 'Someone Name',
+            'password': 'Correct-Horse1!', **overrides}
+
+
+def _meeting_body(**overrides):
+    start = datetime.now(UTC) + timedelta(days=1)
+    return {'title': 'Weekly sync <b>planning</b> & review', 'description': 'Agenda & notes',
+            'start_time': start.isoformat(), 'end_time': (start + timedelta(hours=1)).isoformat(),
+            'meeting_type': 'recurring', 'recurring_pattern': 'weekly', 'max_participants': 25,
+            'requires_approval': True, 'co_hosts': [2, 3, 4], **overrides}
+
+
+def _handwritten_register(data):
+    """The checks register() ran before REGISTER_SCHEMA; returns the first error."""
+    import re
+    if not all(k in data for k in ['email', 'name', 'password']):
+        return 'Missing required fields'
+    email = data['email'].strip().lower()
+    name = data['name'].strip()
+    password = data['password']
+    if not email or len(email) > 120 or not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        return 'Invalid email format or length'
+    if (not password or len(password) > 72 or len(password) < 8 or not re.search(r'[A-Z]', password)
+            or not re.search(r'[a-z]', password) or not re.search(r'[0-9]', password)
+            or not re.search(r'[!@#$%^&*(),.?":{}|<>]', password)):
+        return 'Password does not meet requirements'
+    if not name or len(name) > 100 or not re.match(r'^[a-zA-Z0-9\s.-]{3,100}$', name):
+        return 'Invalid name format or length'
+    return None
+
+
+def _handwritten_create_meeting(data):
+    """The checks create_meeting() ran before CREATE_MEETING_SCHEMA; returns the first error."""
+    import bleach
+    if not all(field in data for field in ['title', 'description', 'start_time', 'end_time']):
+        return 'Missing required fields'
+    title = bleach.clean(data['title'].strip())
+    description = bleach.clean(data['description'].strip())
+    if not title or len(title) > 200 or len(description) > 2000:
+        return 'Invalid title or description'
+    try:
+        start_time = datetime.fromisoformat(data['start_time'].replace('Z', '+00:00'))
+        end_time = datetime.fromisoformat(data['end_time'].replace('Z', '+00:00'))
+        if not start_time.tzinfo or not end_time.tzinfo:
+            return 'Timezone information is required'
+    except ValueError:
+        return 'Invalid datetime format. Please use ISO format'
+    current_time = datetime.now(UTC)
+    duration = (end_time - start_time).total_seconds()
+    if (start_time < current_time or start_time >= end_time or duration < 300 or duration > 86400
+            or (start_time - current_time).days > 365):
+        return 'Invalid meeting time'
+    meeting_type = data.get('meeting_type', 'regular')
+    if meeting_type not in ['regular', 'recurring', 'private']:
+        return 'Invalid meeting type'
+    max_participants = data.get('max_participants')
+    if max_participants is not None and (not isinstance(max_participants, int) or max_participants <= 0):
+        return 'Invalid maximum participants value'
+    if meeting_type == 'recurring' and data.get('recurring_pattern') not in ['daily', 'weekly', 'monthly', 'custom']:
+        return 'Invalid recurring pattern for recurring meeting'
+    co_hosts = data.get('co_hosts', [])
+    if not isinstance(co_hosts, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in co_hosts):
+        return 'Co-hosts must be a list of user ids'
+    return None
+
+
+def _validation_case(name, schema_path, handwritten, body):
+    """Register the schema and handwritten variants of one validation case."""
+    @bench(f'validation.{name}.schema')
+    def _schema():
+        import importlib
+        module, attr = schema_path.rsplit('.', 1)
+        schema = getattr(importlib.import_module(module), attr)
+        return lambda: schema.validate(body)
+
+    @bench(f'validation.{name}.handwritten')
+    def _handwritten():
+        return lambda: handwritten(body)
+
+
+_validation_case('register.valid', 'src.routes.auth.REGISTER_SCHEMA', _handwritten_register, _register_body())
+_validation_case('register.invalid', 'src.routes.auth.REGISTER_SCHEMA', _handwritten_register,
+                 _register_body(email='not-an-email-' + 'x' * 80, password='alllowercaseletters'))
+_validation_case('create_meeting.valid', 'src.routes.meetings.CREATE_MEETING_SCHEMA', _handwritten_create_meeting,
+                 _meeting_body())
+_validation_case('create_meeting.invalid', 'src.routes.meetings.CREATE_MEETING_SCHEMA', _handwritten_create_meeting,
+                 _meeting_body(start_time='tomorrow', meeting_type='webinar', max_participants=0))
+
+
+# -- sanitization --------------------------------------------------------
+
+@bench('bleach.clean.title')
+def _bleach_title():
+    import bleach
+    title = 'Weekly sync <b>planning</b> & review'
+    return lambda: bleach.clean(title.strip())
+
+
+@bench('bleach.clean.description')
+def _bleach_description():
+    import bleach
+    description = ('Agenda: <ul><li>status</li><li>blockers</li></ul> '
+                   '<script>alert(1)</script> notes & links <a href="https://example.com">here</a>. ') * 12
+    description = description[:2000]
+    return lambda: bleach.clean(description.strip())
+
+
+# -- serialization -------------------------------------------------------
+
+@bench('to_dict.user')
+def _user_to_dict():
+    fx = fixtures()
+    return fx.user.to_dict
+
+
+@bench('to_dict.meeting')
+def _meeting_to_dict():
+    from src.models import Meeting
+    fixtures()
+    now = _now()
+    meeting = Meeting(title='Bench meeting', description='Description', start_time=now,
+                      end_time=now + timedelta(hours=1), created_by=1)
+    meeting.id = 1
+    meeting.created_at = meeting.updated_at = now
+    return meeting.to_dict
+
+
+@bench('to_dict.meeting_participant')
+def _participant_to_dict():
+    from src.models import MeetingParticipant
+    fixtures()
+    now = _now()
+    participant = MeetingParticipant(meeting_id=1, user_id=1, status='approved')
+    participant.id = 1
+    participant.is_banned = False
+    participant.joined_at = participant.created_at = participant.updated_at = now
+    return participant.to_dict
+
+
+@bench('to_dict.meeting_co_host')
+def _co_host_to_dict():
+    from src.models import MeetingCoHost
+    fixtures()
+    now = _now()
+    co_host = MeetingCoHost(meeting_id=1, user_id=1)
+    co_host.id = 1
+    co_host.created_at = co_host.updated_at = now
+    return co_host.to_dict
+
+
+@bench('to_dict.meeting_audit_log')
+def _audit_log_to_dict():
+    from src.models import MeetingAuditLog
+    fixtures()
+    log = MeetingAuditLog(meeting_id=1, user_id=1, action='joined', details={'role': 'attendee'})
+    log.id = 1
+    log.created_at = _now()
+    return log.to_dict
+
+
+@bench('responses.api_response')
+def _api_response():
+    from src.utils.responses import api_response
+    fx = fixtures()
+    payload = {'id': 1, 'title': 'Bench meeting', 'participants': list(range(20))}
+
+    def run():
+        with fx.app.test_request_context('/'):
+            api_response(data=payload, message='ok')
+    return run
+
+
+# -- socket relays -------------------------------------------------------
+
+class _CapturingSocketIO:
+    """Collects handlers registered via socketio.on() without a server."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event):
+        def register(fn):
+            self.handlers[event] = fn
+            return fn
+        return register
+
+
+def _socket_handler(event):
+    from src.utils import socket_events
+    fx = fixtures()
+    sio = _CapturingSocketIO()
+    socket_events.register_socket_events(sio)
+    # Relay cost is what we measure; delivery is the transport's job
+    socket_events.emit = lambda *args, **kwargs: None
+    socket_events.join_room = socket_events.leave_room = lambda *args, **kwargs: None
+    return sio.handlers[event], fx.token
+
+
+@bench('socket.offer')
+def _socket_offer():
+    handler, token = _socket_handler('offer')
+    return lambda: handler({'token': token, 'target_user': 'sid-2', 'sdp': 'v=0\r\n' * 40})
+
+
+@bench('socket.ice_candidate')
+def _socket_ice():
+    handler, token = _socket_handler('ice_candidate')
+    return lambda: handler({'token': token, 'target_user': 'sid-2',
+                            'candidate': 'candidate:1 1 udp 2122260223 10.0.0.1 54321 typ host'})
+
+
+@bench('socket.chat_message')
+def _socket_chat():
+    handler, token = _socket_handler('chat_message')
+    return lambda: handler({'token': token, 'meeting_code': 'room-1', 'message': 'hello',
+                            'timestamp': '2024-01-01T00:00:00Z'})
+
+
+# -- telemetry -----------------------------------------------------------
+
+@bench('telemetry.validate_downsample_50')
+def _telemetry_batch():
+    import random
+    from src.utils.telemetry import downsample, validate_samples
+
+    # One client stats batch, as posted to /telemetry
+    rng = random.Random(42)
+    now = time.time()
+    batch = [{'ts': now - i * 0.1, 'rtt_ms': rng.uniform(20, 300), 'jitter_ms': rng.uniform(0, 30),
+              'packet_loss': rng.uniform(0, 0.05)} for i in range(50)]
+
+    def run():
+        valid, _ = validate_samples(batch, 200, 600, now=now)
+        downsample(valid, 10)
+    return run
+
+
+# -- analytics -----------------------------------------------------------
+
+@bench('analytics.compute_100k')
+def _analytics_compute():
+    import numpy as np
+    from src.jobs.analytics import compute_participation, meeting_aggregates
+
+    # A day of participations: 100k rows across 2k meetings, ~10% still open
+    rng = np.random.default_rng(42)
+    n, meetings = 100_000, 2_000
+    meeting_ids = np.sort(rng.integers(1, meetings + 1, n)).astype(np.float64)
+    start = 1.7e9 + meeting_ids * 600.0
+    end = start + 3600.0
+    joined = start + rng.uniform(-300, 1800, n)
+    left = np.where(rng.random(n) < 0.1, np.nan, joined + rng.uniform(60, 3600, n))
+    rows = np.column_stack([np.arange(1, n + 1), meeting_ids, rng.integers(1, 50_000, n),
+                            joined, left, np.full(n, np.nan), start, end])
+    keys = np.unique(rows[:, 1:3], axis=0)
+    joins = np.column_stack([keys, rng.integers(1, 4, len(keys)), start[:len(keys)]])
+
+    def run():
+        meeting_aggregates(rows, compute_participation(rows, joins))
+    return run
+
+
+# -- calendar ------------------------------------------------------------
+
+@bench('calendar.render_feed')
+def _calendar_render():
+    from types import SimpleNamespace
+    from src.utils.ical import feed_window, render_calendar
+
+    # A busy user's feed: 5 daily and 5 weekly series plus 40 one-off meetings
+    window_start, window_end = feed_window(datetime(2024, 6, 1, tzinfo=UTC))
+    base = datetime(2024, 5, 1, 9, 0)
+    meetings = [
+        SimpleNamespace(id=i, title=f'Meeting {i}, weekly sync', description='Agenda; notes\nfollow-ups',
+                        start_time=base + timedelta(days=i, hours=i % 8),
+                        end_time=base + timedelta(days=i, hours=i % 8, minutes=30),
+                        updated_at=base, ended_at=None, parent_meeting_id=None,
+                        recurring_pattern='daily' if i < 5 else 'weekly' if i < 10 else None)
+        for i in range(50)
+    ]
+    return lambda: render_calendar(meetings, 'example.com', window_start, window_end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run backend microbenchmarks')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this string')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per repeat')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help='defaults to benchmarks/results/micro-<commit>.json')
+    parser.add_argument('--compare', default=None, help='previous results file to diff against')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    results = {}
+    for name in sorted(CASES):
+        if args.filter and args.filter not in name:
+            continue
+        fn = CASES[name]()
+        results[name] = measure(fn, min_time=args.min_time, repeat=args.repeat)
+        r = results[name]
+        print(f"{name:<36} {r['median_us']:>12.3f} us  {r['ops_per_sec']:>14,.0f} ops/s")
+
+    output = args.output or f'benchmarks/results/micro-{commit}.json'
+    save_results(output, {
+        'meta': {'commit': commit, 'python': sys.version.split()[0], 'finished_at': _now().isoformat()},
+        'cases': results
+    })
+    print(f'Results written to {output}')
+
+    previous = load_results(args.compare) if args.compare else None
+    if previous:
+        rows = compare(results, previous.get('cases', {}), tolerance=args.tolerance,
+                       metric='median_us', throughput_key=None)
+        for row in rows:
+            print(f"{row['name']:<36} {row['status']:<10} {row.get('latency_delta', 0):+.1%}")
+        if any(r['regressed'] for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
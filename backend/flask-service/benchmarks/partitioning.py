@@ -0,0 +1,195 @@
+"""
+Plain vs hash-partitioned meeting_participants on PostgreSQL.
+
+Builds two scratch copies of the table, one plain and one hash-partitioned
+by meeting_id as in migrations/versions/participant_partitions.py, with the
+same indexes, and runs the same workload against each:
+
+    insert   join traffic: single-row INSERT + COMMIT from --concurrency
+             threads, spread over --meetings meetings (rows/s, latency)
+    churn    approve-then-leave updates on half the rows, leaving dead
+             tuples and index entries behind as a busy day would
+    vacuum   VACUUM (ANALYZE) of the whole table, and of each partition
+             on its own; autovacuum works one partition at a time, so the
+             slowest partition bounds how long any one run holds on
+
+Sizes (heap + indexes) are reported after the churn. Needs a PostgreSQL
+database it may create and drop bench_participants_* tables in:
+
+    python -m benchmarks.partitioning --database-url postgresql+psycopg2://... --rows 200000
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+from .stats import save_results, summarize
+
+COLUMNS = """
+    id BIGSERIAL,
+    meeting_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    role VARCHAR(20) NOT NULL DEFAULT 'attendee',
+    joined_at TIMESTAMP,
+    left_at TIMESTAMP,
+    is_banned BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    updated_at TIMESTAMP NOT NULL DEFAULT now(),
+    total_time INTEGER
+"""
+
+# Same as the hot table's indexes
+INDEXES = [
+    ('open', 'meeting_id, status', 'left_at IS NULL'),
+    ('meeting_user', 'meeting_id, user_id', None),
+    ('user_open', 'user_id, meeting_id', 'left_at IS NULL'),
+    ('user_updated', 'user_id, updated_at', None),
+]
+
+
+def create_table(conn, layout, partitions):
+    """Create bench_participants_<layout> with its indexes; returns the names of the tables to vacuum."""
+    table = f'bench_participants_{layout}'
+    conn.exec_driver_sql(f'DROP TABLE IF EXISTS {table}')
+    if layout == 'plain':
+        conn.exec_driver_sql(f'CREATE TABLE {table} ({COLUMNS}, PRIMARY KEY (id))')
+        leaves = [table]
+    else:
+        conn.exec_driver_sql(f'CREATE TABLE {table} ({COLUMNS}, PRIMARY KEY (id, meeting_id)) '
+                             f'PARTITION BY HASH (meeting_id)')
+        leaves = []
+        for remainder in range(partitions):
+            leaf = f'{table}_p{remainder:02d}'
+            conn.exec_driver_sql(f'CREATE TABLE {leaf} PARTITION OF {table} '
+                                 f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})')
+            leaves.append(leaf)
+    for name, columns, where in INDEXES:
+        conn.exec_driver_sql(f'CREATE INDEX {table}_{name} ON {table} ({columns})'
+                             + (f' WHERE {where}' if where else ''))
+    # Measure the benchmark's vacuums, not autovacuum's
+    for leaf in leaves:
+        conn.exec_driver_sql(f'ALTER TABLE {leaf} SET (autovacuum_enabled = false)')
+    return table, leaves
+
+
+def insert_phase(engine, table, rows, meetings, concurrency, seed):
+    """Single-row join inserts from concurrent threads."""
+    latencies = []
+    lock = threading.Lock()
+    per_thread = rows // concurrency
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        samples = []
+        with engine.connect() as conn:
+            for _ in range(per_thread):
+                meeting_id = rng.randrange(1, meetings + 1)
+                started = time.perf_counter()
+                conn.exec_driver_sql(
+                    f'INSERT INTO {table} (meeting_id, user_id, status) VALUES (%s, %s, %s)',
+                    (meeting_id, rng.randrange(1, rows), 'pending')
+                )
+                conn.commit()
+                samples.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, elapsed_s=time.perf_counter() - started)
+
+
+def churn_phase(engine, table):
+    """Approve, then close, every other participation: two dead versions per touched row."""
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"UPDATE {table} SET status = 'approved', joined_at = now(), updated_at = now() "
+                             f"WHERE id % 2 = 0")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f'UPDATE {table} SET left_at = now(), total_time = 60, updated_at = now() '
+                             f'WHERE id % 2 = 0')
+    return round(time.perf_counter() - started, 3)
+
+
+def relation_size(conn, table):
+    """Heap plus index bytes, summed over partitions."""
+    return conn.exec_driver_sql(
+        'SELECT coalesce(sum(pg_total_relation_size(relid)), 0) FROM pg_partition_tree(%s)', (table,)
+    ).scalar()
+
+
+def vacuum_phase(engine, table, leaves):
+    """Vacuum each leaf table on its own, then report the total and the slowest one."""
+    timings = []
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for leaf in leaves:
+            started = time.perf_counter()
+            conn.exec_driver_sql(f'VACUUM (ANALYZE) {leaf}')
+            timings.append(time.perf_counter() - started)
+    return {
+        'vacuum_total_s': round(sum(timings), 3),
+        'vacuum_max_table_s': round(max(timings), 3),
+        'tables': len(leaves)
+    }
+
+
+def run_layout(engine, layout, args):
+    with engine.begin() as conn:
+        table, leaves = create_table(conn, layout, args.partitions)
+    try:
+        result = {'insert': insert_phase(engine, table, args.rows, args.meetings, args.concurrency, args.seed)}
+        result['churn_s'] = churn_phase(engine, table)
+        with engine.connect() as conn:
+            result['size_mb_before_vacuum'] = round(relation_size(conn, table) / 2 ** 20, 1)
+        result.update(vacuum_phase(engine, table, leaves))
+        return result
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f'DROP TABLE IF EXISTS {table}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare plain and hash-partitioned meeting_participants')
+    parser.add_argument('--database-url', default=os.getenv('BENCH_DATABASE_URL', ''))
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--meetings', type=int, default=5000)
+    parser.add_argument('--partitions', type=int, default=16)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--keep', action='store_true', help='leave the scratch tables in place')
+    parser.add_argument('--output', default='benchmarks/results/partitioning.json')
+    args = parser.parse_args(argv)
+    if not args.database_url.startswith('postgresql'):
+        parser.error('--database-url (or BENCH_DATABASE_URL) must point at PostgreSQL')
+
+    from sqlalchemy import create_engine
+    engine = create_engine(args.database_url, pool_size=args.concurrency + 1)
+
+    results = {'rows': args.rows, 'meetings': args.meetings, 'partitions': args.partitions,
+               'concurrency': args.concurrency}
+    for layout in ('plain', 'hash'):
+        results[layout] = run_layout(engine, layout, args)
+
+    plain, hashed = results['plain'], results['hash']
+    print(f"{'':<28} {'plain':>12} {'hash':>12}")
+    print(f"{'insert rows/s':<28} {plain['insert']['throughput']:>12} {hashed['insert']['throughput']:>12}")
+    print(f"{'insert p95 ms':<28} {plain['insert']['p95_ms']:>12} {hashed['insert']['p95_ms']:>12}")
+    print(f"{'churn s':<28} {plain['churn_s']:>12} {hashed['churn_s']:>12}")
+    print(f"{'size MB (before vacuum)':<28} {plain['size_mb_before_vacuum']:>12} {hashed['size_mb_before_vacuum']:>12}")
+    print(f"{'vacuum total s':<28} {plain['vacuum_total_s']:>12} {hashed['vacuum_total_s']:>12}")
+    print(f"{'vacuum slowest table s':<28} {plain['vacuum_max_table_s']:>12} {hashed['vacuum_max_table_s']:>12}")
+
+    save_results(args.output, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
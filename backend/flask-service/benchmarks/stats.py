@@ -0,0 +1,137 @@
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Return the pct-th percentile of samples using linear interpolation.
+
+    Args:
+        samples: Sorted list of samples
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The interpolated percentile, or 0.0 for an empty list
+    """
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0]
+    rank = (len(samples) - 1) * (pct / 100.0)
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return samples[low]
+    return samples[low] + (samples[high] - samples[low]) * (rank - low)
+
+
+def summarize(latencies_ms: Iterable[float], errors: int = 0, elapsed_s: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Summarize a series of latency samples (in milliseconds).
+
+    Args:
+        latencies_ms: Latency samples in milliseconds
+        errors: Number of failed requests included in the samples
+        elapsed_s: Wall-clock duration used to compute throughput
+
+    Returns:
+        Dictionary with count, errors, throughput and p50/p95/p99/max
+    """
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        'count': count,
+        'errors': errors,
+        'throughput': round(count / elapsed_s, 2) if elapsed_s else None,
+        'mean_ms': round(sum(ordered) / count, 3) if count else 0.0,
+        'p50_ms': round(percentile(ordered, 50), 3),
+        'p95_ms': round(percentile(ordered, 95), 3),
+        'p99_ms': round(percentile(ordered, 99), 3),
+        'max_ms': round(ordered[-1], 3) if count else 0.0
+    }
+
+
+def load_results(path: str) -> Optional[Dict[str, Any]]:
+    """Load a JSON results file, returning None if it does not exist."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(path: str, results: Dict[str, Any]) -> None:
+    """Write results as pretty-printed JSON, creating parent directories."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = 0.15,
+    metric: str = 'p95_ms',
+    throughput_key: Optional[str] = 'throughput'
+) -> List[Dict[str, Any]]:
+    """
+    Compare per-name summaries against a baseline.
+
+    A name regresses when its latency metric grows by more than tolerance,
+    or when its throughput drops by more than tolerance.
+
+    Args:
+        current: Mapping of name -> summary for this run
+        baseline: Mapping of name -> summary from the stored baseline
+        tolerance: Allowed relative change (0.15 = 15%)
+        metric: Latency key to compare
+        throughput_key: Throughput key to compare, or None to skip
+
+    Returns:
+        List of comparison rows, each with a 'regressed' flag
+    """
+    rows = []
+    for name, summary in sorted(current.items()):
+        base = baseline.get(name)
+        if not base:
+            rows.append({'name': name, 'status': 'new', 'regressed': False})
+            continue
+
+        row = {'name': name, 'status': 'ok', 'regressed': False}
+        base_latency = base.get(metric) or 0.0
+        latency = summary.get(metric) or 0.0
+        if base_latency > 0:
+            row['latency_delta'] = round((latency - base_latency) / base_latency, 4)
+            if row['latency_delta'] > tolerance:
+                row['regressed'] = True
+
+        if throughput_key:
+            base_rate = base.get(throughput_key) or 0.0
+            rate = summary.get(throughput_key) or 0.0
+            if base_rate > 0:
+                row['throughput_delta'] = round((rate - base_rate) / base_rate, 4)
+                if row['throughput_delta'] < -tolerance:
+                    row['regressed'] = True
+
+        if row['regressed']:
+            row['status'] = 'regressed'
+        rows.append(row)
+    return rows
+
+
+def format_table(summaries: Dict[str, Dict[str, Any]]) -> str:
+    """Render per-name summaries as a fixed-width text table."""
+    header = f"{'name':<32} {'count':>8} {'err':>6} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+    lines = [header, '-' * len(header)]
+    for name, s in sorted(summaries.items()):
+        rps = s.get('throughput')
+        lines.append(
+            f"{name:<32} {s['count']:>8} {s.get('errors', 0):>6} "
+            f"{(f'{rps:.1f}' if rps is not None else '-'):>9} "
+            f"{s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,23 @@
+import os
+
+# Serving workers never run `flask db`; skip loading alembic at boot
+os.environ.setdefault('MIGRATIONS_ENABLED', 'false')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', '1'))
+
+# /api/events/stream holds a connection open for minutes; threaded workers
+# keep those from occupying a whole process each. EVENTS_MAX_STREAMS caps
+# how many threads the streams may hold, so keep it well below threads
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
+
+# Import the code and build the app once in the master; workers fork from it
+preload_app = True
+
+def post_fork(server, worker):
+    from src import reset_connections, start_background_tasks
+    app = server.app.wsgi()
+    reset_connections(app)
+    # Health prober and lifecycle sweeper run in workers, never in the master
+    start_background_tasks(app)
@@ -13,11 +13,17 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Get database URL from environment
-config.set_main_option('sqlalchemy.url', os.getenv('DATABASE_URL'))
-
-# Import the Flask app and get the metadata
-from src import app, db
+# Import the Flask app and get the metadata. Called from inside an app
+# context (e.g. flask_migrate.upgrade() in the query plan tests), migrate
+# that app's database; otherwise build the app and use DATABASE_URL.
+from flask import current_app, has_app_context
+from src import create_app, db
+if has_app_context():
+    app = current_app._get_current_object()
+    config.set_main_option('sqlalchemy.url', app.config['SQLALCHEMY_DATABASE_URI'].replace('%', '%%'))
+else:
+    config.set_main_option('sqlalchemy.url', os.getenv('DATABASE_URL'))
+    app = create_app()
 with app.app_context():
     # add your model's MetaData object here
     # for 'autogenerate' support
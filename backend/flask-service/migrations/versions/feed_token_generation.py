@@ -0,0 +1,22 @@
+"""Per-user calendar feed token generation
+
+Revision ID: feed_token_generation
+Revises: participant_partitions
+Create Date: 2024-04-30 10:00:00.000000
+
+Feed tokens never expire, so logout-all revokes them by bumping
+users.feed_generation rather than with a Redis key that would expire.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'feed_token_generation'
+down_revision = 'participant_partitions'
+
+def upgrade():
+    # A constant default is a catalog-only change on PostgreSQL 11+
+    op.add_column('users', sa.Column('feed_generation', sa.Integer(), nullable=False, server_default='0'))
+
+def downgrade():
+    op.drop_column('users', 'feed_generation')
@@ -0,0 +1,52 @@
+"""Composite and partial indexes for hot access paths
+
+Revision ID: hot_path_indexes
+Revises: initial_schema
+Create Date: 2024-03-18 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'hot_path_indexes'
+down_revision = 'initial_schema'
+
+def upgrade():
+    # Built concurrently so joins and roster writes are not blocked; that
+    # cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        # Open participations of a meeting: capacity checks, roster, ending a meeting
+        op.create_index(
+            'idx_meeting_participants_open', 'meeting_participants', ['meeting_id', 'status'],
+            postgresql_where=sa.text('left_at IS NULL'), postgresql_concurrently=True
+        )
+        # One user's participation in one meeting: join, ACL, telemetry flush
+        op.create_index(
+            'idx_meeting_participants_meeting_user', 'meeting_participants', ['meeting_id', 'user_id'],
+            postgresql_concurrently=True
+        )
+        # A user's open participations, joined to meetings.ended_at IS NULL
+        op.create_index(
+            'idx_meeting_participants_user_open', 'meeting_participants', ['user_id', 'meeting_id'],
+            postgresql_where=sa.text('left_at IS NULL'), postgresql_concurrently=True
+        )
+        # A creator's active meetings: overlap check and active-meeting limit
+        op.create_index(
+            'idx_meetings_creator_active', 'meetings', ['created_by', 'start_time', 'end_time'],
+            postgresql_where=sa.text('ended_at IS NULL'), postgresql_concurrently=True
+        )
+        # (meeting_id, user_id) serves every lookup the single-column index did
+        op.drop_index('idx_meeting_participants_meeting_id', table_name='meeting_participants',
+                      postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('idx_meeting_participants_meeting_id', 'meeting_participants', ['meeting_id'],
+                        postgresql_concurrently=True)
+        op.drop_index('idx_meetings_creator_active', table_name='meetings', postgresql_concurrently=True)
+        op.drop_index('idx_meeting_participants_user_open', table_name='meeting_participants',
+                      postgresql_concurrently=True)
+        op.drop_index('idx_meeting_participants_meeting_user', table_name='meeting_participants',
+                      postgresql_concurrently=True)
+        op.drop_index('idx_meeting_participants_open', table_name='meeting_participants',
+                      postgresql_concurrently=True)
@@ -0,0 +1,99 @@
+"""Hot/cold archival: archive tables for ended meetings and their child rows
+
+Revision ID: meeting_archive
+Revises: meeting_lifecycle
+Create Date: 2024-04-16 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic
+revision = 'meeting_archive'
+down_revision = 'meeting_lifecycle'
+
+def upgrade():
+    # Same columns as the hot tables, ids carried over; no foreign keys
+    op.create_table(
+        'meetings_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.Column('meeting_type', sa.String(20), nullable=False),
+        sa.Column('max_participants', sa.Integer(), nullable=True),
+        sa.Column('requires_approval', sa.Boolean(), nullable=False),
+        sa.Column('is_recorded', sa.Boolean(), nullable=False),
+        sa.Column('recording_url', sa.String(500), nullable=True),
+        sa.Column('recurring_pattern', sa.String(50), nullable=True),
+        sa.Column('parent_meeting_id', sa.Integer(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table(
+        'meeting_participants_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('role', sa.String(20), nullable=False),
+        sa.Column('joined_at', sa.DateTime(), nullable=True),
+        sa.Column('left_at', sa.DateTime(), nullable=True),
+        sa.Column('is_banned', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('total_time', sa.Integer(), nullable=True),
+        sa.Column('connection_quality', sa.Float(), nullable=True),
+        sa.Column('participation_score', sa.Float(), nullable=True),
+        sa.Column('feedback', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_meeting_participants_archive_meeting_user', 'meeting_participants_archive',
+                    ['meeting_id', 'user_id'])
+
+    op.create_table(
+        'meeting_co_hosts_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_meeting_co_hosts_archive_meeting_user', 'meeting_co_hosts_archive',
+                    ['meeting_id', 'user_id'])
+
+    op.create_table(
+        'meeting_audit_logs_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(50), nullable=False),
+        sa.Column('details', JSONB(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_meeting_audit_logs_archive_meeting', 'meeting_audit_logs_archive', ['meeting_id'])
+
+    with op.get_context().autocommit_block():
+        # "Meetings ended before the cutoff", for the archiver
+        op.create_index('idx_meetings_ended', 'meetings', ['ended_at'],
+                        postgresql_where=sa.text('ended_at IS NOT NULL'), postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_meetings_ended', table_name='meetings', postgresql_concurrently=True)
+
+    op.drop_index('idx_meeting_audit_logs_archive_meeting', table_name='meeting_audit_logs_archive')
+    op.drop_table('meeting_audit_logs_archive')
+    op.drop_index('idx_meeting_co_hosts_archive_meeting_user', table_name='meeting_co_hosts_archive')
+    op.drop_table('meeting_co_hosts_archive')
+    op.drop_index('idx_meeting_participants_archive_meeting_user', table_name='meeting_participants_archive')
+    op.drop_table('meeting_participants_archive')
+    op.drop_table('meetings_archive')
@@ -0,0 +1,22 @@
+"""Lifecycle sweeper: index of active meetings by end time
+
+Revision ID: meeting_lifecycle
+Revises: meeting_sync
+Create Date: 2024-04-09 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'meeting_lifecycle'
+down_revision = 'meeting_sync'
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # "Active meetings whose end_time has passed", oldest first
+        op.create_index('idx_meetings_active_end', 'meetings', ['end_time'],
+                        postgresql_where=sa.text('ended_at IS NULL'), postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_meetings_active_end', table_name='meetings', postgresql_concurrently=True)
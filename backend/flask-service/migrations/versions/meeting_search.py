@@ -0,0 +1,30 @@
+"""Full-text search vector on meetings
+
+Revision ID: meeting_search
+Revises: hot_path_indexes
+Create Date: 2024-03-25 10:00:00.000000
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = 'meeting_search'
+down_revision = 'hot_path_indexes'
+
+def upgrade():
+    # Kept up to date by PostgreSQL itself; not mapped on the model, queried
+    # through src/utils/search.py. The config must match SEARCH_CONFIG there.
+    op.execute("""
+        ALTER TABLE meetings ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index('idx_meetings_search_vector', 'meetings', ['search_vector'],
+                        postgresql_using='gin', postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_meetings_search_vector', table_name='meetings', postgresql_concurrently=True)
+    op.drop_column('meetings', 'search_vector')
@@ -0,0 +1,45 @@
+"""Meeting list delta sync: tombstones and change-tracking indexes
+
+Revision ID: meeting_sync
+Revises: meeting_search
+Create Date: 2024-04-02 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'meeting_sync'
+down_revision = 'meeting_search'
+
+def upgrade():
+    op.create_table(
+        'meeting_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_meeting_tombstones_user_created', 'meeting_tombstones', ['user_id', 'created_at'])
+
+    with op.get_context().autocommit_block():
+        # "What changed on this user's list since T", one index per branch
+        op.create_index('idx_meetings_creator_updated', 'meetings', ['created_by', 'updated_at'],
+                        postgresql_concurrently=True)
+        op.create_index('idx_meeting_participants_user_updated', 'meeting_participants', ['user_id', 'updated_at'],
+                        postgresql_concurrently=True)
+        op.create_index('idx_meeting_co_hosts_user_created', 'meeting_co_hosts', ['user_id', 'created_at'],
+                        postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_meeting_co_hosts_user_created', table_name='meeting_co_hosts',
+                      postgresql_concurrently=True)
+        op.drop_index('idx_meeting_participants_user_updated', table_name='meeting_participants',
+                      postgresql_concurrently=True)
+        op.drop_index('idx_meetings_creator_updated', table_name='meetings', postgresql_concurrently=True)
+
+    op.drop_index('idx_meeting_tombstones_user_created', table_name='meeting_tombstones')
+    op.drop_table('meeting_tombstones')
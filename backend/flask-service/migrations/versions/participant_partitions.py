@@ -0,0 +1,98 @@
+"""Hash-partition meeting_participants by meeting_id
+
+Revision ID: participant_partitions
+Revises: meeting_archive
+Create Date: 2024-04-23 10:00:00.000000
+
+Rebuilds meeting_participants as MEETING_PARTICIPANT_PARTITIONS (default 16)
+hash partitions of meeting_id, so autovacuum and index maintenance work on
+tables a sixteenth of the size. PostgreSQL requires the partition key in the
+primary key: it becomes (id, meeting_id), with id first so lookups by id
+alone still use each partition's primary key index. Ids keep coming from
+the existing sequence.
+
+The rows are copied while the old table is locked against writes (reads
+continue), then the tables are swapped in the same transaction. Run it in
+a quiet window: the copy takes roughly as long as a full-table
+``INSERT ... SELECT``. Indexes cannot be built CONCURRENTLY on a
+partitioned table; they are built after the copy, also under the lock.
+
+Single-column indexes on user_id and status from the initial schema are
+not recreated: (user_id, updated_at) covers user_id lookups and status is
+only ever filtered together with meeting_id.
+"""
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'participant_partitions'
+down_revision = 'meeting_archive'
+
+PARTITIONS = int(os.getenv('MEETING_PARTICIPANT_PARTITIONS', '16'))
+
+# Mirrors MeetingParticipant.__table_args__
+INDEXES = [
+    ('idx_meeting_participants_open', ['meeting_id', 'status'], 'left_at IS NULL'),
+    ('idx_meeting_participants_meeting_user', ['meeting_id', 'user_id'], None),
+    ('idx_meeting_participants_user_open', ['user_id', 'meeting_id'], 'left_at IS NULL'),
+    ('idx_meeting_participants_user_updated', ['user_id', 'updated_at'], None),
+]
+# Present on the unpartitioned table since initial_schema
+LEGACY_INDEXES = [
+    ('idx_meeting_participants_user_id', ['user_id'], None),
+    ('idx_meeting_participants_status', ['status'], None),
+]
+
+def _swap(new_table, indexes):
+    """Copy meeting_participants into new_table, build indexes, and replace the old table."""
+    op.execute(f'INSERT INTO {new_table} SELECT * FROM meeting_participants')
+    for name, columns, where in indexes:
+        op.create_index(f'{name}_new', new_table, columns,
+                        postgresql_where=sa.text(where) if where else None)
+
+    # The sequence would be dropped with the table that owns it
+    op.execute('ALTER SEQUENCE meeting_participants_id_seq OWNED BY NONE')
+    op.drop_table('meeting_participants')
+    op.rename_table(new_table, 'meeting_participants')
+    op.execute('ALTER SEQUENCE meeting_participants_id_seq OWNED BY meeting_participants.id')
+    op.execute(f'ALTER TABLE meeting_participants RENAME CONSTRAINT {new_table}_pkey TO meeting_participants_pkey')
+    for name, _, _ in indexes:
+        op.execute(f'ALTER INDEX {name}_new RENAME TO {name}')
+
+    op.create_foreign_key('meeting_participants_meeting_id_fkey', 'meeting_participants', 'meetings',
+                          ['meeting_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('meeting_participants_user_id_fkey', 'meeting_participants', 'users',
+                          ['user_id'], ['id'], ondelete='CASCADE')
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Readers continue; joins and approvals wait for the swap
+    op.execute('LOCK TABLE meeting_participants IN EXCLUSIVE MODE')
+    op.execute('''
+        CREATE TABLE meeting_participants_partitioned (
+            LIKE meeting_participants INCLUDING DEFAULTS,
+            CONSTRAINT meeting_participants_partitioned_pkey PRIMARY KEY (id, meeting_id)
+        ) PARTITION BY HASH (meeting_id)
+    ''')
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f'CREATE TABLE meeting_participants_p{remainder:02d} PARTITION OF meeting_participants_partitioned '
+            f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})'
+        )
+    _swap('meeting_participants_partitioned', INDEXES)
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('LOCK TABLE meeting_participants IN EXCLUSIVE MODE')
+    op.execute('''
+        CREATE TABLE meeting_participants_plain (
+            LIKE meeting_participants INCLUDING DEFAULTS,
+            CONSTRAINT meeting_participants_plain_pkey PRIMARY KEY (id)
+        )
+    ''')
+    # Dropping the partitioned table drops its partitions
+    _swap('meeting_participants_plain', INDEXES + LEGACY_INDEXES)
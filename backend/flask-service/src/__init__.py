@@ -1,100 +1,167 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-import os
-import redis
 import logging
+import time
+
+from .config import Config, REQUIRED_SETTINGS
+from .utils.redis_store import LazyRedis
+from .utils.health import HealthProber
+from .utils.meeting_cache import MeetingCache
+from .utils.meeting_acl import MeetingACL
+from .utils.events import EventHub, MeetingEvents
+from .utils.telemetry import TelemetryStore
+from .utils.login_tracker import LoginTracker
+from .utils.tokens import TokenService
+from .utils.ical import CalendarFeedCache
+from .utils.lifecycle import MeetingSweeper
+from .utils.presence import PresenceRegistry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Required environment variables
-REQUIRED_ENV_VARS = [
-    'DATABASE_URL',
-    'JWT_SECRET_KEY',
-    'REDIS_URL'
-]
-
-# Check for required environment variables
-missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
-if missing_vars:
-    raise RuntimeError(f"Missing required environment variables: {', '.join(missing_vars)}")
-
-app = Flask(__name__)
-
-# Configure CORS
-CORS(app, resources={
-    r"/api/*": {
-        "origins": os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(","),
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
-        "supports_credentials": True
-    }
-})
-
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')
-
-try:
+# Extensions are created unbound and attached to an app in create_app().
+# None of them open a network connection until first used.
+db = SQLAlchemy()
+redis_client = LazyRedis()
+health_prober = HealthProber()
+meeting_cache = MeetingCache()
+meeting_acl = MeetingACL()
+meeting_events = MeetingEvents()
+event_hub = EventHub()
+telemetry = TelemetryStore()
+login_tracker = LoginTracker()
+tokens = TokenService()
+calendar_cache = CalendarFeedCache()
+meeting_sweeper = MeetingSweeper()
+presence = PresenceRegistry()
+
+def create_app(config=None):
+    """
+    Application factory.
+
+    Args:
+        config: Config class/object, or a dict of settings. Defaults to Config.
+
+    Returns:
+        A configured Flask application. Database and Redis connections are
+        opened lazily by the first request that needs them.
+    """
+    started = time.perf_counter()
+    app = Flask(__name__)
+
+    if config is None:
+        config = Config
+    if isinstance(config, dict):
+        app.config.from_object(Config)
+        app.config.update(config)
+    else:
+        app.config.from_object(config)
+
+    # Check for required settings
+    missing_vars = [env for key, env in REQUIRED_SETTINGS.items() if not app.config.get(key)]
+    if missing_vars:
+        raise RuntimeError(f"Missing required environment variables: {', '.join(missing_vars)}")
+
+    # Configure CORS
+    CORS(app, resources={
+        r"/api/*": {
+            "origins": app.config['CORS_ORIGINS'],
+            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization"],
+            "supports_credentials": True
+        }
+    })
+
     # Initialize extensions
-    db = SQLAlchemy(app)
-    migrate = Migrate(app, db)
-    logger.info("Database initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize database: {str(e)}")
-    raise
-
-try:
-    # Initialize Redis
-    redis_client = redis.from_url(os.getenv('REDIS_URL'))
-    redis_client.ping()  # Test connection
-    logger.info("Redis connection established successfully")
-except Exception as e:
-    logger.error(f"Failed to connect to Redis: {str(e)}")
-    raise
-
-# Health check endpoints
-@app.route('/health')
-def health_check():
-    return jsonify({'status': 'healthy'}), 200
-
-@app.route('/health/db')
-def db_health_check():
-    try:
-        # Execute a simple query
-        db.session.execute('SELECT 1')
-        return jsonify({'status': 'healthy', 'message': 'Database connection successful'}), 200
-    except Exception as e:
-        return jsonify({'status': 'unhealthy', 'message': str(e)}), 500
-
-@app.route('/health/redis')
-def redis_health_check():
-    try:
-        # Try to ping Redis
-        redis_client.ping()
-        return jsonify({'status': 'healthy', 'message': 'Redis connection successful'}), 200
-    except Exception as e:
-        return jsonify({'status': 'unhealthy', 'message': str(e)}), 500
-
-# Import and register blueprints
-from .routes.auth import auth_bp
-from .routes.meetings import meetings_bp
-
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-app.register_blueprint(meetings_bp, url_prefix='/api/meetings')
-
-# Error handlers
-@app.errorhandler(500)
-def internal_error(error):
-    logger.error(f"Internal Server Error: {str(error)}")
-    return jsonify({'error': 'Internal Server Error'}), 500
-
-@app.errorhandler(404)
-def not_found_error(error):
-    return jsonify({'error': 'Not Found'}), 404
-
-logger.info("Application initialized successfully") 
\ No newline at end of file
+    db.init_app(app)
+    redis_client.init_app(app)
+    meeting_cache.init_app(app, redis_client)
+    meeting_acl.init_app(app, redis_client)
+    meeting_events.init_app(app, redis_client)
+    event_hub.init_app(app, redis_client)
+    telemetry.init_app(app, redis_client)
+    login_tracker.init_app(app, redis_client)
+    tokens.init_app(app, redis_client)
+    calendar_cache.init_app(app, redis_client)
+    meeting_sweeper.init_app(app, redis_client)
+    presence.init_app(app, redis_client)
+
+    # Flask-Migrate pulls in alembic (~80 ms); only the `flask db` CLI needs it
+    if app.config['MIGRATIONS_ENABLED']:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+    # Import and register blueprints
+    from .routes.health import health_bp, check_database, check_redis
+    from .routes.auth import auth_bp
+    from .routes.meetings import meetings_bp
+    from .routes.calendar import calendar_bp
+    from .routes.events import events_bp
+
+    app.register_blueprint(health_bp)
+
+    # Dependency health is refreshed in the background, not per probe
+    health_prober.init_app(app)
+    health_prober.register('database', check_database)
+    # Redis-backed features fall back without it, so it does not gate readiness
+    health_prober.register('redis', check_redis, critical=False)
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(meetings_bp, url_prefix='/api/meetings')
+    app.register_blueprint(calendar_bp, url_prefix='/api/calendar')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+
+    # flask_socketio takes ~110 ms to import; processes that serve no
+    # sockets (CLI jobs, migrations) can turn it off
+    if app.config['SOCKETIO_ENABLED']:
+        from .utils.socket_events import socketio, register_socket_events
+        socketio.init_app(app, cors_allowed_origins=app.config['CORS_ORIGINS'], async_mode='threading')
+        register_socket_events(socketio)
+
+    # CLI jobs; heavy job modules load only when their command runs
+    from .jobs import register_commands
+    register_commands(app)
+
+    # Error handlers
+    @app.errorhandler(500)
+    def internal_error(error):
+        logger.error(f"Internal Server Error: {str(error)}")
+        return jsonify({'error': 'Internal Server Error'}), 500
+
+    @app.errorhandler(404)
+    def not_found_error(error):
+        return jsonify({'error': 'Not Found'}), 404
+
+    if app.config['BACKGROUND_TASKS_AT_STARTUP']:
+        start_background_tasks(app)
+
+    app.config['STARTUP_SECONDS'] = time.perf_counter() - started
+    logger.info(f"Application initialized in {app.config['STARTUP_SECONDS'] * 1000:.1f} ms")
+    return app
+
+def start_background_tasks(app):
+    """
+    Start this process's background threads: the dependency prober and the
+    lifecycle sweeper (every serving process joins the sweeper election).
+
+    gunicorn preloads the app in the master, where threads would not survive
+    the fork, so its post_fork hook calls this in each worker. Other servers
+    set BACKGROUND_TASKS_AT_STARTUP to have create_app() call it. CLI
+    commands leave it off so that `flask db upgrade` never sweeps.
+    """
+    if app.config['HEALTH_PROBE_BACKGROUND']:
+        health_prober.ensure_started()
+    meeting_sweeper.ensure_started()
+
+def reset_connections(app):
+    """
+    Drop database and Redis connections inherited from a parent process.
+
+    Called from gunicorn's post_fork hook so that each worker opens its own
+    connections on demand instead of sharing the master's sockets.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    redis_client.reset()
@@ -1,5 +1,4 @@
-from flask import jsonify
-from . import app, db, redis_client
+from . import create_app
 
-# Import routes and models here
-# The health endpoints are now in __init__.py 
\ No newline at end of file
+# WSGI entry point for gunicorn (src.app:app) and `flask run` (FLASK_APP=src.app)
+app = create_app()
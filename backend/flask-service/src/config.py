@@ -0,0 +1,91 @@
+import os
+
+class Config:
+    """Default configuration, read from the environment."""
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    }
+    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
+    JWT_ACCESS_MINUTES = int(os.getenv('JWT_ACCESS_MINUTES', '15'))
+    JWT_REFRESH_DAYS = int(os.getenv('JWT_REFRESH_DAYS', '7'))
+    REDIS_URL = os.getenv('REDIS_URL')
+    REDIS_OPTIONS = {
+        'socket_connect_timeout': float(os.getenv('REDIS_CONNECT_TIMEOUT', '2')),
+        'socket_timeout': float(os.getenv('REDIS_SOCKET_TIMEOUT', '2')),
+        'health_check_interval': 30
+    }
+    CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
+    MIGRATIONS_ENABLED = os.getenv('MIGRATIONS_ENABLED', 'true').lower() == 'true'
+    # Serve the socket handlers (presence heartbeats, signaling relays) at /socket.io
+    SOCKETIO_ENABLED = os.getenv('SOCKETIO_ENABLED', 'true').lower() == 'true'
+    BACKGROUND_TASKS_AT_STARTUP = os.getenv('BACKGROUND_TASKS_AT_STARTUP', 'false').lower() == 'true'
+    HEALTH_PROBE_BACKGROUND = True
+    HEALTH_PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', '5'))
+    HEALTH_PROBE_RISE = int(os.getenv('HEALTH_PROBE_RISE', '2'))
+    HEALTH_PROBE_FALL = int(os.getenv('HEALTH_PROBE_FALL', '3'))
+    # How long every Redis-backed extension skips Redis after an error
+    REDIS_BACKOFF_SECONDS = float(os.getenv('REDIS_BACKOFF_SECONDS', '5'))
+    MEETING_CACHE_ENABLED = os.getenv('MEETING_CACHE_ENABLED', 'true').lower() == 'true'
+    MEETING_CACHE_TTL = int(os.getenv('MEETING_CACHE_TTL', '300'))
+    MEETING_CACHE_LOCAL_TTL = float(os.getenv('MEETING_CACHE_LOCAL_TTL', '2'))
+    MEETING_CACHE_LOCAL_SIZE = int(os.getenv('MEETING_CACHE_LOCAL_SIZE', '1024'))
+    TELEMETRY_BUCKET_SECONDS = int(os.getenv('TELEMETRY_BUCKET_SECONDS', '10'))
+    TELEMETRY_RING_SIZE = int(os.getenv('TELEMETRY_RING_SIZE', '360'))
+    TELEMETRY_MAX_BATCH = int(os.getenv('TELEMETRY_MAX_BATCH', '200'))
+    TELEMETRY_FLUSH_BACKGROUND = os.getenv('TELEMETRY_FLUSH_BACKGROUND', 'true').lower() == 'true'
+    TELEMETRY_FLUSH_INTERVAL = float(os.getenv('TELEMETRY_FLUSH_INTERVAL', '15'))
+    LOGIN_MAX_ATTEMPTS = int(os.getenv('LOGIN_MAX_ATTEMPTS', '5'))
+    LOGIN_LOCKOUT_MINUTES = int(os.getenv('LOGIN_LOCKOUT_MINUTES', '15'))
+    LOGIN_FLUSH_BACKGROUND = os.getenv('LOGIN_FLUSH_BACKGROUND', 'true').lower() == 'true'
+    LOGIN_FLUSH_INTERVAL = float(os.getenv('LOGIN_FLUSH_INTERVAL', '10'))
+    MAX_ACTIVE_MEETINGS = int(os.getenv('MAX_ACTIVE_MEETINGS', '50'))
+    MAX_IMPORT_MEETINGS = int(os.getenv('MAX_IMPORT_MEETINGS', '500'))
+    SYNC_TOMBSTONE_DAYS = int(os.getenv('SYNC_TOMBSTONE_DAYS', '30'))
+    CALENDAR_PAST_DAYS = int(os.getenv('CALENDAR_PAST_DAYS', '30'))
+    CALENDAR_FUTURE_DAYS = int(os.getenv('CALENDAR_FUTURE_DAYS', '180'))
+    CALENDAR_REFRESH_MINUTES = int(os.getenv('CALENDAR_REFRESH_MINUTES', '15'))
+    CALENDAR_CACHE_TTL = int(os.getenv('CALENDAR_CACHE_TTL', '86400'))
+    LIFECYCLE_SWEEP_BACKGROUND = os.getenv('LIFECYCLE_SWEEP_BACKGROUND', 'true').lower() == 'true'
+    LIFECYCLE_SWEEP_INTERVAL = float(os.getenv('LIFECYCLE_SWEEP_INTERVAL', '60'))
+    LIFECYCLE_SWEEP_BATCH = int(os.getenv('LIFECYCLE_SWEEP_BATCH', '200'))
+    LIFECYCLE_SWEEP_MAX_BATCHES = int(os.getenv('LIFECYCLE_SWEEP_MAX_BATCHES', '10'))
+    LIFECYCLE_SWEEP_GRACE_MINUTES = float(os.getenv('LIFECYCLE_SWEEP_GRACE_MINUTES', '15'))
+    LIFECYCLE_ARCHIVE_DAYS = float(os.getenv('LIFECYCLE_ARCHIVE_DAYS', '90'))
+    LIFECYCLE_ARCHIVE_BATCH = int(os.getenv('LIFECYCLE_ARCHIVE_BATCH', '500'))
+    PRESENCE_TTL_SECONDS = float(os.getenv('PRESENCE_TTL_SECONDS', '45'))
+    # Turn on once every deployed client sends presence heartbeats; until then a
+    # lapsed registration does not mean the user left, so joins check the
+    # database and reconcile never closes participations
+    PRESENCE_HEARTBEATS = os.getenv('PRESENCE_HEARTBEATS', 'false').lower() == 'true'
+    EVENTS_STREAM_LENGTH = int(os.getenv('EVENTS_STREAM_LENGTH', '200'))
+    EVENTS_STREAM_TTL = int(os.getenv('EVENTS_STREAM_TTL', '3600'))
+    EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', '256'))
+    EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', '15'))
+    EVENTS_MAX_STREAM_SECONDS = float(os.getenv('EVENTS_MAX_STREAM_SECONDS', '300'))
+    # Open event streams per process; keep well below GUNICORN_THREADS so
+    # ordinary requests and health probes always find a free thread
+    EVENTS_MAX_STREAMS = int(os.getenv('EVENTS_MAX_STREAMS', '8'))
+
+class TestConfig(Config):
+    """In-memory SQLite and a Redis URL that is never dialed unless used."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    JWT_SECRET_KEY = 'test-secret-key'
+    REDIS_URL = os.getenv('TEST_REDIS_URL', 'redis://localhost:6379/15')
+    MIGRATIONS_ENABLED = False
+    HEALTH_PROBE_BACKGROUND = False
+    TELEMETRY_FLUSH_BACKGROUND = False
+    LOGIN_FLUSH_BACKGROUND = False
+    LIFECYCLE_SWEEP_BACKGROUND = False
+
+# Settings that must be present before the app can start
+REQUIRED_SETTINGS = {
+    'SQLALCHEMY_DATABASE_URI': 'DATABASE_URL',
+    'JWT_SECRET_KEY': 'JWT_SECRET_KEY',
+    'REDIS_URL': 'REDIS_URL'
+}
@@ -0,0 +1,146 @@
+"""
+Batch jobs run through the Flask CLI, e.g. ``flask analytics run`` or
+``flask telemetry flush``
+(also ``flask logins flush``, ``flask sync prune``, ``flask lifecycle sweep``,
+``flask lifecycle archive`` and ``flask lifecycle presence``).
+
+Job modules may pull in heavy dependencies (NumPy) and are only imported
+when their command runs, so they add nothing to web worker startup.
+"""
+from datetime import datetime, timedelta, UTC
+import json
+
+import click
+from flask.cli import AppGroup
+
+analytics_cli = AppGroup('analytics', help='Participation analytics jobs.')
+telemetry_cli = AppGroup('telemetry', help='Connection-quality telemetry jobs.')
+logins_cli = AppGroup('logins', help='Login bookkeeping jobs.')
+sync_cli = AppGroup('sync', help='Meeting list sync jobs.')
+lifecycle_cli = AppGroup('lifecycle', help='Meeting lifecycle jobs.')
+
+def _parse_time(value):
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+@analytics_cli.command('run')
+@click.option('--since', default=None, help='ISO timestamp; defaults to 24 hours ago')
+@click.option('--until', default=None, help='ISO timestamp; defaults to now')
+@click.option('--batch-size', default=10000, show_default=True, help='Rows per fetch and per UPDATE batch')
+@click.option('--output', default=None, help='Write per-meeting aggregates to this JSON file')
+def run_analytics_command(since, until, batch_size, output):
+    """Compute time in meeting and engagement scores for meetings that ended in a window."""
+    from .analytics import run_analytics
+
+    until = _parse_time(until) if until else datetime.now(UTC)
+    since = _parse_time(since) if since else until - timedelta(days=1)
+    summary = run_analytics(since, until, batch_size=batch_size)
+    meetings = summary.pop('meetings')
+    click.echo(json.dumps(summary, indent=2))
+    if output:
+        with open(output, 'w') as f:
+            json.dump(meetings, f, indent=2)
+        click.echo(f'Per-meeting aggregates written to {output}')
+
+@telemetry_cli.command('flush')
+@click.option('--max-items', default=5000, show_default=True, help='Participants to flush per pass')
+def flush_telemetry_command(max_items):
+    """Write buffered connection-quality averages to meeting_participants."""
+    from .. import telemetry
+
+    total = 0
+    while True:
+        flushed = telemetry.flush(max_items)
+        total += flushed
+        if flushed < max_items:
+            break
+    click.echo(f'Flushed connection quality for {total} participants')
+
+@logins_cli.command('flush')
+@click.option('--max-items', default=5000, show_default=True, help='Users to flush per pass')
+def flush_logins_command(max_items):
+    """Write buffered login bookkeeping to the users table."""
+    from .. import login_tracker
+
+    total = 0
+    while True:
+        flushed = login_tracker.flush(max_items)
+        total += flushed
+        if flushed < max_items:
+            break
+    click.echo(f'Flushed login bookkeeping for {total} users')
+
+@sync_cli.command('prune')
+@click.option('--days', default=None, type=int, help='Retention in days; defaults to SYNC_TOMBSTONE_DAYS')
+def prune_tombstones_command(days):
+    """Delete tombstones older than the sync retention window."""
+    from flask import current_app
+    from ..models import db
+    from ..utils.sync import prune_tombstones
+
+    days = days if days is not None else current_app.config.get('SYNC_TOMBSTONE_DAYS', 30)
+    deleted = prune_tombstones(db.session, timedelta(days=days))
+    click.echo(f'Pruned {deleted} tombstones older than {days} days')
+
+@lifecycle_cli.command('sweep')
+@click.option('--force', is_flag=True, help='Sweep even if another process holds the sweeper lock')
+def sweep_meetings_command(force):
+    """End meetings that are past their end_time plus the grace period."""
+    from .. import meeting_sweeper
+
+    if not force and not meeting_sweeper.acquire_leadership():
+        click.echo('Another process is the sweeper leader; use --force to sweep anyway')
+        return
+    total = 0
+    while True:
+        ended = meeting_sweeper.sweep()
+        total += ended
+        if ended < meeting_sweeper.batch_size * meeting_sweeper.max_batches:
+            break
+    if not force:
+        meeting_sweeper.release_leadership()
+    click.echo(f'Ended {total} overdue meetings')
+
+@lifecycle_cli.command('archive')
+@click.option('--days', type=float, default=None, help='Archive meetings ended more than this many days ago')
+@click.option('--force', is_flag=True, help='Archive even if another process holds the sweeper lock')
+def archive_meetings_command(days, force):
+    """Move long-ended meetings and their rows into the archive tables."""
+    from .. import meeting_sweeper
+
+    if days is not None:
+        meeting_sweeper.archive_after = timedelta(days=days)
+    if not meeting_sweeper.archive_after:
+        click.echo('Archival is disabled (LIFECYCLE_ARCHIVE_DAYS=0); pass --days')
+        return
+    if not force and not meeting_sweeper.acquire_leadership():
+        click.echo('Another process is the sweeper leader; use --force to archive anyway')
+        return
+    total = 0
+    while True:
+        archived = meeting_sweeper.archive()
+        total += archived
+        if archived < meeting_sweeper.archive_batch_size * meeting_sweeper.max_batches:
+            break
+    if not force:
+        meeting_sweeper.release_leadership()
+    click.echo(f'Archived {total} meetings')
+
+@lifecycle_cli.command('presence')
+def reconcile_presence_command():
+    """Close the participations of users who left or whose heartbeats expired."""
+    from .. import presence
+
+    if not presence.available:
+        click.echo('Presence registry is unavailable (no Redis)')
+        return
+    if not presence.heartbeats:
+        click.echo('PRESENCE_HEARTBEATS is off; only pruning the registry')
+    click.echo(f'Applied {presence.reconcile()} departures')
+
+def register_commands(app):
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(telemetry_cli)
+    app.cli.add_command(logins_cli)
+    app.cli.add_command(sync_cli)
+    app.cli.add_command(lifecycle_cli)
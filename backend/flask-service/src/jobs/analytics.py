@@ -0,0 +1,257 @@
+"""
+Vectorized participation analytics.
+
+For every meeting whose effective end (ended_at, else end_time) falls in a
+window, participations are streamed from the database in partitions
+(server-side cursor on PostgreSQL) straight into NumPy arrays, and join
+events are aggregated from the audit log with one GROUP BY. All per-row
+arithmetic is done on whole arrays:
+
+    time in meeting   join..leave interval clipped to the meeting window,
+                      added to any total_time from earlier visits
+    engagement score  0-100 from attendance ratio (60%), punctuality of the
+                      first join (20%) and connection stability, i.e. fewer
+                      rejoins (20%)
+    meeting aggregates  participants, attended, minutes, mean score and
+                      peak concurrency (sweep over +1/-1 interval events)
+
+Results are written back with executemany UPDATEs by primary key.
+Participations still open when the meeting ended are closed at the
+meeting's end, so running the job twice over the same window is
+idempotent.
+"""
+import logging
+import time
+from datetime import datetime, UTC
+from typing import Any, Dict, List
+
+import numpy as np
+from sqlalchemy import bindparam, func, select, update
+
+from ..models import db, Meeting, MeetingParticipant, MeetingAuditLog
+from ..utils.database import epoch_seconds
+
+logger = logging.getLogger(__name__)
+
+ATTENDANCE_WEIGHT = 0.6
+PUNCTUALITY_WEIGHT = 0.2
+STABILITY_WEIGHT = 0.2
+
+# Column order of the participation matrix
+ID, MEETING_ID, USER_ID, JOINED, LEFT, TOTAL_TIME, START, END = range(8)
+
+def _meeting_end():
+    return func.coalesce(Meeting.ended_at, Meeting.end_time)
+
+def _meetings_in_window(since, until):
+    # Stored timestamps are naive UTC
+    since = since.astimezone(UTC).replace(tzinfo=None)
+    until = until.astimezone(UTC).replace(tzinfo=None)
+    return select(Meeting.id).where(_meeting_end() >= since, _meeting_end() < until)
+
+def load_participations(since, until, batch_size=10000) -> np.ndarray:
+    """
+    Stream participations of meetings that ended in [since, until) into a float64 matrix.
+
+    Timestamps are epoch seconds; NULLs become NaN. Rows are ordered by meeting.
+    """
+    stmt = select(
+        MeetingParticipant.id,
+        MeetingParticipant.meeting_id,
+        MeetingParticipant.user_id,
+        epoch_seconds(MeetingParticipant.joined_at),
+        epoch_seconds(MeetingParticipant.left_at),
+        MeetingParticipant.total_time,
+        epoch_seconds(Meeting.start_time),
+        epoch_seconds(_meeting_end())
+    ).join(Meeting, Meeting.id == MeetingParticipant.meeting_id).where(
+        MeetingParticipant.meeting_id.in_(_meetings_in_window(since, until))
+    ).order_by(MeetingParticipant.meeting_id, MeetingParticipant.id)
+
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    chunks = [np.array(partition, dtype=np.float64) for partition in result.partitions()]
+    if not chunks:
+        return np.empty((0, 8), dtype=np.float64)
+    return np.concatenate(chunks)
+
+def load_join_events(since, until) -> np.ndarray:
+    """Return (meeting_id, user_id, join count, first join epoch) rows from the audit log."""
+    stmt = select(
+        MeetingAuditLog.meeting_id,
+        MeetingAuditLog.user_id,
+        func.count(MeetingAuditLog.id),
+        func.min(epoch_seconds(MeetingAuditLog.created_at))
+    ).where(
+        MeetingAuditLog.action == 'joined',
+        MeetingAuditLog.meeting_id.in_(_meetings_in_window(since, until))
+    ).group_by(MeetingAuditLog.meeting_id, MeetingAuditLog.user_id)
+    rows = db.session.execute(stmt).all()
+    if not rows:
+        return np.empty((0, 4), dtype=np.float64)
+    return np.array(rows, dtype=np.float64)
+
+def _pair_keys(meeting_ids: np.ndarray, user_ids: np.ndarray) -> np.ndarray:
+    return meeting_ids.astype(np.int64) * (1 << 32) + user_ids.astype(np.int64)
+
+def compute_participation(rows: np.ndarray, joins: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute per-participation results from the matrices built by the loaders.
+
+    Returns:
+        Dictionary of arrays aligned with rows: total_time (seconds),
+        score (0-100), left_at (epoch seconds) and closed (bool, rows that
+        were still open and are closed at the meeting's end)
+    """
+    joined, left, previous = rows[:, JOINED], rows[:, LEFT], rows[:, TOTAL_TIME]
+    start, end = rows[:, START], rows[:, END]
+    duration = np.maximum(end - start, 1.0)
+
+    # Interval of the latest visit, clipped to the meeting window
+    closed = np.isnan(left)
+    leave = np.where(closed, end, np.minimum(left, end))
+    segment = np.where(np.isnan(joined), 0.0, np.clip(leave - np.maximum(joined, start), 0.0, None))
+
+    # Closing a participation already added its last visit to total_time
+    already_counted = ~closed & ~np.isnan(previous)
+    total_time = np.nan_to_num(previous) + np.where(already_counted, 0.0, segment)
+    total_time = np.minimum(total_time, duration)
+
+    # Join count and first join per (meeting, user), looked up by sorted key
+    join_count = np.ones(len(rows))
+    first_join = np.where(np.isnan(joined), end, joined)
+    if len(joins):
+        join_keys = _pair_keys(joins[:, 0], joins[:, 1])
+        order = np.argsort(join_keys)
+        join_keys = join_keys[order]
+        keys = _pair_keys(rows[:, MEETING_ID], rows[:, USER_ID])
+        position = np.minimum(np.searchsorted(join_keys, keys), len(join_keys) - 1)
+        found = join_keys[position] == keys
+        join_count = np.where(found, np.maximum(joins[order, 2][position], 1.0), 1.0)
+        first_join = np.where(found, joins[order, 3][position], first_join)
+
+    attendance = np.clip(total_time / duration, 0.0, 1.0)
+    punctuality = 1.0 - np.clip((first_join - start) / duration, 0.0, 1.0)
+    stability = 1.0 / join_count
+    score = 100.0 * (ATTENDANCE_WEIGHT * attendance + PUNCTUALITY_WEIGHT * punctuality + STABILITY_WEIGHT * stability)
+    score = np.where(total_time > 0, np.round(score, 2), 0.0)
+
+    return {
+        'total_time': np.round(total_time).astype(np.int64),
+        'score': score,
+        'left_at': np.where(closed, end, left),
+        'closed': closed
+    }
+
+def meeting_aggregates(rows: np.ndarray, results: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Per-meeting aggregates; rows must be ordered by meeting."""
+    if not len(rows):
+        return []
+    meeting_ids, group_starts, counts = np.unique(rows[:, MEETING_ID], return_index=True, return_counts=True)
+    total_time = results['total_time'].astype(np.float64)
+    attended = (total_time > 0).astype(np.int64)
+
+    total_seconds = np.add.reduceat(total_time, group_starts)
+    attended_count = np.add.reduceat(attended, group_starts)
+    score_sum = np.add.reduceat(results['score'], group_starts)
+
+    # Peak concurrency: sweep +1 at join and -1 at leave, ends before starts on ties.
+    # Every meeting's deltas sum to zero, so one global cumsum resets per meeting.
+    visited = ~np.isnan(rows[:, JOINED])
+    event_meeting = np.concatenate([rows[visited, MEETING_ID]] * 2)
+    event_time = np.concatenate([rows[visited, JOINED], results['left_at'][visited]])
+    delta = np.concatenate([np.ones(visited.sum()), -np.ones(visited.sum())])
+    order = np.lexsort((delta, event_time, event_meeting))
+    level = np.cumsum(delta[order])
+    peak = np.zeros(len(meeting_ids))
+    if len(order):
+        event_meeting = event_meeting[order]
+        present = np.isin(meeting_ids, event_meeting)
+        event_starts = np.searchsorted(event_meeting, meeting_ids[present])
+        peak[present] = np.maximum.reduceat(level, event_starts)
+
+    return [
+        {
+            'meeting_id': int(meeting_ids[i]),
+            'participants': int(counts[i]),
+            'attended': int(attended_count[i]),
+            'total_minutes': round(float(total_seconds[i]) / 60.0, 2),
+            'mean_minutes': round(float(total_seconds[i]) / 60.0 / attended_count[i], 2) if attended_count[i] else 0.0,
+            'mean_score': round(float(score_sum[i]) / counts[i], 2),
+            'peak_concurrency': int(peak[i])
+        }
+        for i in range(len(meeting_ids))
+    ]
+
+def write_results(rows: np.ndarray, results: Dict[str, np.ndarray], batch_size=10000) -> int:
+    """Write total_time, participation_score and closing left_at back in executemany batches."""
+    ids = rows[:, ID].astype(np.int64).tolist()
+    meeting_ids = rows[:, MEETING_ID].astype(np.int64).tolist()
+    total_time = results['total_time'].tolist()
+    score = results['score'].tolist()
+    closed = results['closed'].tolist()
+    left_at = results['left_at'].tolist()
+
+    # Matching on meeting_id as well as id lets PostgreSQL route each row
+    # to its meeting_participants partition
+    table = MeetingParticipant.__table__
+    where = (table.c.id == bindparam('pid'), table.c.meeting_id == bindparam('mid'))
+    values = {'total_time': bindparam('total'), 'participation_score': bindparam('score')}
+    statements = {
+        True: update(table).where(*where).values(**values, left_at=bindparam('closed_at')),
+        False: update(table).where(*where).values(**values)
+    }
+
+    written = 0
+    for offset in range(0, len(ids), batch_size):
+        batch = []
+        for i in range(offset, min(offset + batch_size, len(ids))):
+            params = {'pid': ids[i], 'mid': meeting_ids[i], 'total': total_time[i], 'score': score[i]}
+            if closed[i]:
+                params['closed_at'] = datetime.fromtimestamp(left_at[i], UTC).replace(tzinfo=None)
+            batch.append(params)
+        # Rows with and without left_at have different parameter sets
+        for has_left_at, stmt in statements.items():
+            group = [p for p in batch if ('closed_at' in p) == has_left_at]
+            if group:
+                db.session.execute(stmt, group)
+        db.session.commit()
+        written += len(batch)
+    return written
+
+def run_analytics(since, until, batch_size=10000) -> Dict[str, Any]:
+    """
+    Compute and store analytics for meetings that ended in [since, until).
+
+    Returns:
+        Summary with row counts, per-stage timings and per-meeting aggregates
+    """
+    until = min(until, datetime.now(UTC))
+    timings = {}
+
+    started = time.perf_counter()
+    rows = load_participations(since, until, batch_size)
+    joins = load_join_events(since, until)
+    timings['load_seconds'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = compute_participation(rows, joins)
+    meetings = meeting_aggregates(rows, results)
+    timings['compute_seconds'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    written = write_results(rows, results, batch_size)
+    timings['write_seconds'] = time.perf_counter() - started
+
+    summary = {
+        'since': since.isoformat(),
+        'until': until.isoformat(),
+        'participations': written,
+        'closed': int(results['closed'].sum()),
+        'meeting_count': len(meetings),
+        **{key: round(value, 4) for key, value in timings.items()},
+        'meetings': meetings
+    }
+    logger.info(f"Analytics processed {written} participations in {len(meetings)} meetings "
+                f"(load {timings['load_seconds']:.2f}s, compute {timings['compute_seconds']:.2f}s, "
+                f"write {timings['write_seconds']:.2f}s)")
+    return summary
@@ -4,5 +4,9 @@ from .meeting import Meeting
 from .meeting_participant import MeetingParticipant
 from .meeting_co_host import MeetingCoHost
 from .meeting_audit_log import MeetingAuditLog
+from .meeting_tombstone import MeetingTombstone
+from .meeting_archive import (ArchivedMeeting, ArchivedMeetingParticipant, ArchivedMeetingCoHost,
+                              ArchivedMeetingAuditLog)
 
-__all__ = ['db', 'User', 'Meeting', 'MeetingParticipant', 'MeetingCoHost', 'MeetingAuditLog'] 
\ No newline at end of file
+__all__ = ['db', 'User', 'Meeting', 'MeetingParticipant', 'MeetingCoHost', 'MeetingAuditLog', 'MeetingTombstone',
+           'ArchivedMeeting', 'ArchivedMeetingParticipant', 'ArchivedMeetingCoHost', 'ArchivedMeetingAuditLog'] 
\ No newline at end of file
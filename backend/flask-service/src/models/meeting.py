@@ -3,6 +3,17 @@ from .. import db
 
 class Meeting(db.Model):
     __tablename__ = 'meetings'
+    __table_args__ = (
+        # Mirrors migrations/versions/hot_path_indexes.py, meeting_sync.py, meeting_lifecycle.py
+        # and meeting_archive.py
+        db.Index('idx_meetings_creator_active', 'created_by', 'start_time', 'end_time',
+                 postgresql_where=db.text('ended_at IS NULL'), sqlite_where=db.text('ended_at IS NULL')),
+        db.Index('idx_meetings_creator_updated', 'created_by', 'updated_at'),
+        db.Index('idx_meetings_active_end', 'end_time',
+                 postgresql_where=db.text('ended_at IS NULL'), sqlite_where=db.text('ended_at IS NULL')),
+        db.Index('idx_meetings_ended', 'ended_at',
+                 postgresql_where=db.text('ended_at IS NOT NULL'), sqlite_where=db.text('ended_at IS NOT NULL')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
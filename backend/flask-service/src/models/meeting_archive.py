@@ -0,0 +1,56 @@
+from datetime import datetime, UTC
+from .. import db
+from .meeting import Meeting
+from .meeting_participant import MeetingParticipant
+from .meeting_co_host import MeetingCoHost
+from .meeting_audit_log import MeetingAuditLog
+
+def _archive_table(source, name, *extra):
+    """
+    Copy of a hot table's columns for its archive: same names and types,
+    ids kept from the hot rows, no foreign keys (archived rows outlive the
+    rows they pointed at).
+    """
+    columns = [
+        db.Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable,
+                  autoincrement=False)
+        for column in source.columns
+    ]
+    return db.Table(name, db.metadata, *columns, *extra)
+
+class ArchivedMeeting(db.Model):
+    """A meeting moved out of the hot tables by utils/archive.py; read-only."""
+    # Mirrors migrations/versions/meeting_archive.py
+    __table__ = _archive_table(
+        Meeting.__table__, 'meetings_archive',
+        db.Column('archived_at', db.DateTime, nullable=False, default=lambda: datetime.now(UTC))
+    )
+
+    def to_dict(self):
+        return {**Meeting.to_dict(self), 'archived': True}
+
+class ArchivedMeetingParticipant(db.Model):
+    __table__ = _archive_table(
+        MeetingParticipant.__table__, 'meeting_participants_archive',
+        db.Index('idx_meeting_participants_archive_meeting_user', 'meeting_id', 'user_id')
+    )
+
+class ArchivedMeetingCoHost(db.Model):
+    __table__ = _archive_table(
+        MeetingCoHost.__table__, 'meeting_co_hosts_archive',
+        db.Index('idx_meeting_co_hosts_archive_meeting_user', 'meeting_id', 'user_id')
+    )
+
+class ArchivedMeetingAuditLog(db.Model):
+    __table__ = _archive_table(
+        MeetingAuditLog.__table__, 'meeting_audit_logs_archive',
+        db.Index('idx_meeting_audit_logs_archive_meeting', 'meeting_id')
+    )
+
+# Hot model -> archive model, children before their meeting
+ARCHIVES = (
+    (MeetingParticipant, ArchivedMeetingParticipant),
+    (MeetingCoHost, ArchivedMeetingCoHost),
+    (MeetingAuditLog, ArchivedMeetingAuditLog),
+    (Meeting, ArchivedMeeting),
+)
@@ -3,6 +3,10 @@ from .. import db
 
 class MeetingCoHost(db.Model):
     __tablename__ = 'meeting_co_hosts'
+    __table_args__ = (
+        db.UniqueConstraint('meeting_id', 'user_id', name='uq_meeting_co_hosts'),
+        db.Index('idx_meeting_co_hosts_user_created', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id'), nullable=False)
@@ -1,8 +1,39 @@
 from datetime import datetime, UTC
+from sqlalchemy import bindparam, case, cast, extract, func, update
+from sqlalchemy.sql import ColumnElement
 from .. import db
 
 class MeetingParticipant(db.Model):
+    """
+    One user's participation in a meeting.
+
+    On PostgreSQL the table is hash-partitioned by meeting_id with primary
+    key (id, meeting_id) (migrations/versions/participant_partitions.py).
+    Statements on hot paths should name meeting_id, even when id alone
+    identifies the row, so the planner touches one partition instead of all.
+
+    The mapper's primary key is (id, meeting_id) to match, so identity-map
+    entries, flushes, deletes and session.get(MeetingParticipant,
+    (id, meeting_id)) all carry the partition key. The table definition
+    keeps id as its only primary key column: SQLite (tests) only
+    autoincrements a lone INTEGER PRIMARY KEY, and the PostgreSQL table
+    comes from the migrations, not from create_all(). id stays unique on its
+    own because every row draws it from one sequence.
+
+    Lookups by user (sync, search, calendar feeds, the database fallback of
+    the one-active-meeting check) span every partition by nature; each
+    partition serves them from its (user_id, ...) indexes.
+    """
     __tablename__ = 'meeting_participants'
+    __table_args__ = (
+        # Mirrors migrations/versions/hot_path_indexes.py, meeting_sync.py and participant_partitions.py
+        db.Index('idx_meeting_participants_open', 'meeting_id', 'status',
+                 postgresql_where=db.text('left_at IS NULL'), sqlite_where=db.text('left_at IS NULL')),
+        db.Index('idx_meeting_participants_meeting_user', 'meeting_id', 'user_id'),
+        db.Index('idx_meeting_participants_user_open', 'user_id', 'meeting_id',
+                 postgresql_where=db.text('left_at IS NULL'), sqlite_where=db.text('left_at IS NULL')),
+        db.Index('idx_meeting_participants_user_updated', 'user_id', 'updated_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id'), nullable=False)
@@ -23,7 +54,83 @@ class MeetingParticipant(db.Model):
     
     # Relationships
     user = db.relationship('User', backref=db.backref('meeting_participations', lazy=True))
+
+    __mapper_args__ = {'primary_key': [id, meeting_id]}
     
+    @classmethod
+    def close_open_participations(cls, meeting_id, left_at=None):
+        """
+        Set left_at on every open participation of a meeting, or of a list
+        of meetings, in one UPDATE.
+
+        Participants who had joined get the time since joined_at added to
+        total_time. left_at may be a SQL expression (e.g. each meeting's
+        end_time). Does not commit.
+
+        Returns:
+            Number of participations closed
+        """
+        now = datetime.now(UTC).replace(tzinfo=None)
+        if not isinstance(left_at, ColumnElement):
+            # Stored timestamps are naive UTC; compare like with like
+            left_at = (left_at or datetime.now(UTC)).astimezone(UTC).replace(tzinfo=None)
+        meetings = cls.meeting_id.in_(meeting_id) if isinstance(meeting_id, (list, tuple)) else cls.meeting_id == meeting_id
+
+        stmt = update(cls).where(
+            meetings,
+            cls.left_at.is_(None)
+        ).values(
+            left_at=left_at,
+            updated_at=now,
+            total_time=cls._total_time_at(left_at)
+        ).execution_options(synchronize_session=False)
+        return db.session.execute(stmt).rowcount
+
+    @classmethod
+    def close_participations(cls, closings):
+        """
+        Close individual users' open participations, each at its own time,
+        with one executemany UPDATE.
+
+        Args:
+            closings: (meeting_id, user_id, left_at) tuples; left_at is naive UTC
+
+        Participations that joined after their left_at (the user came back)
+        are left open. Does not commit.
+        """
+        if not closings:
+            return
+        left_at = bindparam('closed_at', type_=db.DateTime)
+        stmt = update(cls.__table__).where(
+            cls.meeting_id == bindparam('mid'),
+            cls.user_id == bindparam('uid'),
+            cls.left_at.is_(None),
+            cls.joined_at.isnot(None),
+            cls.joined_at <= left_at
+        ).values(
+            left_at=left_at,
+            updated_at=datetime.now(UTC).replace(tzinfo=None),
+            total_time=cls._total_time_at(left_at)
+        )
+        db.session.execute(stmt, [
+            {'mid': meeting_id, 'uid': user_id, 'closed_at': closed_at}
+            for meeting_id, user_id, closed_at in closings
+        ])
+
+    @classmethod
+    def _total_time_at(cls, left_at):
+        """total_time once the time from joined_at to left_at is added."""
+        if db.session.get_bind().dialect.name == 'sqlite':
+            seconds = (func.julianday(left_at) - func.julianday(cls.joined_at)) * 86400
+        else:
+            seconds = extract('epoch', left_at - cls.joined_at)
+        return case(
+            (cls.joined_at.is_(None), cls.total_time),
+            # Joined after the closing time: nothing to add
+            (seconds < 0, func.coalesce(cls.total_time, 0)),
+            else_=func.coalesce(cls.total_time, 0) + cast(func.round(seconds), db.Integer)
+        )
+
     def __init__(self, meeting_id, user_id, status='pending', role='attendee'):
         self.meeting_id = meeting_id
         self.user_id = user_id
@@ -0,0 +1,28 @@
+from datetime import datetime, UTC
+from .. import db
+
+class MeetingTombstone(db.Model):
+    """A meeting that dropped out of a user's list (deleted, archived, or their participation revoked)."""
+    __tablename__ = 'meeting_tombstones'
+    __table_args__ = (
+        db.Index('idx_meeting_tombstones_user_created', 'user_id', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # No foreign key: the meeting is usually gone
+    meeting_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    reason = db.Column(db.String(20), nullable=False)  # deleted, declined, co_host_removed, archived
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(UTC))
+    
+    def __init__(self, meeting_id, user_id, reason):
+        self.meeting_id = meeting_id
+        self.user_id = user_id
+        self.reason = reason
+        
+    def to_dict(self):
+        return {
+            'meeting_id': self.meeting_id,
+            'reason': self.reason,
+            'created_at': self.created_at.isoformat()
+        }
@@ -32,6 +32,8 @@ class User(db.Model):
     # Account security
     failed_login_attempts = db.Column(db.Integer, nullable=False, default=0)
     locked_until = db.Column(db.DateTime, nullable=True)
+    # Calendar feed tokens carry the generation they were minted for; logout-all bumps it
+    feed_generation = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     def __init__(self, email, name, password):
         self.email = email.lower().strip()
@@ -56,12 +58,18 @@ class User(db.Model):
     def is_locked(self):
         if not self.locked_until:
             return False
-        return self.locked_until > datetime.now(UTC)
+        locked_until = self.locked_until
+        if locked_until.tzinfo is None:  # stored as naive UTC
+            locked_until = locked_until.replace(tzinfo=UTC)
+        return locked_until > datetime.now(UTC)
 
-    def increment_failed_attempts(self):
+    # The methods below write synchronously; the login route only uses them
+    # when Redis-backed bookkeeping (utils.login_tracker) is unavailable.
+
+    def increment_failed_attempts(self, max_attempts=5, lockout_minutes=15):
         self.failed_login_attempts += 1
-        if self.failed_login_attempts >= 5:
-            self.locked_until = datetime.now(UTC) + timedelta(minutes=15)
+        if self.failed_login_attempts >= max_attempts:
+            self.locked_until = datetime.now(UTC) + timedelta(minutes=lockout_minutes)
         db.session.commit()
 
     def reset_failed_attempts(self):
@@ -73,7 +81,8 @@ class User(db.Model):
         self.last_login_at = datetime.now(UTC)
         self.last_login_ip = ip_address
         self.login_count += 1
-        self.reset_failed_attempts()
+        self.failed_login_attempts = 0
+        self.locked_until = None
         db.session.commit()
 
     def generate_email_verification_token(self):
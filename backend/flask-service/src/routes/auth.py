@@ -1,48 +1,34 @@
 from flask import Blueprint, request, jsonify
 from werkzeug.security import generate_password_hash
 import jwt
-import datetime
-from datetime import UTC
-import os
-import re
 from sqlalchemy.exc import IntegrityError
 
+from .. import login_tracker, tokens
 from ..models import db, User
+from ..utils.schema import Field, Schema, validation_error
+from ..utils.tokens import TokenRevoked
 
 auth_bp = Blueprint('auth', __name__)
 
-def validate_email(email):
-    if not email or len(email) > 120:
-        return False
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+REGISTER_SCHEMA = Schema({
+    'email': Field(str, required=True, strip=True, lower=True, max_length=120,
+                   pattern=r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+                   message='Invalid email format or length (valid email, maximum 120 characters)'),
+    'name': Field(str, required=True, strip=True, pattern=r'[a-zA-Z0-9\s.-]{3,100}',
+                  message='Name must be 3-100 characters: letters, numbers, spaces, dots and hyphens'),
+    # bcrypt only uses the first 72 bytes
+    'password': Field(str, required=True, min_length=8, max_length=72,
+                      contains=[r'[A-Z]', r'[a-z]', r'[0-9]', r'[!@#$%^&*(),.?":{}|<>]'],
+                      message='Password needs 8-72 characters with an uppercase letter, a lowercase letter, '
+                              'a number and a special character')
+})
 
-def validate_password(password):
-    if not password or len(password) > 72:  # bcrypt max length is 72 bytes
-        return False
-    # At least 8 chars, 1 uppercase, 1 lowercase, 1 number, 1 special char
-    if len(password) < 8:
-        return False
-    if not re.search(r'[A-Z]', password):
-        return False
-    if not re.search(r'[a-z]', password):
-        return False
-    if not re.search(r'[0-9]', password):
-        return False
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        return False
-    return True
-
-def validate_name(name):
-    if not name or len(name) > 100:
-        return False
-    # Allow letters, numbers, spaces, dots, and hyphens
-    return bool(re.match(r'^[a-zA-Z0-9\s.-]{3,100}$', name))
-
-def get_failed_login_attempts(email):
-    # You should implement rate limiting using Redis or similar
-    # This is a placeholder
-    return 0
+def account_locked_response():
+    return jsonify({
+        'error': 'Account temporarily locked',
+        'code': 'account_locked',
+        'retry_after': f'{login_tracker.lockout_minutes} minutes'
+    }), 429
 
 def is_ip_blocked(ip):
     # You should implement IP blocking using Redis or similar
@@ -56,37 +42,13 @@ def register():
         if is_ip_blocked(request.remote_addr):
             return jsonify({'error': 'Too many requests', 'code': 'ip_blocked'}), 429
 
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-            
-        if not all(k in data for k in ['email', 'name', 'password']):
-            return jsonify({'error': 'Missing required fields'}), 400
-            
-        # Sanitize inputs
-        email = data['email'].strip().lower()
-        name = data['name'].strip()
-        password = data['password']
-            
-        # Enhanced validations
-        if not validate_email(email):
-            return jsonify({
-                'error': 'Invalid email format or length',
-                'requirements': 'Valid email format and maximum 120 characters'
-            }), 400
-            
-        if not validate_password(password):
-            return jsonify({
-                'error': 'Password does not meet requirements',
-                'requirements': 'At least 8 characters, 1 uppercase, 1 lowercase, 1 number, 1 special character'
-            }), 400
+        values, errors = REGISTER_SCHEMA.validate(request.get_json(silent=True))
+        if errors:
+            return validation_error(errors)
             
-        if not validate_name(name):
-            return jsonify({
-                'error': 'Invalid name format or length',
-                'requirements': 'Between 3-100 characters, letters, numbers, spaces, dots, and hyphens only'
-            }), 400
+        email = values['email']
+        name = values['name']
+        password = values['password']
             
         # Check for existing user with case-insensitive email
         if User.query.filter(User.email.ilike(email)).first():
@@ -109,19 +71,10 @@ def register():
             db.session.rollback()
             return jsonify({'error': 'Database constraint violation'}), 400
         
-        # Generate JWT token with limited expiry
-        token_expiry = int(os.getenv('JWT_EXPIRY_DAYS', '1'))
-        token = jwt.encode({
-            'user_id': user.id,
-            'email': user.email,
-            'exp': datetime.datetime.now(UTC) + datetime.timedelta(days=token_expiry),
-            'iat': datetime.datetime.now(UTC),
-            'type': 'access'
-        }, os.getenv('JWT_SECRET_KEY'), algorithm='HS256')
-        
+        # Short-lived access token plus a refresh token
         return jsonify({
             'message': 'User registered successfully',
-            'token': token,
+            **tokens.issue(user),
             'user': user.to_dict()
         }), 201
         
@@ -145,71 +98,154 @@ def login():
             return jsonify({'error': 'Missing required fields'}), 400
         
         email = data['email'].strip().lower()
+        max_attempts = login_tracker.max_attempts
         
-        # Check failed login attempts
-        attempts = get_failed_login_attempts(email)
-        if attempts >= 5:  # Lock after 5 failed attempts
-            return jsonify({
-                'error': 'Account temporarily locked',
-                'code': 'account_locked',
-                'retry_after': '15 minutes'
-            }), 429
+        # Check failed login attempts (Redis; None means fall back to the users row)
+        attempts = login_tracker.failed_attempts(email)
+        if attempts is not None and attempts >= max_attempts:
+            return account_locked_response()
         
         user = User.query.filter(User.email.ilike(email)).first()
         
+        if user and user.is_locked:
+            return account_locked_response()
+        
         if not user or not user.check_password(data['password']):
-            # Increment failed attempts counter (implement in Redis)
+            attempts = login_tracker.record_failure(email, user.id if user else None)
+            if attempts is None:
+                if user:
+                    user.increment_failed_attempts(max_attempts, login_tracker.lockout_minutes)
+                    attempts = user.failed_login_attempts
+                else:
+                    attempts = 1
             return jsonify({
                 'error': 'Invalid credentials',
-                'remaining_attempts': 5 - (attempts + 1)
+                'remaining_attempts': max(max_attempts - attempts, 0)
             }), 401
         
-        # Reset failed attempts counter on successful login
-        
-        # Generate JWT token with all necessary claims
-        token_expiry = int(os.getenv('JWT_EXPIRY_DAYS', '1'))
-        token = jwt.encode({
-            'user_id': user.id,
-            'email': user.email,
-            'exp': datetime.datetime.now(UTC) + datetime.timedelta(days=token_expiry),
-            'iat': datetime.datetime.now(UTC),
-            'type': 'access'
-        }, os.getenv('JWT_SECRET_KEY'), algorithm='HS256')
+        # Record the login; written to users in batches by the login tracker
+        if not login_tracker.record_success(email, user.id, request.remote_addr):
+            user.record_login(request.remote_addr)
         
         return jsonify({
-            'token': token,
+            **tokens.issue(user),
             'user': user.to_dict()
         }), 200
         
     except Exception as e:
         return jsonify({'error': 'Server error occurred during login'}), 500
 
+def bearer_token():
+    token = request.headers.get('Authorization')
+    if not token or not token.startswith('Bearer '):
+        return None
+    return token.split('Bearer ')[1]
+
 @auth_bp.route('/verify-token', methods=['POST'])
 def verify_token():
     try:
-        token = request.headers.get('Authorization')
+        token = bearer_token()
         
-        if not token or not token.startswith('Bearer '):
+        if not token:
             return jsonify({'error': 'Invalid token format', 'code': 'invalid_token_format'}), 401
             
-        token = token.split('Bearer ')[1]
-        
         try:
-            data = jwt.decode(token, os.getenv('JWT_SECRET_KEY'), algorithms=['HS256'])
-            user = User.query.get(data['user_id'])
+            # Signature, expiry and revocation only; no database access
+            data = tokens.decode_access(token)
             
-            if not user:
-                return jsonify({'error': 'User not found', 'code': 'user_not_found'}), 401
-                
             return jsonify({
                 'valid': True,
-                'user': user.to_dict()
+                'user': {'id': data['user_id'], 'email': data.get('email')},
+                'expires_at': data['exp']
             })
             
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired', 'code': 'token_expired'}), 401
+        except TokenRevoked:
+            return jsonify({'error': 'Token has been revoked', 'code': 'token_revoked'}), 401
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token', 'code': 'token_invalid'}), 401
             
     except Exception as e:
-        return jsonify({'error': 'Server error occurred during token verification', 'code': 'verification_error'}), 500 
\ No newline at end of file
+        return jsonify({'error': 'Server error occurred during token verification', 'code': 'verification_error'}), 500
+
+@auth_bp.route('/refresh', methods=['POST'])
+def refresh():
+    """Exchange a refresh token for a new access/refresh pair; the old refresh token is consumed."""
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('refresh_token'):
+            return jsonify({'error': 'No refresh token provided'}), 400
+            
+        try:
+            claims = tokens.decode_refresh(data['refresh_token'])
+        except jwt.ExpiredSignatureError:
+            return jsonify({'error': 'Refresh token has expired', 'code': 'refresh_expired'}), 401
+        except jwt.InvalidTokenError:
+            return jsonify({'error': 'Invalid refresh token', 'code': 'refresh_invalid'}), 401
+            
+        consumed = tokens.consume_refresh(claims)
+        if consumed is None:
+            return jsonify({'error': 'Token service temporarily unavailable'}), 503
+        if not consumed:
+            return jsonify({'error': 'Refresh token has been revoked', 'code': 'token_revoked'}), 401
+            
+        user = db.session.get(User, claims['user_id'])
+        if not user or not user.is_active:
+            return jsonify({'error': 'User not found', 'code': 'user_not_found'}), 401
+            
+        return jsonify(tokens.issue(user, family=claims['fam'])), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred during token refresh'}), 500
+
+@auth_bp.route('/logout', methods=['POST'])
+def logout():
+    """Revoke the presented access token and every token of its login."""
+    try:
+        token = bearer_token()
+        if not token:
+            return jsonify({'error': 'Invalid token format', 'code': 'invalid_token_format'}), 401
+            
+        try:
+            claims = tokens.decode_access(token)
+        except TokenRevoked:
+            return jsonify({'message': 'Logged out'}), 200
+        except jwt.InvalidTokenError:
+            return jsonify({'error': 'Invalid token', 'code': 'token_invalid'}), 401
+            
+        if not tokens.revoke(claims):
+            return jsonify({'error': 'Token service temporarily unavailable'}), 503
+        return jsonify({'message': 'Logged out'}), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred during logout'}), 500
+
+@auth_bp.route('/logout-all', methods=['POST'])
+def logout_all():
+    """Revoke every token issued to the user so far."""
+    try:
+        token = bearer_token()
+        if not token:
+            return jsonify({'error': 'Invalid token format', 'code': 'invalid_token_format'}), 401
+            
+        try:
+            claims = tokens.decode_access(token)
+        except jwt.ExpiredSignatureError:
+            return jsonify({'error': 'Token has expired', 'code': 'token_expired'}), 401
+        except jwt.InvalidTokenError:
+            return jsonify({'error': 'Invalid token', 'code': 'token_invalid'}), 401
+            
+        # Feed tokens never expire, so their revocation lives in the database
+        User.query.filter_by(id=claims['user_id']).update(
+            {User.feed_generation: User.feed_generation + 1}, synchronize_session=False
+        )
+        db.session.commit()
+        if not tokens.revoke_user(claims['user_id']):
+            return jsonify({'error': 'Token service temporarily unavailable'}), 503
+        return jsonify({'message': 'Logged out of all sessions'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Server error occurred during logout'}), 500
@@ -0,0 +1,77 @@
+from flask import Blueprint, Response, current_app, jsonify, request, url_for
+import jwt
+from sqlalchemy import select
+
+from .. import calendar_cache, tokens
+from ..models import db, User
+from ..utils.ical import feed_etag, feed_fingerprint, feed_meetings, feed_window, render_calendar
+from .meetings import token_required
+
+calendar_bp = Blueprint('calendar', __name__)
+
+@calendar_bp.route('/feed-url', methods=['GET'])
+@token_required
+def feed_url(current_user):
+    """Subscription URL of the caller's iCalendar feed."""
+    token = tokens.issue_feed(current_user)
+    return jsonify({'url': url_for('calendar.feed', token=token, _external=True)}), 200
+
+@calendar_bp.route('/feed.ics', methods=['GET'])
+def feed():
+    """
+    The user's meetings as iCalendar, recurring series expanded.
+
+    Authenticated by the ?token= from /feed-url since calendar apps cannot
+    send headers. The token must carry the user's current feed_generation,
+    which logout-all bumps. Beyond that point lookup, each poll costs one
+    aggregate query: an unchanged feed is a 304 for If-None-Match,
+    otherwise the body is served from the per-user cache and only rendered
+    after one of the user's meetings changed.
+    """
+    try:
+        claims = tokens.decode_feed(request.args.get('token', ''))
+    except jwt.InvalidTokenError:
+        return jsonify({'error': 'Invalid feed token'}), 401
+
+    try:
+        user_id = claims['user_id']
+        generation = db.session.execute(
+            select(User.feed_generation).where(User.id == user_id, User.is_active.is_(True))
+        ).scalar()
+        if generation is None or claims.get('gen', 0) != generation:
+            return jsonify({'error': 'Invalid feed token'}), 401
+
+        config = current_app.config
+        window_start, window_end = feed_window(
+            past_days=config.get('CALENDAR_PAST_DAYS', 30),
+            future_days=config.get('CALENDAR_FUTURE_DAYS', 180)
+        )
+        etag = feed_etag(user_id, feed_fingerprint(db.session, user_id), window_start)
+        refresh_minutes = config.get('CALENDAR_REFRESH_MINUTES', 15)
+        headers = {'Cache-Control': f'private, max-age={refresh_minutes * 60}'}
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304, headers=headers)
+            response.set_etag(etag)
+            return response
+
+        body = calendar_cache.get(user_id, etag)
+        if body is None:
+            body = render_calendar(
+                feed_meetings(db.session, user_id, window_start, window_end),
+                host=request.host.split(':')[0],
+                window_start=window_start,
+                window_end=window_end,
+                refresh_minutes=refresh_minutes,
+                max_occurrences=config.get('CALENDAR_MAX_OCCURRENCES', 500)
+            )
+            calendar_cache.set(user_id, etag, body)
+
+        response = Response(body, mimetype='text/calendar', headers=headers)
+        response.headers['Content-Disposition'] = 'inline; filename=meetings.ics'
+        response.set_etag(etag)
+        return response
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Server error occurred while building calendar'}), 500
@@ -0,0 +1,115 @@
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+import jwt
+
+from .. import event_hub, meeting_events, tokens
+from ..utils.events import MeetingEvents, parse_event_id
+from ..utils.tokens import TokenRevoked
+
+events_bp = Blueprint('events', __name__)
+
+# How long EventSource waits before reconnecting after the stream closes
+RECONNECT_MILLISECONDS = 2000
+
+# Retry-After when this process already serves EVENTS_MAX_STREAMS streams
+STREAMS_FULL_RETRY_SECONDS = 30
+
+def format_event(event_id, message):
+    """One server-sent event; messages are single-line JSON."""
+    return f'id: {event_id}\ndata: {message}\n\n'
+
+@events_bp.route('/stream', methods=['GET'])
+def stream():
+    """
+    Server-sent events for the caller's meetings.
+
+    Authenticated by the Authorization header or, since EventSource cannot
+    send headers, an access token in ?token=. Each event's id is its
+    position in the user's replay buffer: a reconnecting client sends it
+    back as Last-Event-ID and receives what it missed. If the buffer no
+    longer reaches back that far the stream starts with a 'reset' event and
+    the client should resynchronize with /api/meetings/sync.
+
+    The stream closes after EVENTS_MAX_STREAM_SECONDS or when the token
+    expires, whichever is first; clients reconnect with a fresh token.
+    Above EVENTS_MAX_STREAMS open streams in this process the answer is 503
+    with Retry-After, and clients poll /api/meetings/sync meanwhile.
+    """
+    header = request.headers.get('Authorization', '')
+    token = header.split('Bearer ')[1] if header.startswith('Bearer ') else request.args.get('token', '')
+    try:
+        claims = tokens.decode_access(token)
+    except jwt.ExpiredSignatureError:
+        return jsonify({'error': 'Token has expired', 'code': 'token_expired'}), 401
+    except TokenRevoked:
+        return jsonify({'error': 'Token has been revoked', 'code': 'token_revoked'}), 401
+    except Exception:
+        return jsonify({'error': 'Invalid token', 'code': 'token_invalid'}), 401
+
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    if last_id and parse_event_id(last_id) is None:
+        return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+
+    if not (meeting_events.available and event_hub.available):
+        return jsonify({'error': 'Event stream unavailable'}), 503
+
+    # A stream pins a server thread until it closes
+    if not event_hub.open_stream():
+        response = jsonify({'error': 'Too many event streams, retry later'})
+        response.headers['Retry-After'] = str(STREAMS_FULL_RETRY_SECONDS)
+        return response, 503
+
+    user_id = claims['user_id']
+    # Subscribe before reading the buffer so no event falls between the two
+    subscription = event_hub.subscribe(MeetingEvents.user_key(user_id))
+    if subscription is None:
+        event_hub.close_stream()
+        return jsonify({'error': 'Event stream unavailable'}), 503
+    try:
+        replayed, complete = meeting_events.replay(user_id, last_id) if last_id else ([], True)
+    except Exception as e:
+        event_hub.unsubscribe(subscription)
+        event_hub.close_stream()
+        current_app.logger.warning(f"Event replay failed for user {user_id}: {str(e)}")
+        return jsonify({'error': 'Event stream unavailable'}), 503
+
+    config = current_app.config
+    heartbeat = config.get('EVENTS_HEARTBEAT_SECONDS', 15)
+    deadline = time.monotonic() + min(config.get('EVENTS_MAX_STREAM_SECONDS', 300), claims['exp'] - time.time())
+
+    def generate():
+        try:
+            yield f'retry: {RECONNECT_MILLISECONDS}\n\n'
+            if not complete:
+                yield 'event: reset\ndata: {}\n\n'
+            last = parse_event_id(last_id) if last_id else None
+            for event_id, message in replayed:
+                last = parse_event_id(event_id)
+                yield format_event(event_id, message)
+            while time.monotonic() < deadline:
+                try:
+                    item = subscription.get(timeout=min(heartbeat, max(deadline - time.monotonic(), 0.1)))
+                except EOFError:
+                    break
+                if item is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                event_id, _, message = item.partition(' ')
+                position = parse_event_id(event_id)
+                # Live copies of events already sent from the buffer
+                if last is not None and position <= last:
+                    continue
+                last = position
+                yield format_event(event_id, message)
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Runs once the server is done with the response, even if the client
+    # left before the first chunk
+    response.call_on_close(event_hub.close_stream)
+    return response
@@ -0,0 +1,64 @@
+from flask import Blueprint, jsonify, current_app
+from sqlalchemy import text
+
+from .. import db, redis_client, health_prober, meeting_cache
+
+health_bp = Blueprint('health', __name__)
+
+def check_database():
+    with db.engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+
+def check_redis():
+    redis_client.ping()
+
+def pool_stats():
+    """Connection pool usage for this process, or None if the pool is not sized."""
+    pool = db.engine.pool
+    if not all(hasattr(pool, attr) for attr in ('size', 'checkedout', 'overflow')):
+        return None
+    size = pool.size()
+    max_overflow = current_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}).get('max_overflow', 0)
+    checked_out = pool.checkedout()
+    capacity = size + max(max_overflow, 0)
+    return {
+        'size': size,
+        'max_overflow': max_overflow,
+        'checked_out': checked_out,
+        'overflow': max(pool.overflow(), 0),
+        'saturation': round(checked_out / capacity, 3) if capacity else None
+    }
+
+def _cached_status():
+    # The prober thread is started by start_background_tasks(), not by probes
+    return health_prober.snapshot()
+
+@health_bp.route('/health')
+def health_check():
+    # Liveness: the process is serving requests; never touches dependencies
+    return jsonify({'status': 'healthy'}), 200
+
+@health_bp.route('/health/ready')
+def readiness_check():
+    # Ready when the database is; a Redis outage is listed under 'degraded'
+    snapshot = _cached_status()
+    snapshot['pool'] = pool_stats()
+    return jsonify(snapshot), 200 if snapshot['status'] == 'ready' else 503
+
+@health_bp.route('/health/db')
+def db_health_check():
+    dependency = _cached_status()['dependencies'].get('database', {})
+    if dependency.get('status') == 'healthy':
+        return jsonify({**dependency, 'status': 'healthy', 'message': 'Database connection successful'}), 200
+    return jsonify({**dependency, 'status': 'unhealthy', 'message': dependency.get('last_error')}), 500
+
+@health_bp.route('/health/redis')
+def redis_health_check():
+    dependency = _cached_status()['dependencies'].get('redis', {})
+    if dependency.get('status') == 'healthy':
+        return jsonify({**dependency, 'status': 'healthy', 'message': 'Redis connection successful'}), 200
+    return jsonify({**dependency, 'status': 'unhealthy', 'message': dependency.get('last_error')}), 500
+
+@health_bp.route('/health/cache')
+def cache_stats():
+    return jsonify({'meeting_cache': meeting_cache.get_stats()}), 200
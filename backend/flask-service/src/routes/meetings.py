@@ -1,14 +1,128 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from functools import wraps
 import jwt
-import os
-from datetime import datetime, UTC
-import bleach
+from datetime import datetime, timedelta, UTC
 
-from ..models import db, User, Meeting, MeetingParticipant, MeetingCoHost, MeetingAuditLog
+from sqlalchemy import func, select, update
+
+from .. import meeting_cache, meeting_acl, meeting_events, presence, telemetry, tokens
+from ..models import (db, User, Meeting, MeetingParticipant, MeetingCoHost, MeetingAuditLog, ArchivedMeeting,
+                      ArchivedMeetingParticipant, ArchivedMeetingAuditLog)
+from ..utils.database import insert_ignore
+from ..utils.export import EXPORT_FORMATS, streaming_export
+from ..utils.meeting_import import batch_conflicts, existing_conflicts, insert_meetings, naive_utc
+from ..utils.schema import Field, Schema, clean_html, validation_error
+from ..utils.search import decode_cursor, encode_cursor, search_meetings
+from ..utils.sync import meeting_audience, parse_token, record_deletion_tombstones, record_tombstones, sync_meetings
+from ..utils.telemetry import validate_samples
+from ..utils.tokens import TokenRevoked
 
 meetings_bp = Blueprint('meetings', __name__)
 
+def get_cached_meeting(id, include_archived=False):
+    """
+    Serialized meeting from the read-through cache, or None if it does not exist.
+
+    Archived meetings (marked 'archived': true) are only returned to
+    read-only endpoints that pass include_archived; to everything else
+    they do not exist.
+    """
+    def load():
+        meeting = Meeting.query.get(id) or db.session.get(ArchivedMeeting, id)
+        return meeting.to_dict() if meeting else None
+    meeting = meeting_cache.get(id, load)
+    if meeting and meeting.get('archived') and not include_archived:
+        return None
+    return meeting
+
+def parse_utc(value):
+    """Parse an ISO timestamp from a serialized meeting; naive values are UTC."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+MAX_CO_HOSTS_PER_REQUEST = 500
+
+def parse_co_host_ids(raw_ids, host_id):
+    """Validate a list of co-host user ids. Returns (sorted unique ids without the host, error)."""
+    if not isinstance(raw_ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in raw_ids):
+        return None, 'Co-hosts must be a list of user ids'
+    if len(raw_ids) > MAX_CO_HOSTS_PER_REQUEST:
+        return None, f'Too many co-hosts (max {MAX_CO_HOSTS_PER_REQUEST} per request)'
+    return sorted(set(raw_ids) - {host_id}), None
+
+def find_missing_users(user_ids):
+    """Return the ids in user_ids that have no user, using one query."""
+    if not user_ids:
+        return []
+    found = {user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(user_ids))}
+    return [user_id for user_id in user_ids if user_id not in found]
+
+def add_co_hosts(meeting_id, user_ids):
+    """Insert co-hosts in one statement, skipping existing ones. Returns the ids actually added."""
+    now = datetime.now(UTC)
+    rows = [
+        {'meeting_id': meeting_id, 'user_id': user_id, 'created_at': now, 'updated_at': now}
+        for user_id in user_ids
+    ]
+    inserted = insert_ignore(MeetingCoHost, rows, ['meeting_id', 'user_id'], returning=['user_id'])
+    return sorted(row.user_id for row in inserted)
+
+def waiting_status(meeting_id, participant_id):
+    """Status of a participant of this meeting, or None if there is no such participant."""
+    return db.session.execute(
+        select(MeetingParticipant.status).where(
+            MeetingParticipant.meeting_id == meeting_id,
+            MeetingParticipant.id == participant_id
+        )
+    ).scalar()
+
+MAX_DECISIONS_PER_REQUEST = 500
+
+def decide_waiting_participants(meeting_id, status, participant_ids=None, limit=None):
+    """
+    Move pending participants to status in one UPDATE.
+
+    Targets are the given participant_ids, or the first `limit` pending
+    participants in arrival order. Rows that are no longer pending are left
+    alone. Returns a list of (participant_id, user_id) actually changed.
+    """
+    now = datetime.now(UTC)
+    targets = select(MeetingParticipant.id).where(
+        MeetingParticipant.meeting_id == meeting_id,
+        MeetingParticipant.status == 'pending'
+    )
+    if participant_ids is not None:
+        targets = targets.where(MeetingParticipant.id.in_(participant_ids))
+    if limit is not None:
+        targets = targets.order_by(MeetingParticipant.created_at, MeetingParticipant.id).limit(limit)
+
+    values = {'status': status, 'updated_at': now}
+    if status == 'approved':
+        values['joined_at'] = now
+    stmt = update(MeetingParticipant).where(
+        # meeting_id on both sides keeps PostgreSQL on one partition
+        MeetingParticipant.meeting_id == meeting_id,
+        MeetingParticipant.id.in_(targets),
+        MeetingParticipant.status == 'pending'
+    ).values(**values).returning(
+        MeetingParticipant.id, MeetingParticipant.user_id
+    ).execution_options(synchronize_session=False)
+    return sorted((row.id, row.user_id) for row in db.session.execute(stmt))
+
+def notify(meeting_id, event, data, managers_only=False, user_ids=()):
+    """
+    Publish a meeting event to its audience (host, co-hosts and, unless
+    managers_only, participants) plus user_ids. Call after commit; a
+    failure here is logged and never fails the request.
+    """
+    audience = set(user_ids)
+    if meeting_events.available:
+        try:
+            audience.update(db.session.execute(meeting_audience(meeting_id, managers_only)).scalars())
+        except Exception as e:
+            current_app.logger.warning(f"Could not resolve audience of meeting {meeting_id}: {str(e)}")
+    meeting_events.publish(meeting_id, event, data, audience)
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -19,7 +133,7 @@ def token_required(f):
             
         try:
             token = token.split('Bearer ')[1]
-            data = jwt.decode(token, os.getenv('JWT_SECRET_KEY'), algorithms=['HS256'])
+            data = tokens.decode_access(token)
             current_user = User.query.get(data['user_id'])
             
             if not current_user:
@@ -27,6 +141,8 @@ def token_required(f):
                 
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired', 'code': 'token_expired'}), 401
+        except TokenRevoked:
+            return jsonify({'error': 'Token has been revoked', 'code': 'token_revoked'}), 401
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token', 'code': 'token_invalid'}), 401
         except jwt.InvalidKeyError:
@@ -40,83 +156,66 @@ def token_required(f):
         
     return decorated
 
+def _meeting_time_error(values):
+    """Start and end relative to now: not in the past, 5 minutes to 24 hours, within a year."""
+    start_time, end_time = values['start_time'], values['end_time']
+    current_time = datetime.now(UTC)
+    if start_time < current_time:
+        return 'Meeting cannot start in the past'
+    if start_time >= end_time:
+        return 'Start time must be before end time'
+    duration = (end_time - start_time).total_seconds()
+    if duration < 300:
+        return 'Meeting must be at least 5 minutes long'
+    if duration > 86400:
+        return 'Meeting cannot be longer than 24 hours'
+    if (start_time - current_time).days > 365:
+        return 'Cannot schedule meetings more than 1 year in advance'
+    return None
+
+CREATE_MEETING_SCHEMA = Schema({
+    'title': Field(str, required=True, strip=True, sanitize=clean_html, min_length=1, max_length=200),
+    'description': Field(str, required=True, strip=True, sanitize=clean_html, max_length=2000),
+    'start_time': Field(datetime, required=True, aware=True),
+    'end_time': Field(datetime, required=True, aware=True),
+    'meeting_type': Field(str, default='regular', choices=['regular', 'recurring', 'private']),
+    'max_participants': Field(int, nullable=True, minimum=1),
+    'requires_approval': Field(bool, default=False),
+    'is_recorded': Field(bool, default=False),
+    'recurring_pattern': Field(str, nullable=True, choices=['daily', 'weekly', 'monthly', 'custom']),
+    'co_hosts': Field(list, default=list, max_length=MAX_CO_HOSTS_PER_REQUEST, items=Field(int),
+                      message='Co-hosts must be a list of user ids')
+}, checks=[
+    ('end_time', ('start_time', 'end_time'), _meeting_time_error),
+    ('recurring_pattern', ('meeting_type',), lambda v: (
+        'Invalid recurring pattern for recurring meeting'
+        if v['meeting_type'] == 'recurring' and not v['recurring_pattern'] else None))
+])
+
 @meetings_bp.route('/create', methods=['POST'])
 @token_required
 def create_meeting(current_user):
     """Create a new meeting."""
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-            
-        required_fields = ['title', 'description', 'start_time', 'end_time']
-        if not all(field in data for field in required_fields):
-            return jsonify({'error': 'Missing required fields'}), 400
-            
-        # Validate title and description
-        title = bleach.clean(data['title'].strip())
-        description = bleach.clean(data['description'].strip())
-        
-        if not title:
-            return jsonify({'error': 'Meeting title cannot be empty'}), 400
-            
-        if len(title) > 200:
-            return jsonify({'error': 'Meeting title too long (max 200 characters)'}), 400
-            
-        if len(description) > 2000:
-            return jsonify({'error': 'Meeting description too long (max 2000 characters)'}), 400
-
-        try:
-            start_time = datetime.fromisoformat(data['start_time'].replace('Z', '+00:00'))
-            end_time = datetime.fromisoformat(data['end_time'].replace('Z', '+00:00'))
+        values, errors = CREATE_MEETING_SCHEMA.validate(request.get_json(silent=True))
+        if errors:
+            return validation_error(errors)
             
-            if not start_time.tzinfo or not end_time.tzinfo:
-                return jsonify({'error': 'Timezone information is required'}), 400
-                
-        except ValueError:
-            return jsonify({'error': 'Invalid datetime format. Please use ISO format'}), 400
+        title = values['title']
+        description = values['description']
+        start_time = values['start_time']
+        end_time = values['end_time']
+        meeting_type = values['meeting_type']
+        max_participants = values['max_participants']
+        requires_approval = values['requires_approval']
+        is_recorded = values['is_recorded']
+        recurring_pattern = values['recurring_pattern'] if meeting_type == 'recurring' else None
 
-        current_time = datetime.now(UTC)
-        
-        # Enhanced time validations
-        if start_time < current_time:
-            return jsonify({'error': 'Meeting cannot start in the past'}), 400
-            
-        if start_time >= end_time:
-            return jsonify({'error': 'Start time must be before end time'}), 400
-            
-        # Validate reasonable time ranges
-        duration = end_time - start_time
-        if duration.total_seconds() < 300:  # 5 minutes minimum
-            return jsonify({'error': 'Meeting must be at least 5 minutes long'}), 400
-            
-        if duration.total_seconds() > 86400:  # 24 hours maximum
-            return jsonify({'error': 'Meeting cannot be longer than 24 hours'}), 400
-            
-        # Check if start time is too far in the future
-        if (start_time - current_time).days > 365:
-            return jsonify({'error': 'Cannot schedule meetings more than 1 year in advance'}), 400
-            
-        # Validate meeting type and settings
-        meeting_type = data.get('meeting_type', 'regular')
-        if meeting_type not in ['regular', 'recurring', 'private']:
-            return jsonify({'error': 'Invalid meeting type'}), 400
-            
-        max_participants = data.get('max_participants')
-        if max_participants is not None:
-            if not isinstance(max_participants, int) or max_participants <= 0:
-                return jsonify({'error': 'Invalid maximum participants value'}), 400
-                
-        requires_approval = data.get('requires_approval', False)
-        is_recorded = data.get('is_recorded', False)
-        
-        # Handle recurring meeting pattern
-        recurring_pattern = None
-        if meeting_type == 'recurring':
-            recurring_pattern = data.get('recurring_pattern')
-            if not recurring_pattern or recurring_pattern not in ['daily', 'weekly', 'monthly', 'custom']:
-                return jsonify({'error': 'Invalid recurring pattern for recurring meeting'}), 400
+        # Validate co-hosts up front with a single lookup
+        co_host_ids = sorted(set(values['co_hosts']) - {current_user.id})
+        missing_user_ids = find_missing_users(co_host_ids)
+        if missing_user_ids:
+            return jsonify({'error': 'Co-host users not found', 'missing_user_ids': missing_user_ids}), 400
             
         # Check for overlapping meetings for the user
         user_meetings = Meeting.query.filter(
@@ -135,7 +234,7 @@ def create_meeting(current_user):
             Meeting.ended_at.is_(None)
         ).count()
         
-        if active_meetings_count >= 50:
+        if active_meetings_count >= current_app.config.get('MAX_ACTIVE_MEETINGS', 50):
             return jsonify({'error': 'You have reached the maximum limit of active meetings'}), 400
         
         # Create the meeting
@@ -155,13 +254,17 @@ def create_meeting(current_user):
             meeting.recurring_pattern = recurring_pattern
             
         db.session.add(meeting)
+        db.session.flush()  # assigns meeting.id for the co-host and audit rows
         
         # Add co-hosts if specified
-        co_host_ids = data.get('co_hosts', [])
-        for co_host_id in co_host_ids:
-            if co_host_id != current_user.id:
-                co_host = MeetingCoHost(meeting_id=meeting.id, user_id=co_host_id)
-                db.session.add(co_host)
+        added_co_host_ids = add_co_hosts(meeting.id, co_host_ids)
+        if added_co_host_ids:
+            db.session.add(MeetingAuditLog(
+                meeting_id=meeting.id,
+                user_id=current_user.id,
+                action='added_co_hosts',
+                details={'co_host_ids': added_co_host_ids}
+            ))
                 
         # Log the creation
         audit_log = MeetingAuditLog(
@@ -178,6 +281,11 @@ def create_meeting(current_user):
         db.session.add(audit_log)
         
         db.session.commit()
+        notify(meeting.id, 'meeting_created', {
+            'title': meeting.title,
+            'start_time': meeting.start_time.isoformat(),
+            'end_time': meeting.end_time.isoformat()
+        }, managers_only=True)
         
         return jsonify(meeting.to_dict()), 201
         
@@ -185,6 +293,91 @@ def create_meeting(current_user):
         db.session.rollback()
         return jsonify({'error': 'Server error occurred while creating meeting'}), 500
 
+@meetings_bp.route('/import', methods=['POST'])
+@token_required
+def import_meetings(current_user):
+    """
+    Create many meetings in one transaction.
+
+    Items are validated like /create. Overlaps are checked within the batch
+    (the earlier-starting meeting wins) and against existing meetings with
+    one range query. Invalid items are reported by index and skipped; the
+    rest are inserted with one multi-row statement per table.
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('meetings') if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'meetings must be a non-empty list'}), 400
+        max_items = current_app.config.get('MAX_IMPORT_MEETINGS', 500)
+        if len(items) > max_items:
+            return jsonify({'error': f'Too many meetings (max {max_items} per request)'}), 400
+            
+        errors = {}
+        valid = {}
+        for index, item in enumerate(items):
+            values, item_errors = CREATE_MEETING_SCHEMA.validate(item)
+            if item_errors:
+                errors[index] = item_errors
+                continue
+            values['start_time'] = naive_utc(values['start_time'])
+            values['end_time'] = naive_utc(values['end_time'])
+            values['co_hosts'] = sorted(set(values['co_hosts']) - {current_user.id})
+            if values['meeting_type'] != 'recurring':
+                values['recurring_pattern'] = None
+            valid[index] = values
+            
+        # Every co-host of the batch in one lookup
+        missing = set(find_missing_users(sorted({u for values in valid.values() for u in values['co_hosts']})))
+        for index in [i for i, values in valid.items() if missing.intersection(values['co_hosts'])]:
+            errors[index] = {'co_hosts': 'Co-host users not found'}
+            del valid[index]
+            
+        # Serialize imports by the same user so concurrent batches cannot overlap
+        db.session.execute(select(User.id).where(User.id == current_user.id).with_for_update())
+        
+        intervals = {index: (values['start_time'], values['end_time']) for index, values in valid.items()}
+        for index, other in batch_conflicts(intervals).items():
+            errors[index] = {'start_time': f'Overlaps meeting {other} of this batch'}
+            del intervals[index]
+        for index in existing_conflicts(db.session, current_user.id, intervals):
+            errors[index] = {'start_time': 'You have another meeting scheduled during this time'}
+            del intervals[index]
+            
+        active_meetings_count = db.session.execute(
+            select(func.count(Meeting.id)).where(
+                Meeting.created_by == current_user.id,
+                Meeting.ended_at.is_(None)
+            )
+        ).scalar()
+        capacity = max(current_app.config.get('MAX_ACTIVE_MEETINGS', 50) - active_meetings_count, 0)
+        accepted = sorted(intervals)
+        for index in accepted[capacity:]:
+            errors[index] = {'body': 'You have reached the maximum limit of active meetings'}
+        accepted = accepted[:capacity]
+        
+        meeting_ids = insert_meetings(db.session, current_user.id, [valid[index] for index in accepted])
+        db.session.commit()
+        
+        meeting_events.publish_many(
+            (meeting_id, 'meeting_created', {
+                'title': valid[index]['title'],
+                'start_time': valid[index]['start_time'].isoformat(),
+                'end_time': valid[index]['end_time'].isoformat()
+            }, [current_user.id, *valid[index]['co_hosts']])
+            for index, meeting_id in zip(accepted, meeting_ids)
+        )
+        
+        return jsonify({
+            'message': f'{len(meeting_ids)} meeting(s) imported',
+            'created': [{'index': index, 'id': meeting_id} for index, meeting_id in zip(accepted, meeting_ids)],
+            'errors': [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
+        }), 201 if meeting_ids else 400
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Server error occurred while importing meetings'}), 500
+
 @meetings_bp.route('/join/<int:id>', methods=['GET'])
 @token_required
 def join_meeting(current_user, id):
@@ -192,19 +385,22 @@ def join_meeting(current_user, id):
         if id <= 0:
             return jsonify({'error': 'Invalid meeting ID'}), 400
             
-        meeting = Meeting.query.get(id)
+        meeting = get_cached_meeting(id)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
             
         # Check if meeting has ended
-        if meeting.ended_at:
+        if meeting['ended_at']:
             return jsonify({'error': 'Meeting has already ended'}), 400
 
+        start_time = parse_utc(meeting['start_time'])
+        end_time = parse_utc(meeting['end_time'])
+
         # Check if meeting hasn't started yet
         current_time = datetime.now(UTC)
-        if current_time < meeting.start_time:
-            time_until_start = (meeting.start_time - current_time).total_seconds()
+        if current_time < start_time:
+            time_until_start = (start_time - current_time).total_seconds()
             if time_until_start > 300:  # More than 5 minutes before start
                 return jsonify({
                     'error': 'Meeting has not started yet',
@@ -212,65 +408,96 @@ def join_meeting(current_user, id):
                 }), 400
 
         # Check if meeting has exceeded its end time
-        if current_time > meeting.end_time:
+        if current_time > end_time:
             return jsonify({'error': 'Meeting has exceeded its scheduled end time'}), 400
 
         # Check maximum participants limit
         current_participants = MeetingParticipant.query.filter_by(
-            meeting_id=meeting.id,
+            meeting_id=id,
             left_at=None
         ).count()
-        if meeting.max_participants and current_participants >= meeting.max_participants:
+        if meeting['max_participants'] and current_participants >= meeting['max_participants']:
             return jsonify({'error': 'Meeting has reached maximum participants'}), 400
 
         # Check if user is banned
-        participant = MeetingParticipant.query.filter_by(
-            meeting_id=meeting.id,
-            user_id=current_user.id
-        ).first()
-        
-        if participant and participant.is_banned:
+        acl_role = meeting_acl.role(current_user.id, meeting)
+        if acl_role == 'banned':
             return jsonify({'error': 'You have been banned from this meeting'}), 403
 
-        # Check concurrent meetings
-        active_participation = MeetingParticipant.query.join(Meeting).filter(
-            MeetingParticipant.user_id == current_user.id,
-            Meeting.ended_at.is_(None),
-            Meeting.id != meeting.id,
-            MeetingParticipant.left_at.is_(None)
-        ).first()
+        # Check concurrent meetings: the presence registry knows where the
+        # user is heartbeating; when it cannot tell (no Redis, or clients not
+        # heartbeating yet), fall back to open participations
+        other_meeting = presence.other_meeting(current_user.id, id)
+        if other_meeting is None:
+            active_participation = MeetingParticipant.query.join(Meeting).filter(
+                MeetingParticipant.user_id == current_user.id,
+                Meeting.ended_at.is_(None),
+                Meeting.id != id,
+                MeetingParticipant.left_at.is_(None)
+            ).first() is not None
+        else:
+            other = get_cached_meeting(other_meeting) if other_meeting else None
+            active_participation = bool(other and not other['ended_at'])
         
         if active_participation:
             return jsonify({'error': 'You are already in another active meeting'}), 400
 
         # Determine participant role
         participant_role = 'attendee'
-        if meeting.created_by == current_user.id:
-            participant_role = 'host'
-        elif MeetingCoHost.query.filter_by(meeting_id=meeting.id, user_id=current_user.id).first():
-            participant_role = 'co-host'
+        if acl_role in ('host', 'co-host'):
+            participant_role = acl_role
 
-        # Handle participant joining
-        if meeting.created_by != current_user.id:
-            if not participant:
+        # Handle participant joining; every statement names the meeting so
+        # PostgreSQL touches a single meeting_participants partition
+        participant_status = None
+        if meeting['created_by'] != current_user.id:
+            # Always probe (meeting_id, user_id): a cached 'none' role may be
+            # stale in this process, and the table has no unique constraint
+            # to stop a duplicate row
+            existing = db.session.execute(
+                select(MeetingParticipant.id, MeetingParticipant.status).where(
+                    MeetingParticipant.meeting_id == id,
+                    MeetingParticipant.user_id == current_user.id
+                ).limit(1)
+            ).first()
+            joined_at = current_time if not meeting['requires_approval'] else None
+            if not existing:
                 participant = MeetingParticipant(
-                    meeting_id=meeting.id,
+                    meeting_id=id,
                     user_id=current_user.id,
-                    status='pending' if meeting.requires_approval else 'approved',
-                    role=participant_role,
-                    joined_at=current_time if not meeting.requires_approval else None
+                    status='pending' if meeting['requires_approval'] else 'approved',
+                    role=participant_role
                 )
+                participant.joined_at = joined_at
                 db.session.add(participant)
+                db.session.flush()
+                participant_id, participant_status = participant.id, participant.status
             else:
                 # Update rejoin time if they previously left
-                participant.joined_at = current_time if not meeting.requires_approval else None
-                participant.left_at = None
-                participant.role = participant_role
+                participant_id, participant_status = existing
+                db.session.execute(
+                    update(MeetingParticipant).where(
+                        MeetingParticipant.meeting_id == id,
+                        MeetingParticipant.id == participant_id
+                    ).values(
+                        joined_at=joined_at,
+                        left_at=None,
+                        role=participant_role,
+                        updated_at=current_time
+                    ).execution_options(synchronize_session=False)
+                )
                 
             db.session.commit()
+            meeting_acl.invalidate(id, current_user.id)
+            change = {'participant_id': participant_id, 'user_id': current_user.id}
+            if participant_status == 'pending':
+                notify(id, 'roster_delta', {'waiting': [change]}, managers_only=True, user_ids=[current_user.id])
+            elif participant_status == 'approved':
+                notify(id, 'roster_delta', {'joined': [change]}, managers_only=True, user_ids=[current_user.id])
 
             # If waiting room is enabled
-            if meeting.requires_approval and participant.status == 'pending':
+            if meeting['requires_approval'] and participant_status == 'pending':
+                presence.register(current_user.id, id)
                 return jsonify({
                     'message': 'Waiting for host approval',
                     'status': 'waiting'
@@ -278,25 +505,26 @@ def join_meeting(current_user, id):
 
         # Log the join attempt
         audit_log = MeetingAuditLog(
-            meeting_id=meeting.id,
+            meeting_id=id,
             user_id=current_user.id,
             action='joined',
             details={
                 'role': participant_role,
-                'status': participant.status if participant else 'host'
+                'status': participant_status or 'host'
             }
         )
         db.session.add(audit_log)
         db.session.commit()
+        presence.register(current_user.id, id)
 
         # Return meeting details with participant info
-        meeting_dict = meeting.to_dict()
+        meeting_dict = dict(meeting)
         meeting_dict.update({
-            'is_creator': meeting.created_by == current_user.id,
+            'is_creator': meeting['created_by'] == current_user.id,
             'is_co_host': participant_role == 'co-host',
             'role': participant_role,
             'participant_count': current_participants,
-            'time_remaining_minutes': round((meeting.end_time - current_time).total_seconds() / 60)
+            'time_remaining_minutes': round((end_time - current_time).total_seconds() / 60)
         })
         return jsonify(meeting_dict), 200
         
@@ -346,24 +574,152 @@ def list_meetings(current_user):
         db.session.rollback()
         return jsonify({'error': 'Server error occurred while fetching meetings'}), 500
 
+@meetings_bp.route('/sync', methods=['GET'])
+@token_required
+def sync(current_user):
+    """
+    Delta sync for the meeting list.
+
+    Without ?since= this returns the full list (reset: true). Afterwards
+    clients pass back the sync_token they were given and receive only
+    meetings that changed since, ended ones included, plus tombstones for
+    meetings that left their list. A token older than the tombstone
+    retention gets a full list again.
+    """
+    try:
+        since = request.args.get('since')
+        if since is not None:
+            since = parse_token(since)
+            if since is None:
+                return jsonify({'error': 'Invalid sync token'}), 400
+        active_only = request.args.get('active_only', 'true').lower() == 'true'
+
+        retention = timedelta(days=current_app.config.get('SYNC_TOMBSTONE_DAYS', 30))
+        return jsonify(sync_meetings(db.session, current_user.id, since, active_only, retention)), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Server error occurred while syncing meetings'}), 500
+
+MAX_SEARCH_RESULTS = 50
+MAX_SEARCH_QUERY_LENGTH = 200
+
+@meetings_bp.route('/search', methods=['GET'])
+@token_required
+def search(current_user):
+    """
+    Full-text search over the titles and descriptions of meetings the user can see.
+
+    ?q=<query> supports quoted phrases, OR and -exclusions. Results are
+    ranked best first; pass next_cursor back as ?cursor= for the next page.
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Search query is required'}), 400
+        if len(query) > MAX_SEARCH_QUERY_LENGTH:
+            return jsonify({'error': f'Search query is too long (max {MAX_SEARCH_QUERY_LENGTH} characters)'}), 400
+
+        limit = request.args.get('limit', '20')
+        if not limit.isdigit() or not 0 < int(limit) <= MAX_SEARCH_RESULTS:
+            return jsonify({'error': f'limit must be between 1 and {MAX_SEARCH_RESULTS}'}), 400
+        limit = int(limit)
+
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            cursor = decode_cursor(cursor)
+            if cursor is None:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+        results = search_meetings(db.session, current_user.id, query, limit, cursor)
+        next_cursor = None
+        if len(results) == limit:
+            last_meeting, last_rank = results[-1]
+            next_cursor = encode_cursor(last_rank, last_meeting.id)
+
+        return jsonify({
+            'results': [{**meeting.to_dict(), 'rank': round(rank, 6)} for meeting, rank in results],
+            'next_cursor': next_cursor
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Server error occurred while searching meetings'}), 500
+
 @meetings_bp.route('/<int:id>', methods=['GET'])
 @token_required
 def get_meeting(current_user, id):
     try:
-        meeting = Meeting.query.get(id)
+        meeting = get_cached_meeting(id, include_archived=True)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
             
         # Check if user has access to the meeting
-        if meeting.created_by != current_user.id and current_user.id not in [p.user_id for p in meeting.participants]:
+        if not meeting_acl.can(current_user.id, meeting, 'view'):
             return jsonify({'error': 'Access denied'}), 403
             
-        return jsonify(meeting.to_dict())
+        return jsonify(meeting)
         
     except Exception as e:
         return jsonify({'error': 'Server error occurred while fetching meeting'}), 500
 
+@meetings_bp.route('/<int:id>/presence', methods=['GET'])
+@token_required
+def get_presence(current_user, id):
+    try:
+        meeting = get_cached_meeting(id)
+        
+        if not meeting:
+            return jsonify({'error': 'Meeting not found'}), 404
+            
+        if not meeting_acl.can(current_user.id, meeting, 'view'):
+            return jsonify({'error': 'Access denied'}), 403
+            
+        user_ids = [] if meeting['ended_at'] else presence.members(id)
+        if user_ids is None:
+            return jsonify({'error': 'Presence is temporarily unavailable'}), 503
+            
+        return jsonify({
+            'meeting_id': id,
+            'user_ids': user_ids,
+            'heartbeat_ttl_seconds': presence.ttl
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred while fetching presence'}), 500
+
+@meetings_bp.route('/<int:id>/presence', methods=['POST'])
+@token_required
+def presence_heartbeat(current_user, id):
+    """
+    Keep the caller's presence in the meeting alive. Clients call this every
+    third of PRESENCE_TTL_SECONDS; it only extends a registration made by
+    joining, so a 409 'presence_expired' means the client should join again.
+    """
+    try:
+        registered = presence.heartbeat(current_user.id, id)
+        if registered is None:
+            return jsonify({'error': 'Presence is temporarily unavailable'}), 503
+        if not registered:
+            return jsonify({'error': 'Not present in this meeting', 'code': 'presence_expired'}), 409
+
+        return jsonify({'message': 'Presence extended'}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred while recording presence'}), 500
+
+@meetings_bp.route('/<int:id>/presence', methods=['DELETE'])
+@token_required
+def leave_presence(current_user, id):
+    """Record that the caller left the meeting; reconcile sets their left_at."""
+    try:
+        presence.leave(current_user.id, id)
+        return jsonify({'message': 'Left meeting'}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred while leaving meeting'}), 500
+
 @meetings_bp.route('/<int:id>', methods=['DELETE'])
 @token_required
 def delete_meeting(current_user, id):
@@ -376,8 +732,14 @@ def delete_meeting(current_user, id):
         if meeting.created_by != current_user.id:
             return jsonify({'error': 'Only the host can delete the meeting'}), 403
             
+        # The audience is gone once the delete cascades
+        audience = db.session.execute(meeting_audience(id)).scalars().all() if meeting_events.available else []
+        record_deletion_tombstones(db.session, id)
         db.session.delete(meeting)
         db.session.commit()
+        meeting_cache.bump(id)
+        meeting_acl.invalidate_meeting(id)
+        meeting_events.publish(id, 'meeting_deleted', {}, audience)
         
         return jsonify({'message': 'Meeting deleted successfully'}), 200
         
@@ -397,10 +759,29 @@ def end_meeting(current_user, id):
         if meeting.created_by != current_user.id:
             return jsonify({'error': 'Only the host can end the meeting'}), 403
             
-        meeting.ended_at = datetime.now(UTC)
+        if meeting.ended_at:
+            return jsonify({'error': 'Meeting has already ended'}), 400
+            
+        ended_at = datetime.now(UTC)
+        meeting.ended_at = ended_at
+        
+        # Close every open participation in one statement
+        closed = MeetingParticipant.close_open_participations(id, ended_at)
+        
+        db.session.add(MeetingAuditLog(
+            meeting_id=id,
+            user_id=current_user.id,
+            action='ended',
+            details={'closed_participations': closed}
+        ))
         db.session.commit()
+        meeting_cache.bump(id)
+        notify(id, 'meeting_ended', {
+            'ended_at': ended_at.isoformat(),
+            'closed_participations': closed
+        })
         
-        return jsonify({'message': 'Meeting ended successfully'}), 200
+        return jsonify({'message': 'Meeting ended successfully', 'closed_participations': closed}), 200
         
     except Exception as e:
         db.session.rollback()
@@ -410,12 +791,12 @@ def end_meeting(current_user, id):
 @token_required
 def add_co_host(current_user, id):
     try:
-        meeting = Meeting.query.get(id)
+        meeting = get_cached_meeting(id)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
             
-        if meeting.created_by != current_user.id:
+        if not meeting_acl.can(current_user.id, meeting, 'manage_co_hosts'):
             return jsonify({'error': 'Only the host can add co-hosts'}), 403
             
         data = request.get_json()
@@ -424,22 +805,20 @@ def add_co_host(current_user, id):
             
         user_id = data['user_id']
         
+        user_ids, error = parse_co_host_ids([user_id], meeting['created_by'])
+        if error:
+            return jsonify({'error': 'Invalid user_id'}), 400
+        if not user_ids:
+            return jsonify({'error': 'The host cannot be a co-host'}), 400
+            
         # Check if user exists
-        user = User.query.get(user_id)
-        if not user:
+        if find_missing_users(user_ids):
             return jsonify({'error': 'User not found'}), 404
             
-        # Check if already a co-host
-        existing_co_host = MeetingCoHost.query.filter_by(
-            meeting_id=id,
-            user_id=user_id
-        ).first()
-        
-        if existing_co_host:
+        # Insert unless already a co-host
+        if not add_co_hosts(id, user_ids):
+            db.session.rollback()
             return jsonify({'error': 'User is already a co-host'}), 400
-            
-        co_host = MeetingCoHost(meeting_id=id, user_id=user_id)
-        db.session.add(co_host)
         
         # Log the action
         audit_log = MeetingAuditLog(
@@ -451,6 +830,9 @@ def add_co_host(current_user, id):
         db.session.add(audit_log)
         
         db.session.commit()
+        meeting_cache.bump(id)
+        meeting_acl.invalidate(id, user_id)
+        notify(id, 'co_hosts_changed', {'added': user_ids})
         
         return jsonify({'message': 'Co-host added successfully'}), 200
         
@@ -458,16 +840,68 @@ def add_co_host(current_user, id):
         db.session.rollback()
         return jsonify({'error': 'Server error occurred while adding co-host'}), 500
 
+@meetings_bp.route('/<int:id>/co-hosts/bulk', methods=['POST'])
+@token_required
+def add_co_hosts_bulk(current_user, id):
+    try:
+        meeting = get_cached_meeting(id)
+        
+        if not meeting:
+            return jsonify({'error': 'Meeting not found'}), 404
+            
+        if not meeting_acl.can(current_user.id, meeting, 'manage_co_hosts'):
+            return jsonify({'error': 'Only the host can add co-hosts'}), 403
+            
+        data = request.get_json()
+        if not data or 'user_ids' not in data:
+            return jsonify({'error': 'No user_ids provided'}), 400
+            
+        user_ids, error = parse_co_host_ids(data['user_ids'], meeting['created_by'])
+        if error:
+            return jsonify({'error': error}), 400
+            
+        # Validate every user in one query
+        missing_user_ids = find_missing_users(user_ids)
+        if missing_user_ids:
+            return jsonify({'error': 'Users not found', 'missing_user_ids': missing_user_ids}), 404
+            
+        added = add_co_hosts(id, user_ids)
+        
+        # One audit record for the whole batch
+        if added:
+            db.session.add(MeetingAuditLog(
+                meeting_id=id,
+                user_id=current_user.id,
+                action='added_co_hosts',
+                details={'co_host_ids': added}
+            ))
+        
+        db.session.commit()
+        if added:
+            meeting_cache.bump(id)
+            meeting_acl.invalidate_many(id, added)
+            notify(id, 'co_hosts_changed', {'added': added})
+        
+        return jsonify({
+            'message': f'{len(added)} co-host(s) added',
+            'added': added,
+            'already_co_hosts': sorted(set(user_ids) - set(added))
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Server error occurred while adding co-hosts'}), 500
+
 @meetings_bp.route('/<int:id>/co-hosts/<int:user_id>', methods=['DELETE'])
 @token_required
 def remove_co_host(current_user, id, user_id):
     try:
-        meeting = Meeting.query.get(id)
+        meeting = get_cached_meeting(id)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
             
-        if meeting.created_by != current_user.id:
+        if not meeting_acl.can(current_user.id, meeting, 'manage_co_hosts'):
             return jsonify({'error': 'Only the host can remove co-hosts'}), 403
             
         co_host = MeetingCoHost.query.filter_by(
@@ -479,6 +913,7 @@ def remove_co_host(current_user, id, user_id):
             return jsonify({'error': 'User is not a co-host'}), 404
             
         db.session.delete(co_host)
+        record_tombstones(db.session, id, [user_id], 'co_host_removed')
         
         # Log the action
         audit_log = MeetingAuditLog(
@@ -490,6 +925,9 @@ def remove_co_host(current_user, id, user_id):
         db.session.add(audit_log)
         
         db.session.commit()
+        meeting_cache.bump(id)
+        meeting_acl.invalidate(id, user_id)
+        notify(id, 'co_hosts_changed', {'removed': [user_id]}, user_ids=[user_id])
         
         return jsonify({'message': 'Co-host removed successfully'}), 200
         
@@ -501,32 +939,33 @@ def remove_co_host(current_user, id, user_id):
 @token_required
 def get_waiting_room(current_user, id):
     try:
-        meeting = Meeting.query.get(id)
+        meeting = get_cached_meeting(id)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
             
         # Check if user has permission to view waiting room
-        if meeting.created_by != current_user.id and not MeetingCoHost.query.filter_by(
-            meeting_id=id,
-            user_id=current_user.id
-        ).first():
+        if not meeting_acl.can(current_user.id, meeting, 'manage_participants'):
             return jsonify({'error': 'Access denied'}), 403
             
-        # Get waiting participants
-        waiting_participants = MeetingParticipant.query.filter_by(
-            meeting_id=id,
-            status='pending'
+        # Get waiting participants with their users in one query
+        waiting_participants = db.session.execute(
+            select(MeetingParticipant.id, MeetingParticipant.created_at, User).join(
+                User, User.id == MeetingParticipant.user_id
+            ).where(
+                MeetingParticipant.meeting_id == id,
+                MeetingParticipant.status == 'pending'
+            ).order_by(MeetingParticipant.created_at, MeetingParticipant.id)
         ).all()
         
         return jsonify({
             'waiting_participants': [
                 {
-                    'id': p.id,
-                    'user': User.query.get(p.user_id).to_dict(),
-                    'joined_at': p.created_at.isoformat()
+                    'id': participant_id,
+                    'user': user.to_dict(),
+                    'joined_at': created_at.isoformat()
                 }
-                for p in waiting_participants
+                for participant_id, created_at, user in waiting_participants
             ]
         })
         
@@ -537,24 +976,21 @@ def get_waiting_room(current_user, id):
 @token_required
 def approve_participant(current_user, id, participant_id):
     try:
-        meeting = Meeting.query.get(id)
+        meeting = get_cached_meeting(id)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
             
         # Check if user has permission to approve participants
-        if meeting.created_by != current_user.id and not MeetingCoHost.query.filter_by(
-            meeting_id=id,
-            user_id=current_user.id
-        ).first():
+        if not meeting_acl.can(current_user.id, meeting, 'manage_participants'):
             return jsonify({'error': 'Access denied'}), 403
             
-        participant = MeetingParticipant.query.get(participant_id)
+        status = waiting_status(id, participant_id)
         
-        if not participant or participant.meeting_id != id:
+        if status is None:
             return jsonify({'error': 'Participant not found'}), 404
             
-        if participant.status != 'pending':
+        if status != 'pending':
             return jsonify({'error': 'Participant is not in waiting room'}), 400
             
         # Check maximum participants limit
@@ -564,11 +1000,15 @@ def approve_participant(current_user, id, participant_id):
             status='approved'
         ).count()
         
-        if meeting.max_participants and current_participants >= meeting.max_participants:
+        if meeting['max_participants'] and current_participants >= meeting['max_participants']:
             return jsonify({'error': 'Meeting has reached maximum participants'}), 400
             
-        participant.status = 'approved'
-        participant.joined_at = datetime.now(UTC)
+        changed = decide_waiting_participants(id, 'approved', [participant_id])
+        if not changed:
+            # Decided by someone else since the lookup
+            db.session.rollback()
+            return jsonify({'error': 'Participant is not in waiting room'}), 400
+        _, user_id = changed[0]
         
         # Log the action
         audit_log = MeetingAuditLog(
@@ -580,6 +1020,10 @@ def approve_participant(current_user, id, participant_id):
         db.session.add(audit_log)
         
         db.session.commit()
+        meeting_acl.invalidate(id, user_id)
+        notify(id, 'roster_delta', {
+            'approved': [{'participant_id': participant_id, 'user_id': user_id}]
+        }, managers_only=True, user_ids=[user_id])
         
         return jsonify({'message': 'Participant approved successfully'}), 200
         
@@ -591,27 +1035,30 @@ def approve_participant(current_user, id, participant_id):
 @token_required
 def reject_participant(current_user, id, participant_id):
     try:
-        meeting = Meeting.query.get(id)
+        meeting = get_cached_meeting(id)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
             
         # Check if user has permission to reject participants
-        if meeting.created_by != current_user.id and not MeetingCoHost.query.filter_by(
-            meeting_id=id,
-            user_id=current_user.id
-        ).first():
+        if not meeting_acl.can(current_user.id, meeting, 'manage_participants'):
             return jsonify({'error': 'Access denied'}), 403
             
-        participant = MeetingParticipant.query.get(participant_id)
+        status = waiting_status(id, participant_id)
         
-        if not participant or participant.meeting_id != id:
+        if status is None:
             return jsonify({'error': 'Participant not found'}), 404
             
-        if participant.status != 'pending':
+        if status != 'pending':
             return jsonify({'error': 'Participant is not in waiting room'}), 400
             
-        participant.status = 'declined'
+        changed = decide_waiting_participants(id, 'declined', [participant_id])
+        if not changed:
+            # Decided by someone else since the lookup
+            db.session.rollback()
+            return jsonify({'error': 'Participant is not in waiting room'}), 400
+        _, user_id = changed[0]
+        record_tombstones(db.session, id, [user_id], 'declined')
         
         # Log the action
         audit_log = MeetingAuditLog(
@@ -623,9 +1070,239 @@ def reject_participant(current_user, id, participant_id):
         db.session.add(audit_log)
         
         db.session.commit()
+        meeting_acl.invalidate(id, user_id)
+        notify(id, 'roster_delta', {
+            'declined': [{'participant_id': participant_id, 'user_id': user_id}]
+        }, managers_only=True, user_ids=[user_id])
         
         return jsonify({'message': 'Participant rejected successfully'}), 200
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': 'Server error occurred while rejecting participant'}), 500 
\ No newline at end of file
+        return jsonify({'error': 'Server error occurred while rejecting participant'}), 500
+
+@meetings_bp.route('/<int:id>/waiting-room/decisions', methods=['POST'])
+@token_required
+def decide_waiting_room(current_user, id):
+    """Approve or reject many waiting participants: a list of ids, or the next N in line."""
+    try:
+        meeting = get_cached_meeting(id)
+        
+        if not meeting:
+            return jsonify({'error': 'Meeting not found'}), 404
+            
+        if not meeting_acl.can(current_user.id, meeting, 'manage_participants'):
+            return jsonify({'error': 'Access denied'}), 403
+            
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+            
+        action = data.get('action')
+        if action not in ('approve', 'reject'):
+            return jsonify({'error': 'Action must be approve or reject'}), 400
+            
+        participant_ids = data.get('participant_ids')
+        next_count = data.get('next')
+        if (participant_ids is None) == (next_count is None):
+            return jsonify({'error': 'Provide either participant_ids or next'}), 400
+            
+        if participant_ids is not None:
+            if not isinstance(participant_ids, list) or not all(
+                    isinstance(i, int) and not isinstance(i, bool) for i in participant_ids):
+                return jsonify({'error': 'participant_ids must be a list of ids'}), 400
+            if len(participant_ids) > MAX_DECISIONS_PER_REQUEST:
+                return jsonify({'error': f'Too many participants (max {MAX_DECISIONS_PER_REQUEST} per request)'}), 400
+            participant_ids = sorted(set(participant_ids))
+            limit = len(participant_ids)
+        else:
+            if not isinstance(next_count, int) or isinstance(next_count, bool) or next_count <= 0:
+                return jsonify({'error': 'next must be a positive integer'}), 400
+            limit = min(next_count, MAX_DECISIONS_PER_REQUEST)
+            
+        remaining_capacity = None
+        if action == 'approve' and meeting['max_participants']:
+            # Serialize capacity checks for this meeting, then count once
+            db.session.execute(select(Meeting.id).where(Meeting.id == id).with_for_update())
+            current_participants = db.session.execute(
+                select(func.count(MeetingParticipant.id)).where(
+                    MeetingParticipant.meeting_id == id,
+                    MeetingParticipant.left_at.is_(None),
+                    MeetingParticipant.status == 'approved'
+                )
+            ).scalar()
+            available = meeting['max_participants'] - current_participants
+            if available <= 0:
+                db.session.rollback()
+                return jsonify({'error': 'Meeting has reached maximum participants'}), 400
+            limit = min(limit, available)
+            
+        status = 'approved' if action == 'approve' else 'declined'
+        changed = decide_waiting_participants(id, status, participant_ids, limit)
+        changed_ids = [participant_id for participant_id, _ in changed]
+        
+        if changed:
+            db.session.add(MeetingAuditLog(
+                meeting_id=id,
+                user_id=current_user.id,
+                action='approved_participants' if action == 'approve' else 'rejected_participants',
+                details={'participant_ids': changed_ids}
+            ))
+            if status == 'declined':
+                record_tombstones(db.session, id, [user_id for _, user_id in changed], 'declined')
+            
+        db.session.commit()
+        
+        if changed:
+            meeting_acl.invalidate_many(id, [user_id for _, user_id in changed])
+            notify(id, 'roster_delta', {
+                status: [{'participant_id': participant_id, 'user_id': user_id} for participant_id, user_id in changed]
+            }, managers_only=True, user_ids=[user_id for _, user_id in changed])
+            
+        if action == 'approve' and meeting['max_participants']:
+            remaining_capacity = available - len(changed)
+            
+        return jsonify({
+            'message': f'{len(changed)} participant(s) {status}',
+            status: changed_ids,
+            'skipped': sorted(set(participant_ids) - set(changed_ids)) if participant_ids is not None else [],
+            'remaining_capacity': remaining_capacity
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Server error occurred while processing waiting room'}), 500
+
+EXPORT_BATCH_SIZE = 1000
+
+def export_statement(meeting_id, kind, archived=False):
+    """Column names and an id-ordered select for an export of a meeting's rows."""
+    if kind == 'attendance':
+        participant = ArchivedMeetingParticipant if archived else MeetingParticipant
+        columns = ['id', 'user_id', 'name', 'email', 'status', 'role', 'joined_at', 'left_at',
+                   'total_time', 'connection_quality', 'participation_score']
+        stmt = select(
+            participant.id, participant.user_id, User.name, User.email,
+            participant.status, participant.role, participant.joined_at,
+            participant.left_at, participant.total_time,
+            participant.connection_quality, participant.participation_score
+        ).join(User, User.id == participant.user_id).where(participant.meeting_id == meeting_id)
+        return columns, stmt, participant.id
+    audit_log = ArchivedMeetingAuditLog if archived else MeetingAuditLog
+    columns = ['id', 'user_id', 'action', 'details', 'created_at']
+    stmt = select(
+        audit_log.id, audit_log.user_id, audit_log.action,
+        audit_log.details, audit_log.created_at
+    ).where(audit_log.meeting_id == meeting_id)
+    return columns, stmt, audit_log.id
+
+@meetings_bp.route('/<int:id>/export/<kind>', methods=['GET'])
+@token_required
+def export_meeting(current_user, id, kind):
+    """
+    Stream a meeting's attendance or audit log as CSV or NDJSON.
+
+    Rows are ordered by id. An interrupted download resumes with
+    ?cursor=<last id received>; ?limit=N stops after N rows. The body is
+    gzipped when the client sends Accept-Encoding: gzip.
+    """
+    try:
+        if kind not in ('attendance', 'audit'):
+            return jsonify({'error': 'Unknown export'}), 404
+            
+        meeting = get_cached_meeting(id, include_archived=True)
+        
+        if not meeting:
+            return jsonify({'error': 'Meeting not found'}), 404
+            
+        if not meeting_acl.can(current_user.id, meeting, 'export'):
+            return jsonify({'error': 'Access denied'}), 403
+            
+        fmt = request.args.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': 'Format must be csv or ndjson'}), 400
+            
+        cursor = request.args.get('cursor', '0')
+        limit = request.args.get('limit')
+        if not cursor.isdigit() or (limit is not None and (not limit.isdigit() or int(limit) == 0)):
+            return jsonify({'error': 'Invalid cursor or limit'}), 400
+        cursor = int(cursor)
+            
+        columns, stmt, id_column = export_statement(id, kind, archived=meeting.get('archived', False))
+        stmt = stmt.where(id_column > cursor).order_by(id_column)
+        if limit:
+            stmt = stmt.limit(int(limit))
+            
+        def rows():
+            # Plain column tuples with a server-side cursor: nothing accumulates in the session
+            result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            try:
+                for partition in result.partitions():
+                    yield from partition
+            finally:
+                result.close()
+                
+        return streaming_export(
+            rows(), columns, fmt,
+            filename=f'meeting-{id}-{kind}',
+            gzip=request.accept_encodings['gzip'] > 0
+        )
+        
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred while exporting meeting'}), 500
+
+def record_telemetry(user_id, meeting_id, samples):
+    """Validate and buffer a participant's stats batch. Returns (body, status); shared with the socket handler."""
+    meeting = get_cached_meeting(meeting_id)
+    if not meeting:
+        return {'error': 'Meeting not found'}, 404
+    if meeting['ended_at']:
+        return {'error': 'Meeting has already ended'}, 400
+    if not meeting_acl.can(user_id, meeting, 'telemetry'):
+        return {'error': 'Access denied'}, 403
+    if not isinstance(samples, list) or len(samples) > telemetry.max_batch:
+        return {'error': f'samples must be a list of at most {telemetry.max_batch} items'}, 400
+        
+    valid, rejected = validate_samples(samples, telemetry.max_batch, telemetry.max_skew)
+    if valid and not telemetry.ingest(meeting_id, user_id, valid):
+        return {'error': 'Telemetry is temporarily unavailable'}, 503
+    return {'accepted': len(valid), 'rejected': rejected}, 202
+
+@meetings_bp.route('/<int:id>/telemetry', methods=['POST'])
+@token_required
+def post_telemetry(current_user, id):
+    try:
+        data = request.get_json()
+        if not data or 'samples' not in data:
+            return jsonify({'error': 'No samples provided'}), 400
+            
+        body, status = record_telemetry(current_user.id, id, data['samples'])
+        return jsonify(body), status
+        
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred while recording telemetry'}), 500
+
+@meetings_bp.route('/<int:id>/telemetry/<int:user_id>', methods=['GET'])
+@token_required
+def get_telemetry(current_user, id, user_id):
+    try:
+        meeting = get_cached_meeting(id)
+        
+        if not meeting:
+            return jsonify({'error': 'Meeting not found'}), 404
+            
+        if user_id != current_user.id and not meeting_acl.can(current_user.id, meeting, 'manage_participants'):
+            return jsonify({'error': 'Access denied'}), 403
+            
+        if not telemetry.available:
+            return jsonify({'error': 'Telemetry is temporarily unavailable'}), 503
+            
+        return jsonify({
+            'meeting_id': id,
+            'user_id': user_id,
+            'bucket_seconds': telemetry.interval,
+            'buckets': telemetry.series(id, user_id)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Server error occurred while fetching telemetry'}), 500
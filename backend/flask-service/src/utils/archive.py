@@ -0,0 +1,54 @@
+from datetime import datetime, UTC
+from typing import List
+
+from sqlalchemy import delete, exists, insert, literal, select
+from sqlalchemy.orm import aliased
+
+def archive_meetings(session, cutoff: datetime, limit: int) -> List[int]:
+    """
+    Move up to limit meetings that ended before cutoff (naive UTC), with
+    their participants, co-hosts and audit log, into the archive tables.
+
+    Each table is copied with one INSERT ... SELECT and cleared with one
+    DELETE, children before meetings. Meetings that are still the parent of
+    a hot meeting stay until their series has been archived. Everyone who
+    had the meeting on their list gets an 'archived' tombstone so synced
+    lists drop it. On PostgreSQL rows locked by another transaction are
+    skipped. Does not commit.
+
+    Returns:
+        Ids of the meetings archived
+    """
+    from ..models import Meeting, MeetingTombstone
+    from ..models.meeting_archive import ARCHIVES
+    from .sync import meeting_audiences
+
+    child = aliased(Meeting)
+    stmt = select(Meeting.id).where(
+        Meeting.ended_at < cutoff,
+        ~exists().where(child.parent_meeting_id == Meeting.id)
+    ).order_by(Meeting.ended_at).limit(limit)
+    if session.get_bind().dialect.name == 'postgresql':
+        stmt = stmt.with_for_update(of=Meeting, skip_locked=True)
+    meeting_ids = session.execute(stmt).scalars().all()
+    if not meeting_ids:
+        return []
+
+    now = datetime.now(UTC).replace(tzinfo=None)
+    audience = meeting_audiences(meeting_ids).subquery()
+    session.execute(insert(MeetingTombstone).from_select(
+        ['meeting_id', 'user_id', 'reason', 'created_at'],
+        select(audience.c.meeting_id, audience.c.user_id, literal('archived'), literal(now))
+    ))
+
+    for hot, archived in ARCHIVES:
+        table = hot.__table__
+        key = table.c.id if hot is Meeting else table.c.meeting_id
+        columns = list(table.columns)
+        names = [column.name for column in columns]
+        if hot is Meeting:
+            columns.append(literal(now))
+            names.append('archived_at')
+        session.execute(insert(archived).from_select(names, select(*columns).where(key.in_(meeting_ids))))
+        session.execute(delete(table).where(key.in_(meeting_ids)))
+    return meeting_ids
@@ -34,4 +34,87 @@ def safe_commit() -> None:
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error during database commit: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
+
+def insert_ignore(model, rows, conflict_columns, returning=None):
+    """
+    Multi-row INSERT ... ON CONFLICT DO NOTHING for the session's dialect.
+
+    PostgreSQL and SQLite use their native ON CONFLICT. Other dialects fall
+    back to _insert_missing(), which is not atomic against concurrent
+    inserts of the same key; the unique constraint still rejects those.
+
+    Args:
+        model: Mapped model class to insert into
+        rows: List of column -> value dicts
+        conflict_columns: Columns of the unique constraint to ignore conflicts on
+        returning: Optional list of columns to return for inserted rows
+
+    Returns:
+        List of returned rows (empty if returning is None or nothing was inserted)
+    """
+    if not rows:
+        return []
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return _insert_missing(model, rows, conflict_columns, returning)
+
+    stmt = insert(model.__table__).values(rows).on_conflict_do_nothing(index_elements=conflict_columns)
+    if returning:
+        stmt = stmt.returning(*[model.__table__.c[name] for name in returning])
+        return db.session.execute(stmt).all()
+    db.session.execute(stmt)
+    return []
+
+def _insert_missing(model, rows, conflict_columns, returning=None):
+    """
+    Portable insert_ignore: read which keys exist, then insert the other
+    rows, in the caller's transaction.
+
+    Without INSERT ... RETURNING on the dialect, returned values come from
+    the rows themselves, so every returning column must be in them.
+    """
+    from collections import namedtuple
+    from sqlalchemy import and_, insert, select
+
+    table = model.__table__
+    key = lambda row: tuple(row[name] for name in conflict_columns)
+    # One IN per key column finds a superset of the existing keys
+    existing = set(db.session.execute(select(*[table.c[name] for name in conflict_columns]).where(
+        and_(*[table.c[name].in_({row[name] for row in rows}) for name in conflict_columns])
+    )).tuples())
+
+    new_rows = []
+    for row in rows:
+        if key(row) not in existing:
+            existing.add(key(row))
+            new_rows.append(row)
+    if not new_rows:
+        return []
+
+    stmt = insert(table).values(new_rows)
+    if not returning:
+        db.session.execute(stmt)
+        return []
+    if db.session.get_bind().dialect.insert_returning:
+        return db.session.execute(stmt.returning(*[table.c[name] for name in returning])).all()
+    db.session.execute(stmt)
+    Inserted = namedtuple('Inserted', returning)
+    return [Inserted(*(row[name] for name in returning)) for row in new_rows]
+
+def epoch_seconds(column):
+    """
+    SQL expression converting a naive-UTC timestamp column to epoch seconds.
+
+    Lets bulk readers fetch plain floats instead of building a datetime
+    object per row.
+    """
+    from sqlalchemy import extract, func
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return (func.julianday(column) - 2440587.5) * 86400.0
+    return extract('epoch', column)
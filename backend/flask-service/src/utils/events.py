@@ -0,0 +1,323 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, UTC
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] is the meeting channel, KEYS[2..] the audience's event streams.
+# ARGV: message, stream length, stream ttl. Each user's copy is appended to
+# their stream (the replay buffer) and published on a channel of the same
+# name as "<stream id> <message>", so live and replayed events share ids.
+_FAN_OUT = """
+redis.call('PUBLISH', KEYS[1], ARGV[1])
+for i = 2, #KEYS do
+    local id = redis.call('XADD', KEYS[i], 'MAXLEN', '~', ARGV[2], '*', 'm', ARGV[1])
+    redis.call('EXPIRE', KEYS[i], ARGV[3])
+    redis.call('PUBLISH', KEYS[i], id .. ' ' .. ARGV[1])
+end
+return #KEYS - 1
+"""
+
+def parse_event_id(event_id: str) -> Optional[Tuple[int, int]]:
+    """Redis stream id "<ms>-<seq>" as a comparable tuple, or None if malformed."""
+    ms, _, seq = event_id.partition('-')
+    if not (ms.isdigit() and seq.isdigit()):
+        return None
+    return int(ms), int(seq)
+
+class MeetingEvents(RedisBackoff):
+    """
+    Publishes meeting state changes for real-time clients.
+
+    Each meeting has a Redis channel ``meeting:<id>:events``; messages are
+    JSON objects ``{event, meeting_id, data, ts}``. The signaling layer
+    subscribes and relays them to the meeting's room, so route handlers do
+    not need a socket connection of their own.
+
+    Events can also be fanned out to users: each one has a capped stream
+    ``user:<id>:events`` that doubles as the replay buffer for reconnecting
+    clients, and a channel of the same name for live delivery. The meeting
+    publish and every per-user copy go out in one EVAL.
+
+    Publish after commit. Delivery is best effort: a Redis error is logged
+    and Redis is skipped for REDIS_BACKOFF_SECONDS, but the
+    request that made the change still succeeds.
+    """
+
+    REDIS_LABEL = 'Meeting events'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.redis = redis
+        self.stream_length = 200
+        self.stream_ttl = 3600
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.redis = redis
+        self.init_backoff(app)
+        self.stream_length = int(app.config.get('EVENTS_STREAM_LENGTH', 200))
+        self.stream_ttl = int(app.config.get('EVENTS_STREAM_TTL', 3600))
+        app.extensions['meeting_events'] = self
+
+    @staticmethod
+    def channel(meeting_id) -> str:
+        return f'meeting:{meeting_id}:events'
+
+    @staticmethod
+    def user_key(user_id) -> str:
+        """Name of a user's event stream and of their live channel."""
+        return f'user:{user_id}:events'
+
+    def publish(self, meeting_id: int, event: str, data: Dict[str, Any],
+                user_ids: Iterable[int] = ()) -> bool:
+        """
+        Publish one event to a meeting's channel and to each user in user_ids.
+
+        Args:
+            meeting_id: Meeting primary key
+            event: Event name, e.g. 'roster_delta'
+            data: JSON-serializable payload
+            user_ids: Users whose clients should receive the event
+
+        Returns:
+            True if the message was handed to Redis
+        """
+        return self.publish_many([(meeting_id, event, data, user_ids)])
+
+    def publish_many(self, events: Iterable[Tuple[int, str, Dict[str, Any], Iterable[int]]]) -> bool:
+        """Publish (meeting_id, event, data, user_ids) tuples in one round trip."""
+        if not self.available:
+            return False
+        ts = datetime.now(UTC).isoformat()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for meeting_id, event, data, user_ids in events:
+                message = json.dumps({
+                    'event': event,
+                    'meeting_id': meeting_id,
+                    'data': data,
+                    'ts': ts
+                }, separators=(',', ':'))
+                keys = [self.channel(meeting_id)] + [self.user_key(user_id) for user_id in sorted(set(user_ids))]
+                if len(keys) == 1:
+                    pipe.publish(keys[0], message)
+                else:
+                    pipe.eval(_FAN_OUT, len(keys), *keys, message, self.stream_length, self.stream_ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            self._redis_failed(e)
+            return False
+
+    def replay(self, user_id: int, last_id: str) -> Tuple[List[Tuple[str, str]], bool]:
+        """
+        Events for a user published after last_id, oldest first.
+
+        Returns:
+            (events, complete): events as (id, message) pairs; complete is
+            False if events after last_id may have been trimmed or expired
+            from the buffer, in which case the client must resynchronize.
+        """
+        key = self.user_key(user_id)
+        last = parse_event_id(last_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xrange(key, min='-', max='+', count=1)
+        pipe.xrange(key, min=f'({last_id}', max='+', count=self.stream_length)
+        first, entries = pipe.execute()
+        if first:
+            complete = parse_event_id(first[0][0].decode()) <= last
+        else:
+            # The stream expires stream_ttl after its newest event, so an empty
+            # one only proves nothing was missed if last_id is younger than that
+            complete = last[0] >= (time.time() - self.stream_ttl) * 1000
+        return [(entry_id.decode(), fields[b'm'].decode()) for entry_id, fields in entries], complete
+
+class Subscription:
+    """A bounded queue of messages from one channel, fed by EventHub."""
+
+    def __init__(self, channel: str, size: int) -> None:
+        self.channel = channel
+        self.queue: queue.Queue = queue.Queue(size)
+        # Set when the hub drops this subscriber (overflow or Redis failure)
+        self.closed = False
+
+    def get(self, timeout: float) -> Optional[str]:
+        """Next message, or None after timeout. Raises EOFError once closed and drained."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            if self.closed:
+                raise EOFError(self.channel)
+            return None
+
+class EventHub:
+    """
+    Shares one Redis pub/sub connection between every event stream a
+    process serves.
+
+    A single daemon thread owns the connection: it applies subscribe and
+    unsubscribe requests (reference-counted per channel) and routes
+    messages to subscriber queues. The thread starts with the first
+    subscription and again after a fork. A subscriber whose queue fills,
+    or every subscriber when Redis fails, is closed rather than blocking
+    the thread; clients reconnect and replay what they missed.
+
+    Each open stream also holds a server thread for its whole life, so a
+    process serves at most EVENTS_MAX_STREAMS of them (open_stream /
+    close_stream); the rest of the thread pool stays free for ordinary
+    requests and health probes.
+    """
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.redis = redis
+        self.queue_size = 256
+        self.max_streams = 8
+        self._streams = 0
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._confirmed: Dict[str, threading.Event] = {}
+        self._pending: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.redis = redis
+        self.queue_size = int(app.config.get('EVENTS_QUEUE_SIZE', 256))
+        self.max_streams = int(app.config.get('EVENTS_MAX_STREAMS', 8))
+        app.extensions['event_hub'] = self
+
+    @property
+    def available(self) -> bool:
+        return self.redis is not None
+
+    @property
+    def open_streams(self) -> int:
+        return self._streams
+
+    def open_stream(self) -> bool:
+        """Take one of this process's stream slots; False if all are in use."""
+        with self._lock:
+            if self._streams >= self.max_streams:
+                return False
+            self._streams += 1
+            return True
+
+    def close_stream(self) -> None:
+        """Give back a slot taken by open_stream()."""
+        with self._lock:
+            self._streams = max(self._streams - 1, 0)
+
+    def subscribe(self, channel: str, timeout: float = 2.0) -> Optional[Subscription]:
+        """
+        Subscribe to a channel; returns once Redis confirmed the subscription,
+        so nothing published afterwards is missed. None if not confirmed in time.
+        """
+        self._ensure_started()
+        subscription = Subscription(channel, self.queue_size)
+        with self._lock:
+            if channel not in self._subscribers:
+                self._subscribers[channel] = set()
+                self._confirmed[channel] = threading.Event()
+                self._pending.append(('subscribe', channel))
+            self._subscribers[channel].add(subscription)
+            confirmed = self._confirmed[channel]
+        self._wake.set()
+        if not confirmed.wait(timeout):
+            self.unsubscribe(subscription)
+            return None
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.channel]
+                del self._confirmed[subscription.channel]
+                self._pending.append(('unsubscribe', subscription.channel))
+        self._wake.set()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                # State inherited across a fork belongs to the parent's thread
+                self._subscribers, self._confirmed, self._pending = {}, {}, []
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='event-hub', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        pubsub = None
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = self.redis.pubsub()
+                    # Re-issue every live subscription on a new connection
+                    with self._lock:
+                        self._pending = [('subscribe', channel) for channel in self._subscribers]
+                with self._lock:
+                    pending, self._pending = self._pending, []
+                for action, channel in pending:
+                    getattr(pubsub, action)(channel)
+                if not pubsub.subscribed:
+                    self._wake.wait(1.0)
+                    self._wake.clear()
+                    continue
+                message = pubsub.get_message(timeout=0.2)
+                if message is not None:
+                    self._dispatch(message)
+            except Exception as e:
+                logger.warning(f"Event hub connection failed, closing subscribers: {str(e)}")
+                try:
+                    if pubsub is not None:
+                        pubsub.close()
+                except Exception:
+                    pass
+                pubsub = None
+                self._close_all()
+                time.sleep(1.0)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        channel = message['channel']
+        channel = channel.decode() if isinstance(channel, bytes) else channel
+        with self._lock:
+            if message['type'] == 'subscribe':
+                confirmed = self._confirmed.get(channel)
+                if confirmed is not None:
+                    confirmed.set()
+                return
+            if message['type'] != 'message':
+                return
+            subscribers = list(self._subscribers.get(channel, ()))
+        data = message['data']
+        data = data.decode() if isinstance(data, bytes) else data
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(data)
+            except queue.Full:
+                subscription.closed = True
+                self.unsubscribe(subscription)
+
+    def _close_all(self) -> None:
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+            self._subscribers, self._confirmed, self._pending = {}, {}, []
+        for subscription in subscribers:
+            subscription.closed = True
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from flask import Response, stream_with_context
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson')
+}
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def encode_rows(rows: Iterable[Sequence[Any]], columns: List[str], fmt: str, chunk_rows: int = 500) -> Iterator[str]:
+    """
+    Encode rows as CSV (with a header line) or NDJSON, yielding one text chunk per chunk_rows rows.
+
+    Only one chunk is held in memory at a time.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(columns)
+
+    pending = 0
+    for row in rows:
+        if writer:
+            writer.writerow([
+                json.dumps(value) if isinstance(value, (dict, list)) else _plain(value)
+                for value in row
+            ])
+        else:
+            buffer.write(json.dumps({column: _plain(value) for column, value in zip(columns, row)}))
+            buffer.write('\n')
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text chunks incrementally, flushing after each chunk."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def streaming_export(rows: Iterable[Sequence[Any]], columns: List[str], fmt: str, filename: str,
+                     gzip: bool = False, headers: Optional[dict] = None) -> Response:
+    """
+    Build a streaming response for an export.
+
+    Args:
+        rows: Lazily produced row tuples (e.g. a yield_per result)
+        columns: Column names, in row order
+        fmt: 'csv' or 'ndjson'
+        filename: Download name without extension
+        gzip: Compress the body with Content-Encoding: gzip
+        headers: Extra response headers
+    """
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    body = encode_rows(rows, columns, fmt)
+    if gzip:
+        body = gzip_chunks(body)
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{extension}'
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    for key, value in (headers or {}).items():
+        response.headers[key] = value
+    return response
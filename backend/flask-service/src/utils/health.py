@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class DependencyState:
+    """Last known health of one dependency, with hysteresis counters."""
+
+    def __init__(self, name: str, check: Callable[[], None], critical: bool = True) -> None:
+        self.name = name
+        self.check = check
+        self.critical = critical
+        self.healthy: Optional[bool] = None  # None until the first probe completes
+        self.consecutive_successes = 0
+        self.consecutive_failures = 0
+        self.latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    def record(self, ok: bool, latency_ms: float, error: Optional[str], rise: int, fall: int) -> None:
+        self.latency_ms = round(latency_ms, 3)
+        self.checked_at = time.time()
+        if ok:
+            self.consecutive_successes += 1
+            self.consecutive_failures = 0
+            self.last_error = None
+            # Start healthy on the first success; recover only after `rise` in a row
+            if self.healthy is None or self.consecutive_successes >= rise:
+                self.healthy = True
+        else:
+            self.consecutive_failures += 1
+            self.consecutive_successes = 0
+            self.last_error = error
+            # Start unhealthy on the first failure; degrade only after `fall` in a row
+            if self.healthy is None or self.consecutive_failures >= fall:
+                self.healthy = False
+
+    def to_dict(self, stale_after: float) -> Dict[str, Any]:
+        age = time.time() - self.checked_at if self.checked_at else None
+        if self.healthy is None:
+            status = 'unknown'
+        elif age is not None and age > stale_after:
+            status = 'stale'
+        else:
+            status = 'healthy' if self.healthy else 'unhealthy'
+        return {
+            'status': status,
+            'critical': self.critical,
+            'latency_ms': self.latency_ms,
+            'age_seconds': round(age, 3) if age is not None else None,
+            'consecutive_failures': self.consecutive_failures,
+            'last_error': self.last_error
+        }
+
+class HealthProber:
+    """
+    Background dependency prober for liveness/readiness endpoints.
+
+    Probing the database and Redis on every kubelet request multiplies load
+    by replicas x probe frequency, and a slow dependency makes the probe
+    itself time out. Instead, a daemon thread refreshes each dependency on
+    HEALTH_PROBE_INTERVAL and the endpoints serve the cached snapshot.
+
+    A dependency flips to unhealthy only after HEALTH_PROBE_FALL consecutive
+    failures and back after HEALTH_PROBE_RISE consecutive successes, so a
+    single slow query does not bounce the pod out of the Service. Results
+    older than HEALTH_PROBE_STALE_AFTER are reported as stale.
+
+    Only critical dependencies decide readiness. Features backed by a
+    non-critical one (Redis) fall back when it is down, so an outage is
+    reported under ``degraded`` instead of pulling every replica out of
+    the Service at once.
+
+    The thread is started by start_background_tasks() and restarted if the
+    process id changes, so it survives gunicorn's preload-then-fork model.
+    """
+
+    def __init__(self, app=None) -> None:
+        self.app = None
+        self.checks: Dict[str, DependencyState] = {}
+        self.interval = 5.0
+        self.rise = 2
+        self.fall = 3
+        self.stale_after = 15.0
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        self.app = app
+        self.interval = float(app.config.get('HEALTH_PROBE_INTERVAL', 5.0))
+        self.rise = int(app.config.get('HEALTH_PROBE_RISE', 2))
+        self.fall = int(app.config.get('HEALTH_PROBE_FALL', 3))
+        self.stale_after = float(app.config.get('HEALTH_PROBE_STALE_AFTER', self.interval * 3))
+        self.checks = {}
+        app.extensions['health_prober'] = self
+
+    def register(self, name: str, check: Callable[[], None], critical: bool = True) -> None:
+        """Register a check; it should raise on failure. Only critical checks gate readiness."""
+        self.checks[name] = DependencyState(name, check, critical)
+
+    def probe_once(self) -> None:
+        """Run every registered check once and update its state."""
+        with self.app.app_context():
+            for state in self.checks.values():
+                started = time.perf_counter()
+                try:
+                    state.check()
+                    ok, error = True, None
+                except Exception as e:
+                    ok, error = False, str(e)
+                state.record(ok, (time.perf_counter() - started) * 1000.0, error, self.rise, self.fall)
+                if not ok:
+                    logger.warning(f"Health check {state.name} failed: {error}")
+
+    def ensure_started(self) -> None:
+        """Start the probe thread in this process if it is not running."""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='health-prober', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.probe_once()
+            except Exception as e:
+                logger.error(f"Health prober iteration failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        dependencies = {name: state.to_dict(self.stale_after) for name, state in self.checks.items()}
+        critical = [d for d in dependencies.values() if d['critical']]
+        ready = bool(critical) and all(d['status'] == 'healthy' for d in critical)
+        return {
+            'status': 'ready' if ready else 'not_ready',
+            'degraded': sorted(name for name, d in dependencies.items()
+                               if not d['critical'] and d['status'] != 'healthy'),
+            'dependencies': dependencies
+        }
@@ -0,0 +1,237 @@
+import calendar
+import hashlib
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Any, Iterator, List, Optional, Tuple
+
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+PRODID = '-//Realtime Meeting//Calendar Feed//EN'
+
+def _add_months(moment: datetime, months: int) -> Optional[datetime]:
+    """Same day and time `months` later, or None if that month has no such day."""
+    month_index = moment.month - 1 + months
+    year, month = moment.year + month_index // 12, month_index % 12 + 1
+    if moment.day > calendar.monthrange(year, month)[1]:
+        return None
+    return moment.replace(year=year, month=month)
+
+def expand_occurrences(start: datetime, end: datetime, pattern: Optional[str], window_start: datetime,
+                       window_end: datetime, until: Optional[datetime] = None,
+                       max_occurrences: int = 500) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Yield (start, end) of a meeting's occurrences that overlap [window_start, window_end).
+
+    daily, weekly and monthly patterns repeat from the first occurrence
+    (monthly on the same day of month, skipping months without it) until
+    `until`, if given. Other patterns yield the meeting itself.
+    """
+    duration = end - start
+    if pattern not in ('daily', 'weekly', 'monthly'):
+        if end > window_start and start < window_end:
+            yield start, end
+        return
+
+    step = timedelta(days=1 if pattern == 'daily' else 7)
+    index = 0
+    if pattern != 'monthly' and start + duration <= window_start:
+        # Jump straight to the first occurrence that can reach the window
+        index = max((window_start - duration - start) // step, 0)
+
+    produced = 0
+    while produced < max_occurrences:
+        if pattern == 'monthly':
+            occurrence = _add_months(start, index)
+            index += 1
+            if occurrence is None:
+                continue
+        else:
+            occurrence = start + step * index
+            index += 1
+        if occurrence >= window_end or (until is not None and occurrence >= until):
+            return
+        if occurrence + duration > window_start:
+            produced += 1
+            yield occurrence, occurrence + duration
+
+def escape_text(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+def fold_line(line: str) -> str:
+    """Fold a content line at 75 octets (RFC 5545 3.1) without splitting a UTF-8 character."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, current, size = [], [], 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > (75 if not parts else 74):
+            parts.append(''.join(current))
+            current, size = [], 0
+        current.append(char)
+        size += width
+    parts.append(''.join(current))
+    return '\r\n '.join(parts)
+
+def _stamp(moment: datetime) -> str:
+    # Stored timestamps are naive UTC
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return moment.strftime('%Y%m%dT%H%M%SZ')
+
+def render_calendar(meetings: List[Any], host: str, window_start: datetime, window_end: datetime,
+                    name: str = 'Meetings', refresh_minutes: int = 15, max_occurrences: int = 500) -> str:
+    """
+    Render meetings as an iCalendar (RFC 5545) document.
+
+    Recurring meetings are expanded into one VEVENT per occurrence within
+    the window; an occurrence on a day that already has a child meeting
+    (parent_meeting_id) of the series is left to the child. A recurring
+    meeting that has ended stops recurring at ended_at.
+
+    The output depends only on its inputs (DTSTAMP is the row's
+    updated_at), so equal inputs give byte-identical feeds.
+    """
+    overridden = {
+        (meeting.parent_meeting_id, meeting.start_time.date())
+        for meeting in meetings if meeting.parent_meeting_id
+    }
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+        f'REFRESH-INTERVAL;VALUE=DURATION:PT{refresh_minutes}M',
+        f'X-PUBLISHED-TTL:PT{refresh_minutes}M'
+    ]
+    for meeting in sorted(meetings, key=lambda m: (m.start_time, m.id)):
+        recurring = meeting.recurring_pattern in ('daily', 'weekly', 'monthly')
+        occurrences = expand_occurrences(
+            meeting.start_time, meeting.end_time, meeting.recurring_pattern, window_start, window_end,
+            until=meeting.ended_at if recurring else None, max_occurrences=max_occurrences
+        )
+        for start, end in occurrences:
+            if recurring and (meeting.id, start.date()) in overridden:
+                continue
+            uid = f'meeting-{meeting.id}-{start:%Y%m%d}@{host}' if recurring else f'meeting-{meeting.id}@{host}'
+            lines.extend([
+                'BEGIN:VEVENT',
+                f'UID:{uid}',
+                f'DTSTAMP:{_stamp(meeting.updated_at)}',
+                f'LAST-MODIFIED:{_stamp(meeting.updated_at)}',
+                f'DTSTART:{_stamp(start)}',
+                f'DTEND:{_stamp(end)}',
+                f'SUMMARY:{escape_text(meeting.title)}'
+            ])
+            if meeting.description:
+                lines.append(f'DESCRIPTION:{escape_text(meeting.description)}')
+            lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(fold_line(line) for line in lines) + '\r\n'
+
+def feed_fingerprint(session, user_id: int) -> Tuple:
+    """
+    Cheap summary of everything a user's feed is built from, in one query.
+
+    Changes whenever a meeting on the user's list is updated, or a meeting
+    joins or leaves the list (participant/co-host rows, tombstones). Every
+    part is an aggregate over a (user, timestamp) index.
+    """
+    from sqlalchemy import func, select
+    from ..models import Meeting, MeetingParticipant, MeetingCoHost, MeetingTombstone
+    from .sync import visible_to
+
+    listed = select(func.max(Meeting.updated_at).label('updated'), func.count(Meeting.id).label('count')).where(
+        visible_to(user_id)
+    ).subquery()
+    stmt = select(
+        listed.c.updated,
+        listed.c.count,
+        select(func.max(MeetingParticipant.updated_at)).where(MeetingParticipant.user_id == user_id).scalar_subquery(),
+        select(func.max(MeetingCoHost.created_at)).where(MeetingCoHost.user_id == user_id).scalar_subquery(),
+        select(func.max(MeetingTombstone.created_at)).where(MeetingTombstone.user_id == user_id).scalar_subquery()
+    )
+    return tuple(session.execute(stmt).one())
+
+def feed_etag(user_id: int, fingerprint: Tuple, window_start: datetime) -> str:
+    # The window slides daily, so the day is part of the validator
+    raw = f'{user_id}:{fingerprint!r}:{window_start:%Y%m%d}'
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+class CalendarFeedCache(RedisBackoff):
+    """
+    Rendered iCalendar feeds, one Redis hash per user:
+
+        calendar:<user_id>    etag, body
+
+    A body is only served for the ETag it was rendered for. A change to any
+    of the user's meetings changes the ETag, so the old body is never read
+    again and is overwritten by the next render. Redis errors make the feed
+    render uncached for REDIS_BACKOFF_SECONDS.
+    """
+
+    REDIS_LABEL = 'Calendar cache'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.redis = redis
+        self.ttl = 86400
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.redis = redis
+        self.ttl = int(app.config.get('CALENDAR_CACHE_TTL', 86400))
+        self.init_backoff(app)
+        app.extensions['calendar_cache'] = self
+
+    @staticmethod
+    def key(user_id) -> str:
+        return f'calendar:{user_id}'
+
+    def get(self, user_id: int, etag: str) -> Optional[str]:
+        """The cached body rendered for this ETag, or None."""
+        if not self.available:
+            return None
+        try:
+            cached_etag, body = self.redis.hmget(self.key(user_id), 'etag', 'body')
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if cached_etag is None or body is None:
+            return None
+        if isinstance(cached_etag, bytes):
+            cached_etag, body = cached_etag.decode(), body.decode()
+        return body if cached_etag == etag else None
+
+    def set(self, user_id: int, etag: str, body: str) -> None:
+        if not self.available:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(self.key(user_id), mapping={'etag': etag, 'body': body})
+            pipe.expire(self.key(user_id), self.ttl)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+def feed_window(now: Optional[datetime] = None, past_days: int = 30, future_days: int = 180) -> Tuple[datetime, datetime]:
+    """[start, end) of the occurrences a feed covers, as naive UTC aligned to days."""
+    today = (now or datetime.now(UTC)).astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    return today - timedelta(days=past_days), today + timedelta(days=future_days)
+
+def feed_meetings(session, user_id: int, window_start: datetime, window_end: datetime) -> List[Any]:
+    """Meetings on the user's list that can have an occurrence in the window."""
+    from sqlalchemy import or_, select
+    from ..models import Meeting
+    from .sync import visible_to
+
+    return session.execute(select(Meeting).where(
+        visible_to(user_id),
+        Meeting.start_time < window_end,
+        or_(Meeting.end_time > window_start, Meeting.recurring_pattern.in_(('daily', 'weekly', 'monthly')))
+    )).scalars().all()
@@ -0,0 +1,252 @@
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, UTC
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, insert, select, update
+
+from .archive import archive_meetings
+from .periodic import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+# Extend or release the lock only while it still holds our token
+_RENEW = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+def end_overdue_meetings(session, cutoff: datetime, limit: int) -> List[Tuple[int, int, datetime]]:
+    """
+    End up to limit active meetings whose end_time is before cutoff (naive UTC).
+
+    Each meeting gets ended_at = its scheduled end_time, its open
+    participations are closed at that time, and one 'ended' audit row is
+    written per meeting. One SELECT picks the batch (on PostgreSQL rows
+    locked by another transaction are skipped), then one statement each
+    counts open participations, updates the meetings, closes the
+    participations and inserts the audit rows. Does not commit.
+
+    Returns:
+        (id, created_by, end_time) of the meetings ended
+    """
+    from ..models import Meeting, MeetingParticipant, MeetingAuditLog
+
+    stmt = select(Meeting.id, Meeting.created_by, Meeting.end_time).where(
+        Meeting.ended_at.is_(None),
+        Meeting.end_time < cutoff
+    ).order_by(Meeting.end_time).limit(limit)
+    if session.get_bind().dialect.name == 'postgresql':
+        stmt = stmt.with_for_update(skip_locked=True)
+    rows = session.execute(stmt).all()
+    if not rows:
+        return []
+
+    meeting_ids = [row.id for row in rows]
+    open_counts = dict(session.execute(
+        select(MeetingParticipant.meeting_id, func.count(MeetingParticipant.id)).where(
+            MeetingParticipant.meeting_id.in_(meeting_ids),
+            MeetingParticipant.left_at.is_(None)
+        ).group_by(MeetingParticipant.meeting_id)
+    ).all())
+
+    now = datetime.now(UTC).replace(tzinfo=None)
+    session.execute(
+        update(Meeting).where(
+            Meeting.id.in_(meeting_ids),
+            Meeting.ended_at.is_(None)
+        ).values(ended_at=Meeting.end_time, updated_at=now).execution_options(synchronize_session=False)
+    )
+    MeetingParticipant.close_open_participations(
+        meeting_ids,
+        left_at=select(Meeting.end_time).where(Meeting.id == MeetingParticipant.meeting_id).scalar_subquery()
+    )
+    session.execute(insert(MeetingAuditLog), [
+        {
+            'meeting_id': row.id,
+            'user_id': row.created_by,
+            'action': 'ended',
+            'created_at': now,
+            'details': {'reason': 'expired', 'closed_participations': open_counts.get(row.id, 0)}
+        }
+        for row in rows
+    ])
+    return [tuple(row) for row in rows]
+
+class MeetingSweeper:
+    """
+    Ends meetings that ran past their scheduled end without a host ending them.
+
+    Every process may run the sweeper thread, but only the holder of a
+    Redis lock (``lifecycle:sweeper:leader``) sweeps: the lock is taken with
+    SET NX and renewed on every tick, so leadership moves to another
+    replica only when the leader stops renewing. Each tick ends at most
+    LIFECYCLE_SWEEP_MAX_BATCHES batches of LIFECYCLE_SWEEP_BATCH meetings,
+    one transaction per batch, then invalidates the cached meetings and
+    publishes meeting_ended events.
+
+    Meetings get LIFECYCLE_SWEEP_GRACE_MINUTES past their end_time before
+    they are ended. After sweeping, the leader closes the participations of
+    users who left or stopped heartbeating (PresenceRegistry.reconcile in
+    utils/presence.py; only with PRESENCE_HEARTBEATS) and moves meetings
+    ended more than LIFECYCLE_ARCHIVE_DAYS ago into the archive tables (see
+    utils/archive.py), in batches of LIFECYCLE_ARCHIVE_BATCH; 0 days turns
+    archival off. start_background_tasks() starts the thread when
+    LIFECYCLE_SWEEP_BACKGROUND is set; `flask lifecycle sweep` and
+    `flask lifecycle archive` run a pass by hand.
+    """
+
+    LOCK_KEY = 'lifecycle:sweeper:leader'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.app = None
+        self.redis = redis
+        self.interval = 60.0
+        self.batch_size = 200
+        self.max_batches = 10
+        self.grace = timedelta(minutes=15)
+        self.archive_after = timedelta(days=90)
+        self.archive_batch_size = 500
+        self.background = False
+        self._token: Optional[str] = None
+        self._token_pid: Optional[int] = None
+        self.task = PeriodicTask('meeting-sweeper', self.tick)
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.app = app
+        self.redis = redis
+        self.interval = float(app.config.get('LIFECYCLE_SWEEP_INTERVAL', 60))
+        self.batch_size = int(app.config.get('LIFECYCLE_SWEEP_BATCH', 200))
+        self.max_batches = int(app.config.get('LIFECYCLE_SWEEP_MAX_BATCHES', 10))
+        self.grace = timedelta(minutes=float(app.config.get('LIFECYCLE_SWEEP_GRACE_MINUTES', 15)))
+        self.archive_after = timedelta(days=float(app.config.get('LIFECYCLE_ARCHIVE_DAYS', 90)))
+        self.archive_batch_size = int(app.config.get('LIFECYCLE_ARCHIVE_BATCH', 500))
+        self.background = app.config.get('LIFECYCLE_SWEEP_BACKGROUND', False)
+        self.task.interval = self.interval
+        app.extensions['meeting_sweeper'] = self
+
+    def ensure_started(self) -> None:
+        if self.background:
+            self.task.ensure_started(self.app)
+
+    @property
+    def token(self) -> str:
+        """Identifies this process as lock holder; a forked child gets its own."""
+        if self._token is None or self._token_pid != os.getpid():
+            self._token = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}'
+            self._token_pid = os.getpid()
+        return self._token
+
+    def acquire_leadership(self) -> bool:
+        """Renew the lock if this process holds it, else try to take it."""
+        if self.redis is None:
+            return False
+        ttl_ms = int(self.interval * 3 * 1000)
+        try:
+            if self.redis.eval(_RENEW, 1, self.LOCK_KEY, self.token, ttl_ms):
+                return True
+            return bool(self.redis.set(self.LOCK_KEY, self.token, nx=True, px=ttl_ms))
+        except Exception as e:
+            logger.warning(f"Sweeper leader election failed: {str(e)}")
+            return False
+
+    def release_leadership(self) -> None:
+        if self.redis is None:
+            return
+        try:
+            self.redis.eval(_RELEASE, 1, self.LOCK_KEY, self.token)
+        except Exception as e:
+            logger.warning(f"Sweeper lock release failed: {str(e)}")
+
+    def tick(self) -> int:
+        """One scheduled run: sweep, reconcile presence, then archive, if this process is the leader."""
+        from .. import presence
+
+        if not self.acquire_leadership():
+            return 0
+        ended = self.sweep()
+        presence.reconcile()
+        if self.archive_after:
+            self.archive()
+        return ended
+
+    def sweep(self, now: Optional[datetime] = None) -> int:
+        """
+        End overdue meetings in bounded batches.
+
+        Returns:
+            Number of meetings ended
+        """
+        cutoff = (now or datetime.now(UTC)).astimezone(UTC).replace(tzinfo=None) - self.grace
+        total = self._run_batches(end_overdue_meetings, cutoff, self.batch_size, self._after_end)
+        if total:
+            logger.info(f"Lifecycle sweeper ended {total} overdue meetings")
+        return total
+
+    def archive(self, now: Optional[datetime] = None) -> int:
+        """
+        Archive long-ended meetings in bounded batches.
+
+        Returns:
+            Number of meetings archived
+        """
+        cutoff = (now or datetime.now(UTC)).astimezone(UTC).replace(tzinfo=None) - self.archive_after
+        total = self._run_batches(archive_meetings, cutoff, self.archive_batch_size, self._after_archive)
+        if total:
+            logger.info(f"Lifecycle sweeper archived {total} meetings")
+        return total
+
+    def _run_batches(self, step, cutoff: datetime, batch_size: int, after_commit) -> int:
+        """Run step(session, cutoff, batch_size) in its own transaction up to max_batches times."""
+        from ..models import db
+        total = 0
+        for _ in range(self.max_batches):
+            try:
+                done = step(db.session, cutoff, batch_size)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            if not done:
+                break
+            total += len(done)
+            after_commit(done)
+            if len(done) < batch_size:
+                break
+        return total
+
+    def _after_archive(self, meeting_ids: List[int]) -> None:
+        from .. import meeting_cache
+        # Cached copies would still let managers act on the meeting
+        for meeting_id in meeting_ids:
+            meeting_cache.bump(meeting_id)
+
+    def _after_end(self, ended: List[Tuple[int, int, datetime]]) -> None:
+        from .. import meeting_cache, meeting_events
+        from ..models import db
+        from .sync import meeting_audiences
+
+        for meeting_id, _, _ in ended:
+            meeting_cache.bump(meeting_id)
+        if not meeting_events.available:
+            return
+        audiences = {}
+        for meeting_id, user_id in db.session.execute(meeting_audiences([m for m, _, _ in ended])):
+            audiences.setdefault(meeting_id, set()).add(user_id)
+        meeting_events.publish_many(
+            (meeting_id, 'meeting_ended', {'ended_at': end_time.isoformat(), 'reason': 'expired'},
+             audiences.get(meeting_id, ()))
+            for meeting_id, _, end_time in ended
+        )
@@ -0,0 +1,215 @@
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Dict, List, Optional
+
+from .periodic import PeriodicTask
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+# Count a failure; for a known user, record the count (and lock) for the next flush
+_RECORD_FAILURE = """
+local n = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+if ARGV[2] ~= '' then
+    local locked = ''
+    if n >= tonumber(ARGV[3]) then locked = ARGV[4] end
+    redis.call('HSET', KEYS[2], 'failures', n, 'locked_until', locked)
+    redis.call('SADD', KEYS[3], ARGV[2])
+end
+return n
+"""
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+def _parse_time(value) -> Optional[datetime]:
+    value = _text(value)
+    if not value:
+        return None
+    # users timestamps are stored as naive UTC
+    return datetime.fromisoformat(value).astimezone(UTC).replace(tzinfo=None)
+
+class LoginTracker(RedisBackoff):
+    """
+    Write-coalesced login bookkeeping.
+
+    Successful and failed logins are recorded in Redis in one round trip and
+    never write to the database on the request path:
+
+        login:fail:<email>    failure counter, expires LOGIN_LOCKOUT_MINUTES
+                              after the last failure; the lockout check
+        login:user:<id>       hash of pending users-row changes: last_at,
+                              last_ip, logins (increment), failures, locked_until
+        login:dirty           set of user ids with pending changes
+
+    flush() pops dirty ids, reads and clears their hashes in one MULTI and
+    applies them to `users` with a single executemany UPDATE (login_count is
+    incremented, the other columns overwritten). It runs on a background
+    thread every LOGIN_FLUSH_INTERVAL seconds, or via `flask logins flush`.
+
+    Every method returns None when Redis is unavailable so the caller can
+    fall back to the synchronous User methods; lockout is then enforced from
+    users.failed_login_attempts / locked_until instead.
+    """
+
+    REDIS_LABEL = 'Login tracker'
+    REDIS_FALLBACK = 'falling back to the database'
+
+    DIRTY_KEY = 'login:dirty'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.app = None
+        self.redis = redis
+        self.max_attempts = 5
+        self.lockout_minutes = 15
+        self.flush_background = False
+        self.flusher = PeriodicTask('login-flusher', self.flush)
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.app = app
+        self.redis = redis
+        self.max_attempts = int(app.config.get('LOGIN_MAX_ATTEMPTS', 5))
+        self.lockout_minutes = int(app.config.get('LOGIN_LOCKOUT_MINUTES', 15))
+        self.flush_background = app.config.get('LOGIN_FLUSH_BACKGROUND', False)
+        self.flusher.interval = float(app.config.get('LOGIN_FLUSH_INTERVAL', 10))
+        self.init_backoff(app)
+        app.extensions['login_tracker'] = self
+
+    @staticmethod
+    def fail_key(email: str) -> str:
+        return f'login:fail:{email}'
+
+    @staticmethod
+    def user_key(user_id) -> str:
+        return f'login:user:{user_id}'
+
+    def failed_attempts(self, email: str) -> Optional[int]:
+        """Current failure count for an email, or None if Redis is unavailable."""
+        if not self.available:
+            return None
+        try:
+            return int(self.redis.get(self.fail_key(email)) or 0)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    def record_failure(self, email: str, user_id: Optional[int]) -> Optional[int]:
+        """Count a failed attempt. Returns the new count, or None if Redis is unavailable."""
+        if not self.available:
+            return None
+        locked_until = datetime.now(UTC) + timedelta(minutes=self.lockout_minutes)
+        try:
+            count = self.redis.eval(
+                _RECORD_FAILURE, 3,
+                self.fail_key(email), self.user_key(user_id or 0), self.DIRTY_KEY,
+                self.lockout_minutes * 60, user_id or '', self.max_attempts, locked_until.isoformat()
+            )
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        self._ensure_flusher()
+        return int(count)
+
+    def record_success(self, email: str, user_id: int, ip_address: Optional[str]) -> bool:
+        """Record a successful login. Returns False if Redis is unavailable."""
+        if not self.available:
+            return False
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(self.fail_key(email))
+            pipe.hset(self.user_key(user_id), mapping={
+                'last_at': datetime.now(UTC).isoformat(),
+                'last_ip': ip_address or '',
+                'failures': 0,
+                'locked_until': ''
+            })
+            pipe.hincrby(self.user_key(user_id), 'logins', 1)
+            pipe.sadd(self.DIRTY_KEY, user_id)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+            return False
+        self._ensure_flusher()
+        return True
+
+    def _ensure_flusher(self) -> None:
+        if self.flush_background:
+            self.flusher.ensure_started(self.app)
+
+    def flush(self, max_items: int = 5000) -> int:
+        """
+        Apply pending login bookkeeping to the users table.
+
+        Returns:
+            Number of users updated
+        """
+        from sqlalchemy import bindparam, func, update
+        from ..models import db, User
+
+        if not self.available:
+            return 0
+        try:
+            user_ids = [int(_text(i)) for i in (self.redis.spop(self.DIRTY_KEY, max_items) or [])]
+            if not user_ids:
+                return 0
+            pipe = self.redis.pipeline(transaction=True)
+            for user_id in user_ids:
+                pipe.hgetall(self.user_key(user_id))
+                pipe.delete(self.user_key(user_id))
+            pending = pipe.execute()[::2]
+        except Exception as e:
+            self._redis_failed(e)
+            return 0
+
+        params = []
+        for user_id, fields in zip(user_ids, pending):
+            fields = {_text(k): _text(v) for k, v in fields.items()}
+            if not fields:
+                continue
+            params.append({
+                'uid': user_id,
+                'logins': int(fields.get('logins') or 0),
+                'last_at': _parse_time(fields.get('last_at')),
+                'last_ip': fields.get('last_ip') or None,
+                'failures': int(fields.get('failures') or 0),
+                'locked_until': _parse_time(fields.get('locked_until'))
+            })
+        if not params:
+            return 0
+
+        users = User.__table__
+        stmt = update(users).where(users.c.id == bindparam('uid')).values(
+            login_count=users.c.login_count + bindparam('logins'),
+            last_login_at=func.coalesce(bindparam('last_at', type_=users.c.last_login_at.type), users.c.last_login_at),
+            last_login_ip=func.coalesce(bindparam('last_ip', type_=users.c.last_login_ip.type), users.c.last_login_ip),
+            failed_login_attempts=bindparam('failures'),
+            locked_until=bindparam('locked_until', type_=users.c.locked_until.type)
+        )
+        try:
+            db.session.execute(stmt, params)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self._restore(params)
+            raise
+        return len(params)
+
+    def _restore(self, params: List[Dict]) -> None:
+        # Put popped changes back without overwriting anything recorded since
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for p in params:
+                key = self.user_key(p['uid'])
+                pipe.hincrby(key, 'logins', p['logins'])
+                if p['last_at']:
+                    pipe.hsetnx(key, 'last_at', p['last_at'].replace(tzinfo=UTC).isoformat())
+                    pipe.hsetnx(key, 'last_ip', p['last_ip'] or '')
+                pipe.hsetnx(key, 'failures', p['failures'])
+                pipe.hsetnx(key, 'locked_until', p['locked_until'].replace(tzinfo=UTC).isoformat() if p['locked_until'] else '')
+                pipe.sadd(self.DIRTY_KEY, p['uid'])
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
@@ -0,0 +1,216 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+# Which meeting roles may perform each action
+ACTION_ROLES = {
+    'view': {'host', 'co-host', 'approved', 'pending', 'declined', 'banned'},
+    'manage_participants': {'host', 'co-host'},
+    'manage_co_hosts': {'host'},
+    'export': {'host', 'co-host'},
+    'telemetry': {'host', 'co-host', 'approved'},
+    'end': {'host'},
+    'delete': {'host'}
+}
+
+NO_ROLE = 'none'
+
+# Store a freshly loaded role only if no invalidation happened while loading
+_STORE_IF_CURRENT = """
+if (redis.call('HGET', KEYS[1], '_gen') or '0') == ARGV[1] then
+    redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+end
+return 0
+"""
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+class MeetingACL(RedisBackoff):
+    """
+    Answers "can user U do action A on meeting M".
+
+    A user's role in a meeting (host, banned, co-host, approved, pending,
+    declined or none, in that order of precedence) is resolved once with a
+    single indexed query. The query combines an EXISTS against
+    meeting_co_hosts and a point lookup on meeting_participants(meeting_id,
+    user_id). The result is then cached in a per-meeting role map:
+
+        Redis hash meeting:<id>:acl    field <user_id> -> role
+        local LRU (meeting_id, user_id) -> role, MEETING_CACHE_LOCAL_TTL
+
+    The host comes from the cached meeting's created_by and is never queried.
+    Membership changes call invalidate(meeting_id, user_id) after commit,
+    which drops that user's entry and bumps the map's ``_gen`` field so a
+    lookup that raced the change cannot write back a stale role;
+    invalidate_meeting() drops the whole map.
+    """
+
+    REDIS_LABEL = 'Meeting ACL'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.redis = redis
+        self.ttl = 300
+        self.local_ttl = 2.0
+        self.local_size = 4096
+        self._local: 'OrderedDict[Any, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.redis = redis
+        self.ttl = int(app.config.get('MEETING_CACHE_TTL', 300))
+        self.local_ttl = float(app.config.get('MEETING_CACHE_LOCAL_TTL', 2.0))
+        self.local_size = int(app.config.get('MEETING_ACL_LOCAL_SIZE', 4096))
+        self.init_backoff(app)
+        with self._lock:
+            self._local.clear()
+        app.extensions['meeting_acl'] = self
+
+    @staticmethod
+    def key(meeting_id) -> str:
+        return f'meeting:{meeting_id}:acl'
+
+    def can(self, user_id: int, meeting: Dict[str, Any], action: str) -> bool:
+        """
+        Check whether user_id may perform action on a (serialized) meeting.
+
+        Args:
+            user_id: Acting user's id
+            meeting: Meeting dict; only 'id', 'created_by' and 'archived' are used
+            action: One of ACTION_ROLES
+        """
+        allowed = ACTION_ROLES[action]
+        if meeting['created_by'] == user_id:
+            return 'host' in allowed
+        # Host-only actions never need a lookup
+        if allowed == {'host'}:
+            return False
+        return self.role(user_id, meeting) in allowed
+
+    def role(self, user_id: int, meeting: Dict[str, Any]) -> str:
+        """Return the user's role in the meeting, using the cached role map."""
+        if meeting['created_by'] == user_id:
+            return 'host'
+        meeting_id = meeting['id']
+
+        cached = self._local_get(meeting_id, user_id)
+        if cached is not None:
+            return cached
+
+        generation = None
+        if self.available:
+            try:
+                cached, generation = self.redis.hmget(self.key(meeting_id), user_id, '_gen')
+                generation = _text(generation) or '0'
+                if cached is not None:
+                    cached = _text(cached)
+                    self._local_put(meeting_id, user_id, cached)
+                    return cached
+            except Exception as e:
+                self._redis_failed(e)
+                generation = None
+
+        role = self._load_role(meeting_id, user_id, meeting.get('archived', False))
+        if generation is not None and self.available:
+            try:
+                self.redis.eval(_STORE_IF_CURRENT, 1, self.key(meeting_id), generation, user_id, role, self.ttl)
+            except Exception as e:
+                self._redis_failed(e)
+        self._local_put(meeting_id, user_id, role)
+        return role
+
+    def invalidate(self, meeting_id: int, user_id: int) -> None:
+        """Forget one user's role in a meeting. Call after commit."""
+        with self._lock:
+            self._local.pop((meeting_id, user_id), None)
+        if self.available:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hdel(self.key(meeting_id), user_id)
+                pipe.hincrby(self.key(meeting_id), '_gen', 1)
+                pipe.expire(self.key(meeting_id), self.ttl)
+                pipe.execute()
+            except Exception as e:
+                self._redis_failed(e)
+
+    def invalidate_many(self, meeting_id: int, user_ids) -> None:
+        """Forget several users' roles in a meeting in one round trip. Call after commit."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        with self._lock:
+            for user_id in user_ids:
+                self._local.pop((meeting_id, user_id), None)
+        if self.available:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hdel(self.key(meeting_id), *user_ids)
+                pipe.hincrby(self.key(meeting_id), '_gen', 1)
+                pipe.expire(self.key(meeting_id), self.ttl)
+                pipe.execute()
+            except Exception as e:
+                self._redis_failed(e)
+
+    def invalidate_meeting(self, meeting_id: int) -> None:
+        """Forget the whole role map of a meeting. Call after commit."""
+        with self._lock:
+            for key in [k for k in self._local if k[0] == meeting_id]:
+                del self._local[key]
+        if self.available:
+            try:
+                self.redis.delete(self.key(meeting_id))
+            except Exception as e:
+                self._redis_failed(e)
+
+    def _load_role(self, meeting_id: int, user_id: int, archived: bool = False) -> str:
+        from sqlalchemy import case, exists, select
+        from ..models import (db, MeetingCoHost, MeetingParticipant, ArchivedMeetingCoHost,
+                              ArchivedMeetingParticipant)
+
+        # Archived meetings keep their roles in the archive tables
+        co_host_model = ArchivedMeetingCoHost if archived else MeetingCoHost
+        participant_model = ArchivedMeetingParticipant if archived else MeetingParticipant
+        is_co_host = exists().where(
+            co_host_model.meeting_id == meeting_id,
+            co_host_model.user_id == user_id
+        )
+        participant_role = select(
+            case((participant_model.is_banned.is_(True), 'banned'), else_=participant_model.status)
+        ).where(
+            participant_model.meeting_id == meeting_id,
+            participant_model.user_id == user_id
+        ).limit(1).scalar_subquery()
+
+        co_host, status = db.session.execute(select(is_co_host, participant_role)).one()
+        # A ban outranks co-host status
+        if status == 'banned':
+            return 'banned'
+        if co_host:
+            return 'co-host'
+        return status or NO_ROLE
+
+    # -- local tier -------------------------------------------------------
+
+    def _local_get(self, meeting_id: int, user_id: int) -> Optional[str]:
+        with self._lock:
+            entry = self._local.get((meeting_id, user_id))
+            if entry is None or time.monotonic() - entry[1] > self.local_ttl:
+                return None
+            self._local.move_to_end((meeting_id, user_id))
+            return entry[0]
+
+    def _local_put(self, meeting_id: int, user_id: int, role: str) -> None:
+        with self._lock:
+            self._local[(meeting_id, user_id)] = (role, time.monotonic())
+            self._local.move_to_end((meeting_id, user_id))
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
@@ -0,0 +1,190 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+class MeetingCache(RedisBackoff):
+    """
+    Two-tier read-through cache of serialized meeting state.
+
+    Tier 1 is a small per-process LRU with a short TTL (MEETING_CACHE_LOCAL_TTL,
+    seconds). Tier 2 is Redis, where each meeting has a version counter
+    (``meeting:<id>:v``) and a payload (``meeting:<id>:data``) tagged with the
+    version it was built from. Both keys are read with a single MGET; a
+    payload whose version differs from the counter is treated as a miss.
+
+    Writers call bump(meeting_id) after committing. That increments the
+    counter, invalidating every cached copy across processes, and evicts the
+    local entry in the calling process. Other processes may serve a local
+    copy for at most MEETING_CACHE_LOCAL_TTL seconds after a bump.
+
+    If Redis errors, reads fall through to the loader and Redis is skipped
+    for REDIS_BACKOFF_SECONDS.
+    """
+
+    REDIS_LABEL = 'Meeting cache'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.redis = redis
+        self.enabled = True
+        self.ttl = 300
+        self.local_ttl = 2.0
+        self.local_size = 1024
+        self._local: 'OrderedDict[Any, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = self._empty_stats()
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.redis = redis
+        self.enabled = app.config.get('MEETING_CACHE_ENABLED', True)
+        self.ttl = int(app.config.get('MEETING_CACHE_TTL', 300))
+        self.local_ttl = float(app.config.get('MEETING_CACHE_LOCAL_TTL', 2.0))
+        self.local_size = int(app.config.get('MEETING_CACHE_LOCAL_SIZE', 1024))
+        self.init_backoff(app)
+        self.clear()
+        app.extensions['meeting_cache'] = self
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, float]:
+        return {
+            'local_hits': 0,
+            'redis_hits': 0,
+            'misses': 0,
+            'stale_versions': 0,
+            'bumps': 0,
+            'redis_errors': 0,
+            'max_local_age_seconds': 0.0
+        }
+
+    @staticmethod
+    def version_key(meeting_id) -> str:
+        return f'meeting:{meeting_id}:v'
+
+    @staticmethod
+    def data_key(meeting_id) -> str:
+        return f'meeting:{meeting_id}:data'
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self.stats = self._empty_stats()
+
+    # -- local tier -------------------------------------------------------
+
+    def _local_get(self, meeting_id) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._local.get(meeting_id)
+            if entry is None:
+                return None
+            version, data, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age > self.local_ttl:
+                return None
+            self._local.move_to_end(meeting_id)
+            self.stats['local_hits'] += 1
+            self.stats['max_local_age_seconds'] = max(self.stats['max_local_age_seconds'], round(age, 3))
+            return data
+
+    def _local_put(self, meeting_id, version: int, data: Dict[str, Any]) -> None:
+        with self._lock:
+            previous = self._local.get(meeting_id)
+            if previous is not None and previous[0] < version:
+                # An expired local copy was behind Redis: a bump happened elsewhere
+                self.stats['stale_versions'] += 1
+            self._local[meeting_id] = (version, data, time.monotonic())
+            self._local.move_to_end(meeting_id)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    # -- redis tier -------------------------------------------------------
+
+    def _redis_failed(self, e: Exception) -> None:
+        self.stats['redis_errors'] += 1
+        super()._redis_failed(e)
+
+    def get(self, meeting_id, loader: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Return the serialized meeting, loading it with loader() on a miss.
+
+        Args:
+            meeting_id: Meeting primary key
+            loader: Returns the meeting dict from the database, or None
+
+        Returns:
+            The meeting dict, or None if the meeting does not exist
+        """
+        if not self.enabled:
+            return loader()
+
+        data = self._local_get(meeting_id)
+        if data is not None:
+            return data
+
+        if not self.available:
+            return self._load_local_only(meeting_id, loader)
+
+        try:
+            raw_version, raw_data = self.redis.mget(self.version_key(meeting_id), self.data_key(meeting_id))
+            version = int(raw_version or 0)
+            if raw_data is not None:
+                payload = json.loads(raw_data)
+                if payload.get('v') == version:
+                    self.stats['redis_hits'] += 1
+                    self._local_put(meeting_id, version, payload['data'])
+                    return payload['data']
+                self.stats['stale_versions'] += 1
+        except Exception as e:
+            self._redis_failed(e)
+            return self._load_local_only(meeting_id, loader)
+
+        self.stats['misses'] += 1
+        data = loader()
+        if data is None:
+            return None
+        try:
+            self.redis.set(self.data_key(meeting_id), json.dumps({'v': version, 'data': data}), ex=self.ttl)
+        except Exception as e:
+            self._redis_failed(e)
+        self._local_put(meeting_id, version, data)
+        return data
+
+    def _load_local_only(self, meeting_id, loader: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        # Without Redis, bumps cannot reach other processes; the local TTL bounds staleness
+        self.stats['misses'] += 1
+        data = loader()
+        if data is not None:
+            self._local_put(meeting_id, 0, data)
+        return data
+
+    def bump(self, meeting_id) -> None:
+        """Invalidate every cached copy of a meeting. Call after commit."""
+        with self._lock:
+            self._local.pop(meeting_id, None)
+            self.stats['bumps'] += 1
+        if not self.enabled or not self.available:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.incr(self.version_key(meeting_id))
+            pipe.expire(self.version_key(meeting_id), max(self.ttl * 2, 3600))
+            pipe.delete(self.data_key(meeting_id))
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['local_entries'] = len(self._local)
+        lookups = stats['local_hits'] + stats['redis_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['local_hits'] + stats['redis_hits']) / lookups, 4) if lookups else None
+        stats['local_ttl_seconds'] = self.local_ttl
+        return stats
@@ -0,0 +1,143 @@
+from bisect import bisect_left
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import insert, select
+
+def naive_utc(moment: datetime) -> datetime:
+    """Aware datetime as the naive UTC value stored in DateTime columns."""
+    return moment.astimezone(UTC).replace(tzinfo=None)
+
+def batch_conflicts(intervals: Dict[int, Tuple[datetime, datetime]]) -> Dict[int, int]:
+    """
+    Overlaps within one batch, keeping the earliest-starting meeting.
+
+    Args:
+        intervals: Item index -> (start, end)
+
+    Returns:
+        Index of every rejected item -> index of the kept item it overlaps
+    """
+    conflicts = {}
+    latest_index, latest_end = None, None
+    for index in sorted(intervals, key=lambda i: (intervals[i][0], i)):
+        start, end = intervals[index]
+        # Kept meetings all start no later than this one, so only the one
+        # ending last can overlap it
+        if latest_end is not None and latest_end > start:
+            conflicts[index] = latest_index
+            continue
+        if latest_end is None or end > latest_end:
+            latest_index, latest_end = index, end
+    return conflicts
+
+def existing_conflicts(session, user_id: int, intervals: Dict[int, Tuple[datetime, datetime]]) -> List[int]:
+    """
+    Indexes of items overlapping the user's active meetings.
+
+    One range query fetches every active meeting between the earliest start
+    and the latest end of the batch (served by idx_meetings_creator_active);
+    the rows are merged into disjoint intervals and each item is checked
+    with a binary search.
+    """
+    from ..models import Meeting
+    if not intervals:
+        return []
+    rows = session.execute(
+        select(Meeting.start_time, Meeting.end_time).where(
+            Meeting.created_by == user_id,
+            Meeting.ended_at.is_(None),
+            Meeting.end_time > min(start for start, _ in intervals.values()),
+            Meeting.start_time < max(end for _, end in intervals.values())
+        ).order_by(Meeting.start_time)
+    ).all()
+
+    starts: List[datetime] = []
+    ends: List[datetime] = []
+    for start, end in rows:
+        if ends and start < ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+
+    conflicts = []
+    for index, (start, end) in intervals.items():
+        # Merged intervals starting before this item ends; the last of them
+        # ends latest
+        position = bisect_left(starts, end)
+        if position and ends[position - 1] > start:
+            conflicts.append(index)
+    return sorted(conflicts)
+
+def insert_meetings(session, user_id: int, items: Sequence[Dict[str, Any]]) -> List[int]:
+    """
+    Insert validated, mutually non-overlapping meetings with their co-hosts
+    and audit rows, using one multi-row INSERT per table. Times must be
+    naive UTC. Does not commit.
+
+    Returns:
+        The new meeting ids, in the order of items
+    """
+    from ..models import Meeting, MeetingCoHost, MeetingAuditLog
+    if not items:
+        return []
+    now = datetime.now(UTC).replace(tzinfo=None)
+    # Kept items never overlap, so start times identify them; RETURNING
+    # order is not guaranteed and forcing it splits the insert per row
+    returned = session.execute(
+        insert(Meeting).returning(Meeting.id, Meeting.start_time),
+        [
+            {
+                'title': item['title'],
+                'description': item['description'],
+                'start_time': item['start_time'],
+                'end_time': item['end_time'],
+                'created_by': user_id,
+                'created_at': now,
+                'updated_at': now,
+                'meeting_type': item['meeting_type'],
+                'max_participants': item['max_participants'],
+                'requires_approval': item['requires_approval'],
+                'is_recorded': item['is_recorded'],
+                'recurring_pattern': item['recurring_pattern']
+            }
+            for item in items
+        ]
+    ).all()
+    ids_by_start = {start_time: meeting_id for meeting_id, start_time in returned}
+    meeting_ids = [ids_by_start[item['start_time']] for item in items]
+
+    co_host_rows = [
+        {'meeting_id': meeting_id, 'user_id': co_host_id, 'created_at': now, 'updated_at': now}
+        for meeting_id, item in zip(meeting_ids, items)
+        for co_host_id in item['co_hosts']
+    ]
+    if co_host_rows:
+        session.execute(insert(MeetingCoHost), co_host_rows)
+
+    audit_rows = []
+    for meeting_id, item in zip(meeting_ids, items):
+        audit_rows.append({
+            'meeting_id': meeting_id,
+            'user_id': user_id,
+            'action': 'created',
+            'created_at': now,
+            'details': {
+                'meeting_type': item['meeting_type'],
+                'requires_approval': item['requires_approval'],
+                'is_recorded': item['is_recorded'],
+                'recurring_pattern': item['recurring_pattern'],
+                'imported': True
+            }
+        })
+        if item['co_hosts']:
+            audit_rows.append({
+                'meeting_id': meeting_id,
+                'user_id': user_id,
+                'action': 'added_co_hosts',
+                'created_at': now,
+                'details': {'co_host_ids': item['co_hosts']}
+            })
+    session.execute(insert(MeetingAuditLog), audit_rows)
+    return meeting_ids
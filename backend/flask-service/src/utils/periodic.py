@@ -0,0 +1,48 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class PeriodicTask:
+    """
+    Runs fn every `interval` seconds on a daemon thread inside an app context.
+
+    The thread is started lazily with ensure_started() and restarted if the
+    process id changes, so it survives gunicorn's preload-then-fork model.
+    """
+
+    def __init__(self, name: str, fn: Callable[[], object], interval: float = 10.0) -> None:
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.app = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure_started(self, app) -> None:
+        """Start the thread in this process if it is not running."""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self.app = app
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with self.app.app_context():
+                    self.fn()
+            except Exception as e:
+                logger.error(f"{self.name} failed: {str(e)}")
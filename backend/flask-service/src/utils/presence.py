@@ -0,0 +1,252 @@
+import logging
+import time
+from datetime import datetime, UTC
+from typing import List, Optional, Tuple
+
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+# Extend a registration only if the user is still registered in this meeting
+_REFRESH = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[2])
+redis.call('ZADD', KEYS[3], ARGV[3], ARGV[1])
+return 1
+"""
+
+# Leave a meeting; the user key is only cleared if it still points at it
+_LEAVE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+if redis.call('ZREM', KEYS[2], ARGV[2]) == 1 then
+    redis.call('ZADD', KEYS[3], ARGV[3], ARGV[1] .. ':' .. ARGV[2])
+end
+return 0
+"""
+
+# Remove and return members scored before ARGV[1], with their scores
+_POP_BEFORE = """
+local popped = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1], 'WITHSCORES')
+if #popped > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+end
+return popped
+"""
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+def _pairs(flat) -> List[Tuple[str, int]]:
+    return [(_text(flat[i]), int(float(flat[i + 1]))) for i in range(0, len(flat), 2)]
+
+class PresenceRegistry(RedisBackoff):
+    """
+    Who is in which meeting right now, kept alive by heartbeats.
+
+        presence:user:<user_id>        meeting id; expires PRESENCE_TTL_SECONDS
+                                       after the last heartbeat
+        presence:meeting:<meeting_id>  sorted set user_id -> last heartbeat (ms)
+        presence:meetings              sorted set meeting_id -> last heartbeat,
+                                       the meetings the reconciler visits
+        presence:departed              sorted set "<meeting_id>:<user_id>" ->
+                                       time of an explicit leave or a switch
+                                       to another meeting
+
+    Joining a meeting over HTTP registers the user. Heartbeats (POST
+    /api/meetings/<id>/presence, or the socket 'heartbeat' event) only
+    extend an existing registration, so a heartbeat cannot put anyone in a
+    meeting they have not joined. "Is this user in another meeting" is one
+    GET and "who is here" one range read.
+
+    reconcile() turns departures and members whose heartbeats stopped into
+    left_at (the last heartbeat or the leave time) with one executemany
+    UPDATE. It runs on the lifecycle sweeper's leader each tick.
+
+    A lapsed registration only proves the user left if their client
+    heartbeats. Until PRESENCE_HEARTBEATS is set, other_meeting() reports
+    "unknown" unless the user is registered elsewhere, and reconcile() only
+    prunes Redis without touching the database.
+
+    Methods return None when Redis is unavailable so callers can fall back
+    to the participations in the database.
+    """
+
+    REDIS_LABEL = 'Presence registry'
+    REDIS_FALLBACK = 'falling back to the database'
+
+    INDEX_KEY = 'presence:meetings'
+    DEPARTED_KEY = 'presence:departed'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.redis = redis
+        self.ttl = 45.0
+        self.heartbeats = False
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.redis = redis
+        self.ttl = float(app.config.get('PRESENCE_TTL_SECONDS', 45))
+        self.heartbeats = bool(app.config.get('PRESENCE_HEARTBEATS', False))
+        self.init_backoff(app)
+        app.extensions['presence'] = self
+
+    @staticmethod
+    def user_key(user_id) -> str:
+        return f'presence:user:{user_id}'
+
+    @staticmethod
+    def meeting_key(meeting_id) -> str:
+        return f'presence:meeting:{meeting_id}'
+
+    @property
+    def ttl_ms(self) -> int:
+        return int(self.ttl * 1000)
+
+    def register(self, user_id: int, meeting_id: int) -> Optional[bool]:
+        """
+        Put the user in a meeting, leaving any other one. Call after a successful join.
+
+        Returns:
+            Whether the user was registered, or None if Redis is unavailable
+        """
+        if not self.available:
+            return None
+        now_ms = int(time.time() * 1000)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(self.user_key(user_id), meeting_id, px=self.ttl_ms, get=True)
+            pipe.zadd(self.meeting_key(meeting_id), {user_id: now_ms})
+            pipe.zadd(self.INDEX_KEY, {meeting_id: now_ms})
+            previous = _text(pipe.execute()[0])
+            if previous and int(previous) != meeting_id:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.zrem(self.meeting_key(previous), user_id)
+                pipe.zadd(self.DEPARTED_KEY, {f'{previous}:{user_id}': now_ms})
+                pipe.execute()
+            return True
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    def heartbeat(self, user_id: int, meeting_id: int) -> Optional[bool]:
+        """
+        Extend the user's registration in a meeting.
+
+        Returns:
+            False if they are not registered there (never joined, left, or
+            expired; the client should join again), None if Redis is unavailable
+        """
+        if not self.available:
+            return None
+        try:
+            return bool(self.redis.eval(
+                _REFRESH, 3, self.user_key(user_id), self.meeting_key(meeting_id), self.INDEX_KEY,
+                meeting_id, user_id, int(time.time() * 1000), self.ttl_ms
+            ))
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    def leave(self, user_id: int, meeting_id: int) -> None:
+        if not self.available:
+            return
+        try:
+            self.redis.eval(_LEAVE, 3, self.user_key(user_id), self.meeting_key(meeting_id), self.DEPARTED_KEY,
+                            meeting_id, user_id, int(time.time() * 1000))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def other_meeting(self, user_id: int, meeting_id: int) -> Optional[int]:
+        """
+        The meeting other than meeting_id the user is present in.
+
+        Returns:
+            Its id, 0 if there is none, or None if that is unknown (Redis is
+            unavailable, or clients do not heartbeat and the user is not
+            registered elsewhere)
+        """
+        if not self.available:
+            return None
+        try:
+            current = _text(self.redis.get(self.user_key(user_id)))
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if current is None or int(current) == meeting_id:
+            return 0 if self.heartbeats else None
+        return int(current)
+
+    def members(self, meeting_id: int) -> Optional[List[int]]:
+        """Ids of users with a live heartbeat in the meeting, or None if Redis is unavailable."""
+        if not self.available:
+            return None
+        cutoff = int(time.time() * 1000) - self.ttl_ms
+        try:
+            members = self.redis.zrangebyscore(self.meeting_key(meeting_id), cutoff, '+inf')
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        return sorted(int(member) for member in members)
+
+    def reconcile(self) -> int:
+        """
+        Close the participations of users who left or stopped heartbeating.
+
+        Returns:
+            Number of departures applied (0 if Redis is unavailable or
+            PRESENCE_HEARTBEATS is off)
+        """
+        from ..models import db, MeetingParticipant
+
+        if not self.available:
+            return 0
+        now_ms = int(time.time() * 1000)
+        cutoff = now_ms - self.ttl_ms
+        try:
+            departed = _pairs(self.redis.eval(_POP_BEFORE, 1, self.DEPARTED_KEY, now_ms + 1))
+            meeting_ids = [_text(m) for m in self.redis.zrange(self.INDEX_KEY, 0, -1)]
+            pipe = self.redis.pipeline(transaction=False)
+            for meeting_id in meeting_ids:
+                pipe.eval(_POP_BEFORE, 1, self.meeting_key(meeting_id), cutoff)
+            expired = pipe.execute() if meeting_ids else []
+            # Meetings with no heartbeat since the cutoff are empty now
+            self.redis.zremrangebyscore(self.INDEX_KEY, '-inf', f'({cutoff}')
+        except Exception as e:
+            self._redis_failed(e)
+            return 0
+
+        leaves = {}
+        for entry, left_ms in departed:
+            meeting_id, user_id = entry.split(':')
+            leaves[(int(meeting_id), int(user_id))] = left_ms
+        for meeting_id, popped in zip(meeting_ids, expired):
+            for user_id, last_seen_ms in _pairs(popped):
+                leaves[(int(meeting_id), int(user_id))] = last_seen_ms
+        # Without heartbeats every registration lapses; only prune Redis
+        if not leaves or not self.heartbeats:
+            return 0
+
+        closings = [
+            (meeting_id, user_id, datetime.fromtimestamp(left_ms / 1000, UTC).replace(tzinfo=None))
+            for (meeting_id, user_id), left_ms in sorted(leaves.items())
+        ]
+        try:
+            MeetingParticipant.close_participations(closings)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # Keep them for the next run
+            try:
+                self.redis.zadd(self.DEPARTED_KEY, {
+                    f'{meeting_id}:{user_id}': left_ms for (meeting_id, user_id), left_ms in leaves.items()
+                })
+            except Exception as e:
+                self._redis_failed(e)
+            raise
+        return len(closings)
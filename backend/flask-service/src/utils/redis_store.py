@@ -0,0 +1,97 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+class LazyRedis:
+    """
+    Redis client that defers connecting until the first command.
+
+    Creating the client at import time meant an unreachable Redis failed the
+    import, and every forked worker inherited (and re-handshook) the parent's
+    sockets. This wrapper only records the URL in init_app; the underlying
+    client and its connection pool are built on first attribute access, and
+    rebuilt if the process id changes (i.e. after a fork).
+
+    Usage:
+        redis_client = LazyRedis()
+        redis_client.init_app(app)
+        redis_client.get('key')  # connects here
+    """
+
+    def __init__(self, app=None) -> None:
+        self._url: Optional[str] = None
+        self._options: dict = {}
+        self._client = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        self._url = app.config['REDIS_URL']
+        self._options = dict(app.config.get('REDIS_OPTIONS') or {})
+        self._client = None
+        app.extensions['redis'] = self
+
+    @property
+    def client(self):
+        if self._client is None or self._pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._pid != os.getpid():
+                    if self._url is None:
+                        raise RuntimeError('Redis client used before init_app()')
+                    import redis
+                    self._client = redis.from_url(self._url, **self._options)
+                    self._pid = os.getpid()
+        return self._client
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether a client has been built in this process."""
+        return self._client is not None and self._pid == os.getpid()
+
+    def reset(self) -> None:
+        """Discard the client and any pooled connections (e.g. after fork)."""
+        with self._lock:
+            # Sockets inherited from a parent process are dropped, not closed
+            if self._client is not None and self._pid == os.getpid():
+                self._client.connection_pool.disconnect(inuse_connections=False)
+            self._client = None
+            self._pid = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+class RedisBackoff:
+    """
+    Mixin for extensions that stop using Redis for a while after an error.
+
+    Subclasses keep their client in ``redis``, call init_backoff(app) from
+    init_app, check ``available`` before a Redis call and pass errors to
+    _redis_failed(). Redis is then skipped for REDIS_BACKOFF_SECONDS, the
+    same window for every extension. REDIS_LABEL and REDIS_FALLBACK fill in
+    the warning: "<label> Redis error, <fallback> for <n>s: <error>".
+    """
+
+    REDIS_LABEL = 'Redis client'
+    REDIS_FALLBACK = 'bypassing'
+
+    redis = None
+    backoff = 5.0
+    _redis_down_until = 0.0
+
+    def init_backoff(self, app) -> None:
+        self.backoff = float(app.config.get('REDIS_BACKOFF_SECONDS', 5.0))
+        self._redis_down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.backoff
+        logging.getLogger(type(self).__module__).warning(
+            f"{self.REDIS_LABEL} Redis error, {self.REDIS_FALLBACK} for {self.backoff}s: {str(e)}"
+        )
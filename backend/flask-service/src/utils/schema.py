@@ -0,0 +1,213 @@
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from flask import jsonify
+
+MISSING = object()
+
+# Characters bleach would escape, drop or rewrite; text without any is returned as is
+_NEEDS_CLEANING = re.compile(r'[<>&\x00-\x08\x0b-\x1f\x7f-\x9f\ud800-\udfff]')
+_cleaners = threading.local()
+
+def clean_html(text: str) -> str:
+    """
+    bleach.clean() for user text, skipping the parse when there is nothing
+    to clean. Cleaners are not thread-safe, so each thread reuses its own.
+    """
+    if not _NEEDS_CLEANING.search(text):
+        return text
+    cleaner = getattr(_cleaners, 'cleaner', None)
+    if cleaner is None:
+        import bleach
+        cleaner = _cleaners.cleaner = bleach.Cleaner()
+    return cleaner.clean(text)
+
+class Invalid(ValueError):
+    """Raised by a compiled field decoder; the message is reported for that field."""
+
+class Field:
+    """
+    Declarative spec for one JSON field.
+
+    Args:
+        type: str, int, bool, datetime (parsed from ISO 8601) or list
+        required: Report the field if absent; otherwise default is used
+        default: Value when absent (callables are called, e.g. list)
+        nullable: Accept null
+        strip, lower: Normalize strings before any other check
+        sanitize: Callable applied to strings after normalizing, e.g. bleach.clean
+        min_length, max_length: Bounds on string or list length
+        pattern: Regex the whole string must match
+        contains: Regexes that must each occur somewhere in the string
+        choices: Allowed values (enums)
+        minimum: Lower bound for ints
+        aware: Require a timezone on datetimes
+        items: Field spec for list items
+        message: Reported for any failed rule instead of the rule's own message
+    """
+
+    def __init__(self, type, required: bool = False, default: Any = None, nullable: bool = False,
+                 strip: bool = False, lower: bool = False, sanitize: Optional[Callable[[str], str]] = None,
+                 min_length: Optional[int] = None, max_length: Optional[int] = None,
+                 pattern: Optional[str] = None, contains: Sequence[str] = (),
+                 choices: Optional[Iterable[Any]] = None, minimum: Optional[int] = None,
+                 aware: bool = False, items: Optional['Field'] = None,
+                 message: Optional[str] = None) -> None:
+        self.type = type
+        self.required = required
+        self.default = default
+        self.nullable = nullable
+        self.strip = strip
+        self.lower = lower
+        self.sanitize = sanitize
+        self.min_length = min_length
+        self.max_length = max_length
+        self.pattern = pattern
+        self.contains = tuple(contains)
+        self.choices = frozenset(choices) if choices is not None else None
+        self.minimum = minimum
+        self.aware = aware
+        self.items = items
+        self.message = message
+
+    def compile(self, name: str = 'value') -> Callable[[Any], Any]:
+        """
+        Build the decoder: one closure running only the rules this field
+        uses, with its regexes compiled and messages naming the field.
+        Returns the coerced value or raises Invalid.
+        """
+        steps = []
+        if self.type is str:
+            steps.append(_expect(str, f'{name} must be a string'))
+            if self.strip:
+                steps.append(str.strip)
+            if self.lower:
+                steps.append(str.lower)
+            if self.sanitize is not None:
+                steps.append(self.sanitize)
+        elif self.type is bool:
+            steps.append(_expect(bool, f'{name} must be true or false'))
+        elif self.type is int:
+            steps.append(_expect(int, f'{name} must be an integer', exclude=bool))
+            if self.minimum is not None:
+                steps.append(_check(lambda v, low=self.minimum: v >= low, f'{name} must be at least {self.minimum}'))
+        elif self.type is datetime:
+            steps.append(_parse_datetime)
+            if self.aware:
+                steps.append(_check(lambda v: v.tzinfo is not None, 'Timezone information is required'))
+        elif self.type is list:
+            steps.append(_expect(list, f'{name} must be a list'))
+        else:
+            raise TypeError(f'Unsupported field type: {self.type!r}')
+
+        if self.min_length is not None:
+            steps.append(_check(lambda v, n=self.min_length: len(v) >= n,
+                                f'{name} cannot be empty' if self.min_length == 1
+                                else f'{name} too short (min {self.min_length} characters)'))
+        if self.max_length is not None:
+            steps.append(_check(lambda v, n=self.max_length: len(v) <= n, f'{name} too long (max {self.max_length})'))
+        if self.pattern is not None:
+            steps.append(_check(re.compile(self.pattern).fullmatch, f'Invalid {name} format'))
+        for needle in self.contains:
+            steps.append(_check(re.compile(needle).search, f'Invalid {name} format'))
+        if self.choices is not None:
+            steps.append(_check(self.choices.__contains__, f"{name} must be one of: {', '.join(sorted(map(str, self.choices)))}"))
+        if self.items is not None:
+            item = self.items.compile(f'{name} items')
+            steps.append(lambda v: [item(x) for x in v])
+
+        nullable, message, steps = self.nullable, self.message, tuple(steps)
+
+        def decode(value):
+            if value is None and nullable:
+                return None
+            try:
+                for step in steps:
+                    value = step(value)
+            except Invalid as e:
+                raise Invalid(message or str(e)) from None
+            return value
+        return decode
+
+def _expect(type_, message, exclude=()):
+    def step(value):
+        if not isinstance(value, type_) or isinstance(value, exclude):
+            raise Invalid(message)
+        return value
+    return step
+
+def _check(predicate, message):
+    def step(value):
+        if not predicate(value):
+            raise Invalid(message)
+        return value
+    return step
+
+def _parse_datetime(value):
+    if not isinstance(value, str):
+        raise Invalid('Invalid datetime format. Please use ISO format')
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise Invalid('Invalid datetime format. Please use ISO format') from None
+
+class Schema:
+    """
+    A request body schema, compiled once at import.
+
+    validate() decodes every field and then runs the cross-field checks,
+    collecting all errors instead of stopping at the first. A check is
+    skipped when a field it depends on already failed.
+
+    Usage:
+        SCHEMA = Schema({'title': Field(str, required=True, max_length=200)},
+                        checks=[('title', ('title',), lambda v: None if v['title'] != 'x' else 'No')])
+        values, errors = SCHEMA.validate(request.get_json(silent=True))
+    """
+
+    def __init__(self, fields: Dict[str, Field],
+                 checks: Sequence[Tuple[str, Tuple[str, ...], Callable[[Dict[str, Any]], Optional[str]]]] = ()) -> None:
+        self.fields = fields
+        self._decoders = tuple(
+            (name, field.required, field.default, field.compile(name))
+            for name, field in fields.items()
+        )
+        self._checks = tuple(checks)
+
+    def validate(self, data: Any) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Returns:
+            (values, errors): coerced values, defaults filled in, and a
+            message per failed field; errors is empty if the body is valid
+        """
+        if not isinstance(data, dict):
+            return {}, {'body': 'No data provided'}
+        values, errors = {}, {}
+        for name, required, default, decode in self._decoders:
+            value = data.get(name, MISSING)
+            if value is MISSING:
+                if required:
+                    errors[name] = f'{name} is required'
+                else:
+                    values[name] = default() if callable(default) else default
+                continue
+            try:
+                values[name] = decode(value)
+            except Invalid as e:
+                errors[name] = str(e)
+        for field, depends, check in self._checks:
+            if field in errors or any(name in errors for name in depends):
+                continue
+            message = check(values)
+            if message:
+                errors[field] = message
+        return values, errors
+
+def validation_error(errors: Dict[str, str], status_code: int = 400):
+    """Response listing every error; 'error' repeats the first for clients that show one message."""
+    return jsonify({
+        'error': next(iter(errors.values())),
+        'errors': errors
+    }), status_code
@@ -0,0 +1,77 @@
+import base64
+import binascii
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, and_, case, cast, func, literal_column, or_, select, tuple_, union
+
+SEARCH_CONFIG = 'english'
+MAX_SEARCH_TERMS = 8
+
+def encode_cursor(rank: float, meeting_id: int) -> str:
+    return base64.urlsafe_b64encode(f'{rank!r}:{meeting_id}'.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Optional[Tuple[float, int]]:
+    """Parse a cursor from encode_cursor(); None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        rank, meeting_id = raw.split(':')
+        return float(rank), int(meeting_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+
+def visible_meeting_ids(user_id: int):
+    """Ids of meetings a user co-hosts or has a participant row in (any status)."""
+    from ..models import MeetingParticipant, MeetingCoHost
+    return union(
+        select(MeetingParticipant.meeting_id).where(MeetingParticipant.user_id == user_id),
+        select(MeetingCoHost.meeting_id).where(MeetingCoHost.user_id == user_id)
+    )
+
+def _like_terms(query: str) -> List[str]:
+    terms = re.findall(r'\w+', query.lower())[:MAX_SEARCH_TERMS]
+    return ['%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%' for term in terms]
+
+def search_meetings(session, user_id: int, query: str, limit: int = 20,
+                    cursor: Optional[Tuple[float, int]] = None) -> List[Tuple]:
+    """
+    Rank meetings the user can see against a free-text query.
+
+    On PostgreSQL the query is parsed with websearch_to_tsquery (quoted
+    phrases, OR, -exclusions) and matched against meetings.search_vector, a
+    generated tsvector over title (weight A) and description (weight B)
+    with a GIN index; rank is ts_rank_cd. Other databases fall back to a
+    LIKE match on every term, title hits ranking above description hits.
+
+    Results are ordered by (rank, id) descending and paginated by keyset:
+    pass the (rank, id) of the last row seen as cursor.
+
+    Returns:
+        List of (Meeting, rank) tuples, at most limit long
+    """
+    from ..models import Meeting
+
+    if session.get_bind().dialect.name == 'postgresql':
+        vector = literal_column('meetings.search_vector')
+        tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query)
+        match = vector.op('@@')(tsquery)
+        rank = cast(func.ts_rank_cd(vector, tsquery), Float)
+    else:
+        terms = _like_terms(query)
+        if not terms:
+            return []
+        title, description = func.lower(Meeting.title), func.lower(func.coalesce(Meeting.description, ''))
+        match = and_(*[or_(title.like(t, escape='\\'), description.like(t, escape='\\')) for t in terms])
+        rank = cast(sum(
+            case((title.like(t, escape='\\'), 2), else_=0) + case((description.like(t, escape='\\'), 1), else_=0)
+            for t in terms
+        ), Float)
+
+    stmt = select(Meeting, rank.label('rank')).where(
+        match,
+        or_(Meeting.created_by == user_id, Meeting.id.in_(visible_meeting_ids(user_id)))
+    )
+    if cursor is not None:
+        stmt = stmt.where(tuple_(rank, Meeting.id) < tuple_(*cursor))
+    stmt = stmt.order_by(rank.desc(), Meeting.id.desc()).limit(limit)
+    return [(meeting, float(score)) for meeting, score in session.execute(stmt)]
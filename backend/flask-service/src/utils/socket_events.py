@@ -1,7 +1,9 @@
-from flask_socketio import emit, join_room, leave_room
+from flask import current_app
+from flask_socketio import SocketIO, emit, join_room, leave_room
 from functools import wraps
-import jwt
-import os
+
+# Bound to the app in create_app() when SOCKETIO_ENABLED is set
+socketio = SocketIO()
 
 def socket_auth_required(f):
     @wraps(f)
@@ -12,7 +14,7 @@ def socket_auth_required(f):
             return emit('error', {'message': 'Token is missing'})
             
         try:
-            token_data = jwt.decode(token, os.getenv('JWT_SECRET_KEY'), algorithms=['HS256'])
+            token_data = current_app.extensions['tokens'].decode_access(token)
             data['user_id'] = token_data['user_id']
         except:
             return emit('error', {'message': 'Invalid token'})
@@ -35,6 +37,9 @@ def register_socket_events(socketio):
     @socketio.on('leave')
     @socket_auth_required
     def handle_leave(data):
+        meeting_id = data.get('meeting_id')
+        if isinstance(meeting_id, int):
+            current_app.extensions['presence'].leave(data['user_id'], meeting_id)
         room = data.get('meeting_code')
         if room:
             leave_room(room)
@@ -42,6 +47,17 @@ def register_socket_events(socketio):
                 'user_id': data['user_id']
             }, room=room)
 
+    @socketio.on('heartbeat')
+    @socket_auth_required
+    def handle_heartbeat(data):
+        # Same as POST /api/meetings/<id>/presence, for clients that already
+        # hold a socket to this service
+        meeting_id = data.get('meeting_id')
+        if not isinstance(meeting_id, int):
+            return emit('error', {'message': 'meeting_id is required'})
+        if current_app.extensions['presence'].heartbeat(data['user_id'], meeting_id) is False:
+            emit('presence_expired', {'meeting_id': meeting_id})
+
     @socketio.on('offer')
     @socket_auth_required
     def handle_offer(data):
@@ -81,4 +97,17 @@ def register_socket_events(socketio):
                 'user_id': data['user_id'],
                 'message': data['message'],
                 'timestamp': data['timestamp']
-            }, room=room) 
\ No newline at end of file
+            }, room=room)
+
+    @socketio.on('telemetry')
+    @socket_auth_required
+    def handle_telemetry(data):
+        from ..routes.meetings import record_telemetry
+
+        meeting_id = data.get('meeting_id')
+        if not isinstance(meeting_id, int):
+            return emit('error', {'message': 'meeting_id is required'})
+        body, status = record_telemetry(data['user_id'], meeting_id, data.get('samples'))
+        if status >= 400:
+            return emit('error', {'message': body['error']})
+        emit('telemetry_ack', body)
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import delete, insert, literal, or_, select, union
+
+# Re-read this far behind the token so rows committed late with an earlier
+# updated_at are not missed; clients apply changes idempotently by id
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Participation statuses that take a meeting off the participant's list
+REVOKED_STATUSES = ('declined', 'banned')
+
+def encode_token(moment: datetime) -> str:
+    """Opaque sync token: epoch milliseconds of a naive UTC timestamp."""
+    return str(int(moment.replace(tzinfo=UTC).timestamp() * 1000))
+
+def parse_token(token: str) -> Optional[datetime]:
+    if not token.isdigit():
+        return None
+    try:
+        return datetime.fromtimestamp(int(token) / 1000, UTC).replace(tzinfo=None)
+    except (OverflowError, ValueError, OSError):
+        return None
+
+def _member_meeting_ids(user_id: int):
+    from ..models import MeetingParticipant, MeetingCoHost
+    return union(
+        select(MeetingParticipant.meeting_id).where(
+            MeetingParticipant.user_id == user_id,
+            MeetingParticipant.status.notin_(REVOKED_STATUSES)
+        ),
+        select(MeetingCoHost.meeting_id).where(MeetingCoHost.user_id == user_id)
+    )
+
+def visible_to(user_id: int):
+    """Filter for meetings on a user's list: created, co-hosted, or joined and not revoked."""
+    from ..models import Meeting
+    return or_(Meeting.created_by == user_id, Meeting.id.in_(_member_meeting_ids(user_id)))
+
+def changed_meeting_ids(user_id: int, since: datetime):
+    """
+    Ids of meetings on the user's list that changed after since.
+
+    A meeting changed if its own row was updated, or if the user's
+    participant or co-host row for it was (which is how a meeting appears
+    on a list). Each branch is served by a (user, timestamp) index.
+    """
+    from ..models import Meeting, MeetingParticipant, MeetingCoHost
+    return union(
+        select(Meeting.id).where(Meeting.created_by == user_id, Meeting.updated_at > since),
+        select(MeetingParticipant.meeting_id).join(Meeting, Meeting.id == MeetingParticipant.meeting_id).where(
+            MeetingParticipant.user_id == user_id,
+            MeetingParticipant.status.notin_(REVOKED_STATUSES),
+            or_(MeetingParticipant.updated_at > since, Meeting.updated_at > since)
+        ),
+        select(MeetingCoHost.meeting_id).join(Meeting, Meeting.id == MeetingCoHost.meeting_id).where(
+            MeetingCoHost.user_id == user_id,
+            or_(MeetingCoHost.created_at > since, Meeting.updated_at > since)
+        )
+    )
+
+def sync_meetings(session, user_id: int, since: Optional[datetime] = None, active_only: bool = True,
+                  retention: timedelta = timedelta(days=30)) -> Dict[str, Any]:
+    """
+    Meetings on a user's list that changed after since, plus tombstones.
+
+    Without since, or with one older than the tombstone retention, this is a
+    full snapshot (reset=True; active_only applies). Otherwise only changed
+    meetings are returned, ended ones included so clients can drop them,
+    with a tombstone for every meeting that left the list. A tombstone is
+    omitted if the meeting is back on the list.
+
+    Returns:
+        Dictionary with meetings, tombstones, reset and the next sync_token
+    """
+    from ..models import Meeting, MeetingTombstone
+
+    now = datetime.now(UTC).replace(tzinfo=None)
+    reset = since is None or since < now - retention
+    if reset:
+        stmt = select(Meeting).where(visible_to(user_id))
+        if active_only:
+            stmt = stmt.where(Meeting.ended_at.is_(None))
+        tombstones = []
+    else:
+        window = since - SYNC_OVERLAP
+        stmt = select(Meeting).where(Meeting.id.in_(changed_meeting_ids(user_id, window)))
+        tombstones = session.execute(
+            select(MeetingTombstone).where(
+                MeetingTombstone.user_id == user_id,
+                MeetingTombstone.created_at > window,
+                MeetingTombstone.meeting_id.notin_(select(Meeting.id).where(visible_to(user_id)))
+            ).order_by(MeetingTombstone.created_at, MeetingTombstone.id)
+        ).scalars().all()
+
+    meetings = session.execute(stmt.order_by(Meeting.updated_at, Meeting.id)).scalars().all()
+    # One tombstone per meeting, the latest
+    latest = {tombstone.meeting_id: tombstone for tombstone in tombstones}
+    return {
+        'meetings': [meeting.to_dict() for meeting in meetings],
+        'tombstones': [tombstone.to_dict() for tombstone in latest.values()],
+        'reset': reset,
+        'sync_token': encode_token(now)
+    }
+
+def record_tombstones(session, meeting_id: int, user_ids: Iterable[int], reason: str) -> None:
+    """Record that a meeting left these users' lists, in one INSERT. Does not commit."""
+    from ..models import MeetingTombstone
+    now = datetime.now(UTC).replace(tzinfo=None)
+    rows = [
+        {'meeting_id': meeting_id, 'user_id': user_id, 'reason': reason, 'created_at': now}
+        for user_id in sorted(set(user_ids))
+    ]
+    if rows:
+        session.execute(insert(MeetingTombstone), rows)
+
+def meeting_audience(meeting_id: int, managers_only: bool = False):
+    """
+    Ids of a meeting's host and co-hosts, plus every participant unless
+    managers_only, as one UNION select with a user_id column.
+    """
+    from ..models import Meeting, MeetingParticipant, MeetingCoHost
+    selects = [
+        select(Meeting.created_by.label('user_id')).where(Meeting.id == meeting_id),
+        select(MeetingCoHost.user_id).where(MeetingCoHost.meeting_id == meeting_id)
+    ]
+    if not managers_only:
+        selects.append(select(MeetingParticipant.user_id).where(MeetingParticipant.meeting_id == meeting_id))
+    return union(*selects)
+
+def meeting_audiences(meeting_ids: Iterable[int]):
+    """(meeting_id, user_id) of the host, co-hosts and participants of many meetings, as one UNION select."""
+    from ..models import Meeting, MeetingParticipant, MeetingCoHost
+    meeting_ids = list(meeting_ids)
+    return union(
+        select(Meeting.id.label('meeting_id'), Meeting.created_by.label('user_id')).where(Meeting.id.in_(meeting_ids)),
+        select(MeetingCoHost.meeting_id, MeetingCoHost.user_id).where(MeetingCoHost.meeting_id.in_(meeting_ids)),
+        select(MeetingParticipant.meeting_id, MeetingParticipant.user_id).where(
+            MeetingParticipant.meeting_id.in_(meeting_ids))
+    )
+
+def record_deletion_tombstones(session, meeting_id: int) -> None:
+    """
+    Tombstone a meeting for its host, co-hosts and participants with one
+    INSERT ... SELECT. Must run before the delete cascades. Does not commit.
+    """
+    from ..models import MeetingTombstone
+    now = datetime.now(UTC).replace(tzinfo=None)
+    audience = meeting_audience(meeting_id).subquery()
+    session.execute(insert(MeetingTombstone).from_select(
+        ['meeting_id', 'user_id', 'reason', 'created_at'],
+        select(literal(meeting_id), audience.c.user_id, literal('deleted'), literal(now))
+    ))
+
+def prune_tombstones(session, retention: timedelta) -> int:
+    """Delete tombstones older than the retention window. Returns the number deleted."""
+    from ..models import MeetingTombstone
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - retention
+    deleted = session.execute(delete(MeetingTombstone).where(MeetingTombstone.created_at < cutoff)).rowcount
+    session.commit()
+    return deleted
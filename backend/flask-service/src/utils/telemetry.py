@@ -0,0 +1,241 @@
+import json
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .periodic import PeriodicTask
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('rtt_ms', 'jitter_ms', 'packet_loss')
+
+def quality_score(rtt_ms: float, jitter_ms: float, packet_loss: float) -> float:
+    """
+    Heuristic 0-100 connection quality for one stats sample.
+
+    Round trips over 50 ms cost up to 40 points, jitter up to 20 and packet
+    loss (a 0-1 fraction) up to 60; 15% loss alone is a score of 40.
+    """
+    penalty = (
+        min(max(rtt_ms - 50.0, 0.0) / 10.0, 40.0)
+        + min(jitter_ms / 2.0, 20.0)
+        + min(packet_loss * 400.0, 60.0)
+    )
+    return max(100.0 - penalty, 0.0)
+
+def validate_samples(samples: Any, max_batch: int, max_skew: float, now: Optional[float] = None) -> Tuple[List[Dict[str, float]], int]:
+    """
+    Keep well-formed samples from a client batch.
+
+    A sample is {ts (epoch seconds), rtt_ms, jitter_ms, packet_loss}; missing
+    metrics count as 0. Samples with non-numeric or out-of-range values, or a
+    timestamp more than max_skew seconds from now, are dropped.
+
+    Returns:
+        (valid samples, number rejected)
+    """
+    if not isinstance(samples, list):
+        return [], 0
+    now = time.time() if now is None else now
+    valid = []
+    for sample in samples[:max_batch]:
+        if not isinstance(sample, dict):
+            continue
+        values = {'ts': sample.get('ts')}
+        values.update({metric: sample.get(metric, 0) for metric in METRICS})
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
+                   for v in values.values()):
+            continue
+        if abs(values['ts'] - now) > max_skew or values['rtt_ms'] < 0 or values['jitter_ms'] < 0:
+            continue
+        if not 0 <= values['packet_loss'] <= 1:
+            continue
+        valid.append(values)
+    return valid, len(samples) - len(valid)
+
+def downsample(samples: List[Dict[str, float]], interval: int) -> List[Dict[str, Any]]:
+    """
+    Fold samples into fixed-interval buckets of sums.
+
+    Each bucket is {b: bucket start (epoch seconds), n, q, rtt, jitter, loss}
+    where q and the metrics are sums over the n samples, so buckets from
+    different batches can be merged by adding them.
+    """
+    buckets: Dict[int, Dict[str, Any]] = {}
+    for sample in samples:
+        start = int(sample['ts'] // interval * interval)
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = {'b': start, 'n': 0, 'q': 0.0, 'rtt': 0.0, 'jitter': 0.0, 'loss': 0.0}
+        bucket['n'] += 1
+        bucket['q'] += quality_score(sample['rtt_ms'], sample['jitter_ms'], sample['packet_loss'])
+        bucket['rtt'] += sample['rtt_ms']
+        bucket['jitter'] += sample['jitter_ms']
+        bucket['loss'] += sample['packet_loss']
+    return [buckets[start] for start in sorted(buckets)]
+
+class TelemetryStore(RedisBackoff):
+    """
+    Redis-backed intake for client connection-quality stats.
+
+    Clients post batches of WebRTC stats samples. Each batch is downsampled
+    into TELEMETRY_BUCKET_SECONDS buckets and written in one pipeline:
+
+        telemetry:<meeting>:<user>        list of bucket partials, trimmed to
+                                          TELEMETRY_RING_SIZE (the ring buffer)
+        telemetry:<meeting>:totals        hash <user>:n / <user>:q running sums
+        telemetry:dirty                   set of "<meeting>:<user>" to flush
+
+    flush() pops dirty entries with SPOP (safe with several flushers), reads
+    their running sums and writes the averages into
+    meeting_participants.connection_quality with one executemany UPDATE.
+    Because the sums are cumulative, a flush that fails part way can simply
+    be repeated.
+
+    Flushing runs on a daemon thread every TELEMETRY_FLUSH_INTERVAL seconds
+    when TELEMETRY_FLUSH_BACKGROUND is set, or via `flask telemetry flush`.
+    """
+
+    REDIS_LABEL = 'Telemetry'
+
+    DIRTY_KEY = 'telemetry:dirty'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.app = None
+        self.redis = redis
+        self.interval = 10
+        self.ring_size = 360
+        self.ttl = 86400
+        self.max_batch = 200
+        self.max_skew = 600.0
+        self.flush_interval = 15.0
+        self.flush_background = False
+        self.flusher = PeriodicTask('telemetry-flusher', self.flush)
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.app = app
+        self.redis = redis
+        self.interval = int(app.config.get('TELEMETRY_BUCKET_SECONDS', 10))
+        self.ring_size = int(app.config.get('TELEMETRY_RING_SIZE', 360))
+        self.ttl = int(app.config.get('TELEMETRY_TTL', 86400))
+        self.max_batch = int(app.config.get('TELEMETRY_MAX_BATCH', 200))
+        self.max_skew = float(app.config.get('TELEMETRY_MAX_SKEW', 600))
+        self.flush_interval = float(app.config.get('TELEMETRY_FLUSH_INTERVAL', 15))
+        self.flusher.interval = self.flush_interval
+        self.flush_background = app.config.get('TELEMETRY_FLUSH_BACKGROUND', False)
+        self.init_backoff(app)
+        app.extensions['telemetry'] = self
+
+    @staticmethod
+    def ring_key(meeting_id, user_id) -> str:
+        return f'telemetry:{meeting_id}:{user_id}'
+
+    @staticmethod
+    def totals_key(meeting_id) -> str:
+        return f'telemetry:{meeting_id}:totals'
+
+    def ingest(self, meeting_id: int, user_id: int, samples: List[Dict[str, float]]) -> int:
+        """
+        Store validated samples for one participant in a single round trip.
+
+        Returns:
+            Number of samples stored (0 if Redis is unavailable)
+        """
+        if not samples or not self.available:
+            return 0
+        buckets = downsample(samples, self.interval)
+        ring_key = self.ring_key(meeting_id, user_id)
+        totals_key = self.totals_key(meeting_id)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.rpush(ring_key, *[json.dumps(bucket) for bucket in buckets])
+            pipe.ltrim(ring_key, -self.ring_size, -1)
+            pipe.expire(ring_key, self.ttl)
+            pipe.hincrby(totals_key, f'{user_id}:n', len(samples))
+            pipe.hincrbyfloat(totals_key, f'{user_id}:q', sum(bucket['q'] for bucket in buckets))
+            pipe.expire(totals_key, self.ttl)
+            pipe.sadd(self.DIRTY_KEY, f'{meeting_id}:{user_id}')
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+            return 0
+        if self.flush_background:
+            self.flusher.ensure_started(self.app)
+        return len(samples)
+
+    def series(self, meeting_id: int, user_id: int) -> List[Dict[str, Any]]:
+        """Return the participant's buckets, oldest first, with partials merged and averaged."""
+        raw = self.redis.lrange(self.ring_key(meeting_id, user_id), 0, -1)
+        merged: Dict[int, Dict[str, Any]] = {}
+        for item in raw:
+            bucket = json.loads(item)
+            current = merged.setdefault(bucket['b'], {'b': bucket['b'], 'n': 0, 'q': 0.0, 'rtt': 0.0, 'jitter': 0.0, 'loss': 0.0})
+            for field in ('n', 'q', 'rtt', 'jitter', 'loss'):
+                current[field] += bucket[field]
+        return [
+            {
+                'bucket_start': bucket['b'],
+                'samples': bucket['n'],
+                'quality': round(bucket['q'] / bucket['n'], 2),
+                'rtt_ms': round(bucket['rtt'] / bucket['n'], 2),
+                'jitter_ms': round(bucket['jitter'] / bucket['n'], 2),
+                'packet_loss': round(bucket['loss'] / bucket['n'], 4)
+            }
+            for _, bucket in sorted(merged.items())
+        ]
+
+    def flush(self, max_items: int = 5000) -> int:
+        """
+        Write running quality averages of dirty participants to the database.
+
+        Returns:
+            Number of participants processed
+        """
+        from sqlalchemy import bindparam, update
+        from ..models import db, MeetingParticipant
+
+        if not self.available:
+            return 0
+        try:
+            entries = self.redis.spop(self.DIRTY_KEY, max_items) or []
+            if not entries:
+                return 0
+            pairs = []
+            for entry in entries:
+                meeting_id, user_id = (entry.decode() if isinstance(entry, bytes) else entry).split(':')
+                pairs.append((int(meeting_id), int(user_id)))
+            pipe = self.redis.pipeline(transaction=False)
+            for meeting_id, user_id in pairs:
+                pipe.hmget(self.totals_key(meeting_id), f'{user_id}:n', f'{user_id}:q')
+            totals = pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+            return 0
+
+        params = [
+            {'m': meeting_id, 'u': user_id, 'quality': round(float(q) / int(n), 2)}
+            for (meeting_id, user_id), (n, q) in zip(pairs, totals)
+            if n and q is not None and int(n) > 0
+        ]
+        if params:
+            table = MeetingParticipant.__table__
+            stmt = update(table).where(
+                table.c.meeting_id == bindparam('m'),
+                table.c.user_id == bindparam('u')
+            ).values(connection_quality=bindparam('quality'))
+            try:
+                db.session.execute(stmt, params)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # Put the entries back so the next flush retries them
+                try:
+                    self.redis.sadd(self.DIRTY_KEY, *entries)
+                except Exception as e:
+                    self._redis_failed(e)
+                raise
+        return len(pairs)
@@ -0,0 +1,219 @@
+import hashlib
+import hmac
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional
+
+import jwt
+
+from .redis_store import RedisBackoff
+
+logger = logging.getLogger(__name__)
+
+class TokenRevoked(jwt.InvalidTokenError):
+    """The token was revoked (logout, refresh-token reuse or logout-all)."""
+
+class TokenService(RedisBackoff):
+    """
+    Short-lived access tokens, rotating refresh tokens and O(1) revocation.
+
+    Access tokens live JWT_ACCESS_MINUTES; refresh tokens live
+    JWT_REFRESH_DAYS and are signed with a key derived from JWT_SECRET_KEY,
+    so one can never be used as the other. Both carry a ``jti`` and the
+    ``fam`` (family) of the login they descend from.
+
+    Revocation state is a handful of Redis keys that expire with the tokens
+    they cover, checked with a single MGET and no database access:
+
+        revoked:jti:<jti>      one access token (logout)
+        revoked:fam:<fam>      every token of a login (logout, refresh reuse)
+        revoked:user:<id>      tokens issued before this epoch (logout-all)
+
+    Calendar feed tokens do not expire, so they cannot be covered by keys
+    that do. Each one carries the user's ``feed_generation`` instead, which
+    lives in the users table; logout-all bumps it and the feed route
+    compares it, so a revoked feed URL stays revoked with or without Redis.
+
+    Refreshing consumes the refresh token (SET refresh:used:<jti> NX). A
+    second use of the same refresh token means it leaked, so the whole
+    family is revoked.
+
+    If Redis is unavailable, access checks fail open (tokens expire within
+    JWT_ACCESS_MINUTES anyway) while refresh fails closed.
+    """
+
+    REDIS_LABEL = 'Token revocation'
+
+    def __init__(self, app=None, redis=None) -> None:
+        self.redis = redis
+        self.secret = None
+        self.refresh_secret = None
+        self.feed_secret = None
+        self.access_ttl = timedelta(minutes=15)
+        self.refresh_ttl = timedelta(days=7)
+        if app is not None:
+            self.init_app(app, redis)
+
+    def init_app(self, app, redis) -> None:
+        self.redis = redis
+        self.secret = app.config['JWT_SECRET_KEY']
+        self.refresh_secret = hmac.new(self.secret.encode(), b'refresh-token', hashlib.sha256).hexdigest()
+        self.feed_secret = hmac.new(self.secret.encode(), b'calendar-feed', hashlib.sha256).hexdigest()
+        self.access_ttl = timedelta(minutes=int(app.config.get('JWT_ACCESS_MINUTES', 15)))
+        self.refresh_ttl = timedelta(days=int(app.config.get('JWT_REFRESH_DAYS', 7)))
+        self.init_backoff(app)
+        app.extensions['tokens'] = self
+
+    # -- issuing ------------------------------------------------------------
+
+    def issue(self, user, family: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Mint an access/refresh pair for a user.
+
+        Args:
+            user: User model instance
+            family: Family id to continue (on refresh); a new login starts one
+
+        Returns:
+            Dictionary with token, refresh_token and expires_in (seconds)
+        """
+        now = datetime.now(UTC)
+        family = family or uuid.uuid4().hex
+        access = jwt.encode({
+            'user_id': user.id,
+            'email': user.email,
+            'exp': now + self.access_ttl,
+            'iat': now,
+            'jti': uuid.uuid4().hex,
+            'fam': family,
+            'type': 'access'
+        }, self.secret, algorithm='HS256')
+        refresh = jwt.encode({
+            'user_id': user.id,
+            'exp': now + self.refresh_ttl,
+            'iat': now,
+            'jti': uuid.uuid4().hex,
+            'fam': family,
+            'type': 'refresh'
+        }, self.refresh_secret, algorithm='HS256')
+        return {
+            'token': access,
+            'refresh_token': refresh,
+            'expires_in': int(self.access_ttl.total_seconds())
+        }
+
+    def issue_feed(self, user) -> str:
+        """
+        Mint a calendar feed token. It does not expire, so it can sit in a
+        subscription URL; logout-all bumps user.feed_generation, which
+        invalidates it.
+        """
+        return jwt.encode({
+            'user_id': user.id,
+            'iat': datetime.now(UTC),
+            'gen': user.feed_generation or 0,
+            'type': 'feed'
+        }, self.feed_secret, algorithm='HS256')
+
+    # -- verifying ----------------------------------------------------------
+
+    def decode_access(self, token: str) -> Dict[str, Any]:
+        """
+        Decode an access token and check revocation.
+
+        Raises:
+            jwt.ExpiredSignatureError, jwt.InvalidTokenError or TokenRevoked
+        """
+        claims = jwt.decode(token, self.secret, algorithms=['HS256'])
+        if claims.get('type', 'access') != 'access':
+            raise jwt.InvalidTokenError('Not an access token')
+        if self.is_revoked(claims):
+            raise TokenRevoked('Token has been revoked')
+        return claims
+
+    def decode_refresh(self, token: str) -> Dict[str, Any]:
+        claims = jwt.decode(token, self.refresh_secret, algorithms=['HS256'])
+        if claims.get('type') != 'refresh':
+            raise jwt.InvalidTokenError('Not a refresh token')
+        return claims
+
+    def decode_feed(self, token: str) -> Dict[str, Any]:
+        """Decode a feed token. The caller compares ``gen`` with the user's feed_generation."""
+        claims = jwt.decode(token, self.feed_secret, algorithms=['HS256'])
+        if claims.get('type') != 'feed':
+            raise jwt.InvalidTokenError('Not a feed token')
+        return claims
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        """One MGET over the token's jti, family and user cutoff. Fails open without Redis."""
+        if not self.available:
+            return False
+        try:
+            by_jti, by_family, cutoff = self.redis.mget(
+                f"revoked:jti:{claims.get('jti')}",
+                f"revoked:fam:{claims.get('fam')}",
+                f"revoked:user:{claims['user_id']}"
+            )
+        except Exception as e:
+            self._redis_failed(e)
+            return False
+        if (by_jti and claims.get('jti')) or (by_family and claims.get('fam')):
+            return True
+        return cutoff is not None and claims.get('iat', 0) < float(cutoff)
+
+    # -- rotating and revoking -----------------------------------------------
+
+    def consume_refresh(self, claims: Dict[str, Any]) -> Optional[bool]:
+        """
+        Mark a refresh token used.
+
+        Returns:
+            True if this is its first use, False if it was already used or
+            revoked (its family is then revoked), None if Redis is unavailable
+        """
+        if not self.available:
+            return None
+        ttl = max(int(claims['exp'] - time.time()), 1)
+        try:
+            if self.is_revoked(claims):
+                return False
+            if self.redis.set(f"refresh:used:{claims['jti']}", 1, nx=True, ex=ttl):
+                return True
+            # Reuse of a rotated refresh token: assume it leaked
+            self.redis.set(f"revoked:fam:{claims['fam']}", 1, ex=int(self.refresh_ttl.total_seconds()))
+            logger.warning(f"Refresh token reuse for user {claims['user_id']}; revoked family {claims['fam']}")
+            return False
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    def revoke(self, claims: Dict[str, Any]) -> bool:
+        """Revoke one access token and its login family (logout)."""
+        if not self.available:
+            return False
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if claims.get('jti'):
+                pipe.set(f"revoked:jti:{claims['jti']}", 1, ex=max(int(claims['exp'] - time.time()), 1))
+            if claims.get('fam'):
+                pipe.set(f"revoked:fam:{claims['fam']}", 1, ex=int(self.refresh_ttl.total_seconds()))
+            pipe.execute()
+            return True
+        except Exception as e:
+            self._redis_failed(e)
+            return False
+
+    def revoke_user(self, user_id: int) -> bool:
+        """Revoke every token issued to a user so far (logout everywhere)."""
+        if not self.available:
+            return False
+        try:
+            # iat has one-second resolution; tokens minted in this second are revoked too
+            self.redis.set(f'revoked:user:{user_id}', int(time.time()) + 1,
+                           ex=int(self.refresh_ttl.total_seconds()))
+            return True
+        except Exception as e:
+            self._redis_failed(e)
+            return False
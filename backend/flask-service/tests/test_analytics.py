@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+from src import create_app
+from src.config import TestConfig
+from src.jobs.analytics import run_analytics
+from src.models import db, User, Meeting, MeetingParticipant, MeetingAuditLog
+
+class TestParticipationAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        users = [User(email=f'analytics{i}@example.com', name=f'Analytics {i}', password='Analytics-pass1!')
+                 for i in range(4)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.users = users
+
+        self.start = datetime.now(UTC).replace(microsecond=0) - timedelta(hours=2)
+        meeting = Meeting(title='Review', description='', start_time=self.start,
+                          end_time=self.start + timedelta(hours=1), created_by=users[0].id)
+        db.session.add(meeting)
+        db.session.commit()
+        self.meeting_id = meeting.id
+
+        # Whole meeting, joined once, never closed
+        self.full = self.participant(users[1], joined=0, left=None)
+        # 30 minutes, two joins
+        self.half = self.participant(users[2], joined=30, left=None)
+        # Waiting room only
+        self.waiting = self.participant(users[3], joined=None, left=None)
+        self.join_event(users[1], 0)
+        self.join_event(users[2], 10)
+        self.join_event(users[2], 30)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def participant(self, user, joined, left):
+        participant = MeetingParticipant(meeting_id=self.meeting_id, user_id=user.id, status='approved')
+        participant.joined_at = self.start + timedelta(minutes=joined) if joined is not None else None
+        participant.left_at = self.start + timedelta(minutes=left) if left is not None else None
+        db.session.add(participant)
+        db.session.flush()
+        return participant.id
+
+    def join_event(self, user, minute):
+        log = MeetingAuditLog(meeting_id=self.meeting_id, user_id=user.id, action='joined', details={})
+        log.created_at = self.start + timedelta(minutes=minute)
+        db.session.add(log)
+
+    def run_job(self):
+        now = datetime.now(UTC)
+        return run_analytics(now - timedelta(days=1), now)
+
+    def test_time_scores_and_aggregates(self):
+        """Test time in meeting, engagement scores and meeting aggregates"""
+        summary = self.run_job()
+        self.assertEqual(summary['participations'], 3)
+        self.assertEqual(summary['closed'], 3)
+
+        db.session.expire_all()
+        full = db.session.get(MeetingParticipant, (self.full, self.meeting_id))
+        half = db.session.get(MeetingParticipant, (self.half, self.meeting_id))
+        waiting = db.session.get(MeetingParticipant, (self.waiting, self.meeting_id))
+        self.assertEqual(full.total_time, 3600)
+        self.assertEqual(half.total_time, 1800)
+        self.assertEqual(waiting.total_time, 0)
+        self.assertIsNotNone(full.left_at)
+
+        self.assertAlmostEqual(full.participation_score, 100.0, places=2)
+        # 0.6 * 0.5 attendance + 0.2 * (1 - 10/60) punctuality + 0.2 * 1/2 stability
+        self.assertAlmostEqual(half.participation_score, 56.67, places=2)
+        self.assertEqual(waiting.participation_score, 0.0)
+
+        meeting = summary['meetings'][0]
+        self.assertEqual(meeting['participants'], 3)
+        self.assertEqual(meeting['attended'], 2)
+        self.assertEqual(meeting['total_minutes'], 90.0)
+        self.assertEqual(meeting['peak_concurrency'], 2)
+
+    def test_rerun_is_idempotent(self):
+        """Test that a second run over the same window does not double count"""
+        self.run_job()
+        self.run_job()
+        db.session.expire_all()
+        self.assertEqual(db.session.get(MeetingParticipant, (self.full, self.meeting_id)).total_time, 3600)
+        self.assertEqual(db.session.get(MeetingParticipant, (self.half, self.meeting_id)).total_time, 1800)
+
+    def test_ended_meeting_keeps_accumulated_time(self):
+        """Test that time accumulated by end_meeting is kept, not recomputed"""
+        meeting = db.session.get(Meeting, self.meeting_id)
+        meeting.ended_at = self.start + timedelta(minutes=45)
+        MeetingParticipant.close_open_participations(self.meeting_id, meeting.ended_at)
+        db.session.commit()
+        self.run_job()
+        db.session.expire_all()
+        self.assertEqual(db.session.get(MeetingParticipant, (self.full, self.meeting_id)).total_time, 2700)
+        self.assertEqual(db.session.get(MeetingParticipant, (self.half, self.meeting_id)).total_time, 900)
+
+if __name__ == '__main__':
+    unittest.main()
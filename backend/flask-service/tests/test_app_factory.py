@@ -0,0 +1,84 @@
+import unittest
+from flask import json
+from src import create_app, redis_client
+from src.config import TestConfig
+from src.models import db
+
+class TestAppFactory(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_create_app_does_not_connect_to_redis(self):
+        """Test that an unreachable Redis does not fail app creation"""
+        class UnreachableRedisConfig(TestConfig):
+            REDIS_URL = 'redis://127.0.0.1:1/0'
+
+        app = create_app(UnreachableRedisConfig)
+        self.assertIsNotNone(app)
+        self.assertFalse(redis_client.is_connected)
+
+    def test_redis_backoff_is_one_setting(self):
+        """Test that every Redis-backed extension uses REDIS_BACKOFF_SECONDS"""
+        from src import (calendar_cache, login_tracker, meeting_acl, meeting_cache, meeting_events, presence,
+                         telemetry, tokens)
+
+        class BackoffConfig(TestConfig):
+            REDIS_BACKOFF_SECONDS = 1.5
+
+        create_app(BackoffConfig)
+        extensions = [calendar_cache, login_tracker, meeting_acl, meeting_cache, meeting_events, presence,
+                      telemetry, tokens]
+        self.assertEqual({extension.backoff for extension in extensions}, {1.5})
+        meeting_acl._redis_failed(ConnectionError('down'))
+        self.assertIsNotNone(meeting_acl.redis)
+        self.assertFalse(meeting_acl.available)
+
+    def test_missing_settings(self):
+        """Test that missing required settings are reported"""
+        with self.assertRaises(RuntimeError) as ctx:
+            create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'JWT_SECRET_KEY': None, 'REDIS_URL': None})
+        self.assertIn('JWT_SECRET_KEY', str(ctx.exception))
+        self.assertIn('REDIS_URL', str(ctx.exception))
+
+    def test_health(self):
+        """Test liveness and database health endpoints"""
+        from src import health_prober
+        health_prober.probe_once()
+        self.assertEqual(self.client.get('/health').status_code, 200)
+        self.assertEqual(self.client.get('/health/db').status_code, 200)
+
+    def test_register_and_login(self):
+        """Test that auth routes sign tokens with the app's configured key"""
+        response = self.client.post('/api/auth/register', json={
+            'email': 'factory@example.com',
+            'password': 'Factory-test1!',
+            'name': 'Factory User'
+        })
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/auth/login', json={
+            'email': 'factory@example.com',
+            'password': 'Factory-test1!'
+        })
+        self.assertEqual(response.status_code, 200)
+        token = json.loads(response.data)['token']
+
+        response = self.client.post('/api/auth/verify-token', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_reset_connections(self):
+        """Test that post-fork reset drops pooled connections"""
+        from src import reset_connections
+        reset_connections(self.app)
+        self.assertFalse(redis_client.is_connected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import csv
+import io
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from src import create_app, meeting_acl, meeting_cache, meeting_events, meeting_sweeper, tokens
+from src.config import TestConfig
+from src.models import (db, User, Meeting, MeetingParticipant, MeetingCoHost, MeetingAuditLog, MeetingTombstone,
+                        ArchivedMeeting, ArchivedMeetingParticipant, ArchivedMeetingCoHost, ArchivedMeetingAuditLog)
+from src.utils.sync import encode_token
+
+class TestMeetingArchive(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+        meeting_sweeper.redis = None
+        tokens.redis = None
+
+        users = [User(email=f'archive{i}@example.com', name=f'Archive {i}', password='Archive-pass1!') for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.co_host_id, self.guest_id = (user.id for user in users)
+
+        self.now = datetime.now(UTC).replace(tzinfo=None)
+        self.old_id = self.meeting(ended_days_ago=120)
+        self.recent_id = self.meeting(ended_days_ago=5)
+        self.active_id = self.meeting(ended_days_ago=None)
+        db.session.add_all([
+            MeetingCoHost(meeting_id=self.old_id, user_id=self.co_host_id),
+            MeetingParticipant(meeting_id=self.old_id, user_id=self.guest_id, status='approved'),
+            MeetingParticipant(meeting_id=self.recent_id, user_id=self.guest_id, status='approved'),
+            MeetingAuditLog(meeting_id=self.old_id, user_id=self.host_id, action='ended')
+        ])
+        db.session.commit()
+        self.synced_at = encode_token(datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=10))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def meeting(self, ended_days_ago, parent_id=None):
+        end_time = self.now - timedelta(days=ended_days_ago or 0)
+        meeting = Meeting(title='Archive', description='', start_time=end_time - timedelta(hours=1),
+                          end_time=end_time if ended_days_ago else end_time + timedelta(hours=2),
+                          created_by=self.host_id)
+        meeting.ended_at = end_time if ended_days_ago else None
+        meeting.parent_meeting_id = parent_id
+        db.session.add(meeting)
+        db.session.commit()
+        return meeting.id
+
+    def auth(self, user_id):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_long_ended_meetings_move_with_their_rows(self):
+        self.assertEqual(meeting_sweeper.archive(), 1)
+        db.session.expire_all()
+
+        self.assertIsNone(db.session.get(Meeting, self.old_id))
+        self.assertEqual(MeetingParticipant.query.filter_by(meeting_id=self.old_id).count(), 0)
+        self.assertEqual(MeetingCoHost.query.filter_by(meeting_id=self.old_id).count(), 0)
+        self.assertEqual(MeetingAuditLog.query.filter_by(meeting_id=self.old_id).count(), 0)
+
+        archived = db.session.get(ArchivedMeeting, self.old_id)
+        self.assertEqual((archived.created_by, archived.title), (self.host_id, 'Archive'))
+        self.assertIsNotNone(archived.archived_at)
+        self.assertEqual(ArchivedMeetingParticipant.query.filter_by(meeting_id=self.old_id).one().user_id, self.guest_id)
+        self.assertEqual(ArchivedMeetingCoHost.query.filter_by(meeting_id=self.old_id).one().user_id, self.co_host_id)
+        self.assertEqual(ArchivedMeetingAuditLog.query.filter_by(meeting_id=self.old_id).count(), 1)
+
+        # Recent and active meetings stay hot
+        self.assertIsNotNone(db.session.get(Meeting, self.recent_id))
+        self.assertIsNotNone(db.session.get(Meeting, self.active_id))
+        self.assertEqual(meeting_sweeper.archive(), 0)
+
+    def test_series_parents_wait_for_their_children(self):
+        child_id = self.meeting(ended_days_ago=1, parent_id=self.old_id)
+        self.assertEqual(meeting_sweeper.archive(), 0)
+        Meeting.query.filter_by(id=child_id).update({'ended_at': self.now - timedelta(days=100)})
+        db.session.commit()
+        # The child goes first, the parent on the next pass
+        self.assertEqual(meeting_sweeper.archive(), 1)
+        self.assertEqual(meeting_sweeper.archive(), 1)
+        self.assertEqual(ArchivedMeeting.query.count(), 2)
+
+    def test_direct_reads_fall_back_to_the_archive(self):
+        meeting_sweeper.archive()
+
+        response = self.client.get(f'/api/meetings/{self.old_id}', headers=self.auth(self.co_host_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()['archived'])
+        self.assertEqual(self.client.get(f'/api/meetings/{self.old_id}', headers=self.auth(self.guest_id)).status_code, 200)
+
+        export = self.client.get(f'/api/meetings/{self.old_id}/export/attendance', headers=self.auth(self.co_host_id))
+        self.assertEqual(export.status_code, 200)
+        rows = list(csv.DictReader(io.StringIO(export.get_data(as_text=True))))
+        self.assertEqual([row['user_id'] for row in rows], [str(self.guest_id)])
+
+        # Only reads see archived meetings
+        self.assertEqual(self.client.delete(f'/api/meetings/{self.old_id}', headers=self.auth(self.host_id)).status_code, 404)
+        self.assertEqual(self.client.get(f'/api/meetings/{self.old_id}/waiting-room',
+                                         headers=self.auth(self.host_id)).status_code, 404)
+
+    def test_archived_meetings_leave_synced_lists(self):
+        meeting_sweeper.archive()
+        self.assertEqual(MeetingTombstone.query.filter_by(meeting_id=self.old_id, reason='archived').count(), 3)
+
+        response = self.client.get(f'/api/meetings/sync?since={self.synced_at}&active_only=false',
+                                   headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t['meeting_id'] for t in response.get_json()['tombstones']], [self.old_id])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from benchmarks.stats import compare, percentile, summarize
+
+class TestBenchmarkStats(unittest.TestCase):
+    def test_percentile_interpolates(self):
+        """Test linear interpolation between samples"""
+        samples = [10.0, 20.0, 30.0, 40.0]
+        self.assertEqual(percentile(samples, 0), 10.0)
+        self.assertEqual(percentile(samples, 100), 40.0)
+        self.assertAlmostEqual(percentile(samples, 50), 25.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize(self):
+        """Test summary fields and throughput"""
+        summary = summarize([5.0, 1.0, 3.0], errors=1, elapsed_s=2.0)
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['throughput'], 1.5)
+        self.assertEqual(summary['p50_ms'], 3.0)
+        self.assertEqual(summary['max_ms'], 5.0)
+
+    def test_compare_flags_regressions(self):
+        """Test latency and throughput regressions against a baseline"""
+        baseline = {
+            'list': {'p95_ms': 10.0, 'throughput': 100.0},
+            'join': {'p95_ms': 10.0, 'throughput': 100.0},
+            'login': {'p95_ms': 10.0, 'throughput': 100.0}
+        }
+        current = {
+            'list': {'p95_ms': 10.5, 'throughput': 98.0},
+            'join': {'p95_ms': 13.0, 'throughput': 100.0},
+            'login': {'p95_ms': 10.0, 'throughput': 70.0},
+            'create': {'p95_ms': 50.0, 'throughput': 5.0}
+        }
+        rows = {r['name']: r for r in compare(current, baseline, tolerance=0.15)}
+        self.assertFalse(rows['list']['regressed'])
+        self.assertTrue(rows['join']['regressed'])
+        self.assertTrue(rows['login']['regressed'])
+        self.assertEqual(rows['create']['status'], 'new')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+from unittest import mock
+from urllib.parse import urlparse
+import jwt
+import redis
+from src import create_app, calendar_cache, meeting_acl, meeting_cache, meeting_events, tokens
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant
+from src.utils.ical import expand_occurrences, fold_line, escape_text
+
+def redis_available():
+    try:
+        return redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class TestRecurrence(unittest.TestCase):
+    def test_daily_expansion_starts_at_window(self):
+        start = datetime(2024, 1, 1, 9, 0)
+        occurrences = list(expand_occurrences(start, start + timedelta(hours=1), 'daily',
+                                              datetime(2024, 3, 1), datetime(2024, 3, 4)))
+        self.assertEqual([s.day for s, _ in occurrences], [1, 2, 3])
+        self.assertEqual(occurrences[0][1] - occurrences[0][0], timedelta(hours=1))
+
+    def test_weekly_until_and_cap(self):
+        start = datetime(2024, 1, 1, 9, 0)
+        end = start + timedelta(minutes=30)
+        until = list(expand_occurrences(start, end, 'weekly', start, datetime(2025, 1, 1), until=datetime(2024, 1, 20)))
+        self.assertEqual([s.day for s, _ in until], [1, 8, 15])
+        capped = list(expand_occurrences(start, end, 'weekly', start, datetime(2030, 1, 1), max_occurrences=5))
+        self.assertEqual(len(capped), 5)
+
+    def test_monthly_skips_short_months(self):
+        start = datetime(2024, 1, 31, 9, 0)
+        occurrences = list(expand_occurrences(start, start + timedelta(hours=1), 'monthly',
+                                              start, datetime(2024, 6, 1)))
+        self.assertEqual([s.month for s, _ in occurrences], [1, 3, 5])
+
+    def test_non_recurring(self):
+        start = datetime(2024, 1, 1, 9, 0)
+        self.assertEqual(len(list(expand_occurrences(start, start + timedelta(hours=1), None,
+                                                     datetime(2024, 1, 1), datetime(2024, 1, 2)))), 1)
+        self.assertEqual(list(expand_occurrences(start, start + timedelta(hours=1), 'custom',
+                                                 datetime(2024, 2, 1), datetime(2024, 2, 2))), [])
+
+    def test_text_escaping_and_folding(self):
+        self.assertEqual(escape_text('a,b;c\\d\ne'), 'a\\,b\\;c\\\\d\\ne')
+        folded = fold_line('SUMMARY:' + 'é' * 60)
+        self.assertTrue(all(len(part.encode()) <= 75 for part in folded.split('\r\n')))
+        self.assertEqual(folded.replace('\r\n ', ''), 'SUMMARY:' + 'é' * 60)
+
+class TestCalendarFeed(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+        calendar_cache.redis = None
+        tokens.redis = None
+
+        host = User(email='ical-host@example.com', name='Ical Host', password='Ical-pass1!')
+        guest = User(email='ical-guest@example.com', name='Ical Guest', password='Ical-pass1!')
+        db.session.add_all([host, guest])
+        db.session.commit()
+        self.host_id, self.guest_id = host.id, guest.id
+
+        start = datetime.now(UTC).replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.standup = Meeting(title='Standup, daily', description='Yesterday; today', start_time=start,
+                               end_time=start + timedelta(minutes=15), created_by=self.host_id,
+                               meeting_type='recurring')
+        self.standup.recurring_pattern = 'daily'
+        self.review = Meeting(title='Review', description='', start_time=start + timedelta(hours=3),
+                              end_time=start + timedelta(hours=4), created_by=self.host_id)
+        db.session.add_all([self.standup, self.review])
+        db.session.commit()
+        # A rescheduled occurrence, stored as a child of the series
+        self.moved = Meeting(title='Standup (moved)', description='', start_time=start + timedelta(days=2, hours=2),
+                             end_time=start + timedelta(days=2, hours=2, minutes=15), created_by=self.host_id)
+        self.moved.parent_meeting_id = self.standup.id
+        db.session.add(self.moved)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def feed_path(self, user_id):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        response = self.client.get('/api/calendar/feed-url', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        url = urlparse(response.get_json()['url'])
+        return f'{url.path}?{url.query}'
+
+    def test_feed_expands_recurring_meetings(self):
+        response = self.client.get(self.feed_path(self.host_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/calendar')
+        body = response.get_data(as_text=True)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn('SUMMARY:Standup\\, daily', body)
+        self.assertIn('DESCRIPTION:Yesterday\\; today', body)
+        # 180 future days of standups minus the moved one, plus review and the moved standup
+        standups = body.count(f'UID:meeting-{self.standup.id}-')
+        self.assertGreaterEqual(standups, 170)
+        moved_day = self.moved.start_time.strftime('%Y%m%d')
+        self.assertNotIn(f'UID:meeting-{self.standup.id}-{moved_day}@', body)
+        self.assertIn(f'UID:meeting-{self.moved.id}@', body)
+        self.assertEqual(body.count('BEGIN:VEVENT'), standups + 2)
+
+    def test_conditional_get_and_invalidation(self):
+        path = self.feed_path(self.guest_id)
+        first = self.client.get(path)
+        etag = first.headers['ETag']
+        self.assertNotIn('BEGIN:VEVENT', first.get_data(as_text=True))
+
+        unchanged = self.client.get(path, headers={'If-None-Match': etag})
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.get_data(), b'')
+
+        # Joining a meeting changes the guest's feed; other users' changes do not
+        db.session.add(MeetingParticipant(meeting_id=self.review.id, user_id=self.guest_id, status='approved'))
+        db.session.commit()
+        changed = self.client.get(path, headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertIn(f'UID:meeting-{self.review.id}@', changed.get_data(as_text=True))
+
+        guest_etag = changed.headers['ETag']
+        host_path = self.feed_path(self.host_id)
+        host_etag = self.client.get(host_path).headers['ETag']
+        self.standup.title = 'Standup renamed'
+        db.session.commit()
+        self.assertEqual(self.client.get(path, headers={'If-None-Match': guest_etag}).status_code, 304)
+        self.assertEqual(self.client.get(host_path, headers={'If-None-Match': host_etag}).status_code, 200)
+
+    def test_cached_body_is_served_without_rendering(self):
+        path = self.feed_path(self.host_id)
+        with mock.patch.object(calendar_cache, 'get', return_value='BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n'), \
+             mock.patch('src.routes.calendar.render_calendar') as render:
+            response = self.client.get(path)
+        render.assert_not_called()
+        self.assertEqual(response.get_data(as_text=True), 'BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n')
+
+    def test_invalid_token(self):
+        self.assertEqual(self.client.get('/api/calendar/feed.ics?token=nope').status_code, 401)
+        # An access token is not a feed token
+        access = jwt.encode({'user_id': self.host_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                            TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        self.assertEqual(self.client.get(f'/api/calendar/feed.ics?token={access}').status_code, 401)
+
+    def test_logout_all_revokes_feed_urls_for_good(self):
+        path = self.feed_path(self.host_id)
+        self.assertEqual(self.client.get(path).status_code, 200)
+        access = jwt.encode({'user_id': self.host_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                            TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        with mock.patch.object(tokens, 'revoke_user', return_value=True):
+            response = self.client.post('/api/auth/logout-all', headers={'Authorization': f'Bearer {access}'})
+        self.assertEqual(response.status_code, 200)
+
+        # Revoked without Redis and without an expiry; a new URL works
+        self.assertIsNone(tokens.redis)
+        self.assertEqual(self.client.get(path).status_code, 401)
+        self.assertEqual(self.client.get(self.feed_path(self.host_id)).status_code, 200)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_redis_cache_round_trip(self):
+        calendar_cache.redis = redis.from_url(TestConfig.REDIS_URL)
+        calendar_cache.redis.delete(calendar_cache.key(self.host_id))
+        calendar_cache.set(self.host_id, 'etag-1', 'body-1')
+        self.assertEqual(calendar_cache.get(self.host_id, 'etag-1'), 'body-1')
+        self.assertIsNone(calendar_cache.get(self.host_id, 'etag-2'))
+        calendar_cache.redis.delete(calendar_cache.key(self.host_id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta, UTC
+import jwt
+from flask import json
+from src import create_app, meeting_acl, meeting_cache
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingCoHost, MeetingAuditLog
+
+class TestCoHosts(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+
+        self.users = []
+        for i in range(4):
+            user = User(email=f'cohost{i}@example.com', name=f'Co Host {i}', password='Cohost-pass1!')
+            db.session.add(user)
+            self.users.append(user)
+        db.session.commit()
+        self.host_id = self.users[0].id
+
+        now = datetime.now(UTC)
+        meeting = Meeting(title='Co-hosts', description='', start_time=now,
+                          end_time=now + timedelta(hours=1), created_by=self.host_id)
+        db.session.add(meeting)
+        db.session.commit()
+        self.meeting_id = meeting.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def headers(self, user_id):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return {'Authorization': f'Bearer {token}'}
+
+    def co_host_ids(self):
+        return sorted(c.user_id for c in MeetingCoHost.query.filter_by(meeting_id=self.meeting_id))
+
+    def test_bulk_add_skips_existing(self):
+        """Test that bulk add inserts new co-hosts and reports existing ones"""
+        ids = [u.id for u in self.users[1:]]
+        db.session.add(MeetingCoHost(meeting_id=self.meeting_id, user_id=ids[0]))
+        db.session.commit()
+
+        response = self.client.post(f'/api/meetings/{self.meeting_id}/co-hosts/bulk',
+                                    json={'user_ids': ids + [ids[1], self.host_id]},
+                                    headers=self.headers(self.host_id))
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['added'], ids[1:])
+        self.assertEqual(data['already_co_hosts'], [ids[0]])
+        self.assertEqual(self.co_host_ids(), ids)
+
+        logs = MeetingAuditLog.query.filter_by(meeting_id=self.meeting_id, action='added_co_hosts').all()
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0].details['co_host_ids'], ids[1:])
+
+    def test_bulk_add_without_on_conflict(self):
+        """Test the portable insert_ignore fallback for dialects without ON CONFLICT"""
+        ids = [u.id for u in self.users[1:]]
+        db.session.add(MeetingCoHost(meeting_id=self.meeting_id, user_id=ids[0]))
+        db.session.commit()
+
+        dialect = db.engine.dialect
+        with mock.patch.object(dialect, 'name', 'generic'), mock.patch.object(dialect, 'insert_returning', False):
+            response = self.client.post(f'/api/meetings/{self.meeting_id}/co-hosts/bulk',
+                                        json={'user_ids': ids + [ids[1]]},
+                                        headers=self.headers(self.host_id))
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['added'], ids[1:])
+        self.assertEqual(data['already_co_hosts'], [ids[0]])
+        self.assertEqual(self.co_host_ids(), ids)
+
+    def test_bulk_add_missing_users(self):
+        """Test that unknown users reject the whole batch"""
+        response = self.client.post(f'/api/meetings/{self.meeting_id}/co-hosts/bulk',
+                                    json={'user_ids': [self.users[1].id, 9999]},
+                                    headers=self.headers(self.host_id))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.data)['missing_user_ids'], [9999])
+        self.assertEqual(self.co_host_ids(), [])
+
+    def test_bulk_add_validation(self):
+        """Test that malformed ids and non-hosts are rejected"""
+        url = f'/api/meetings/{self.meeting_id}/co-hosts/bulk'
+        response = self.client.post(url, json={'user_ids': ['1']}, headers=self.headers(self.host_id))
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, json={'user_ids': [self.users[2].id]},
+                                    headers=self.headers(self.users[1].id))
+        self.assertEqual(response.status_code, 403)
+
+    def test_single_add_duplicate(self):
+        """Test that adding the same co-host twice fails the second time"""
+        url = f'/api/meetings/{self.meeting_id}/co-hosts'
+        response = self.client.post(url, json={'user_id': self.users[1].id}, headers=self.headers(self.host_id))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(url, json={'user_id': self.users[1].id}, headers=self.headers(self.host_id))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.co_host_ids(), [self.users[1].id])
+
+    def test_create_meeting_with_co_hosts(self):
+        """Test that create_meeting inserts co-hosts with the new meeting's id"""
+        start = datetime.now(UTC) + timedelta(days=1)
+        response = self.client.post('/api/meetings/create', json={
+            'title': 'Planning',
+            'description': 'Weekly planning',
+            'start_time': start.isoformat(),
+            'end_time': (start + timedelta(hours=1)).isoformat(),
+            'co_hosts': [self.users[1].id, self.users[2].id, self.users[1].id]
+        }, headers=self.headers(self.host_id))
+        self.assertEqual(response.status_code, 201, response.data)
+        meeting_id = json.loads(response.data)['id']
+        co_hosts = MeetingCoHost.query.filter_by(meeting_id=meeting_id).all()
+        self.assertEqual(sorted(c.user_id for c in co_hosts), [self.users[1].id, self.users[2].id])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+from unittest import mock
+import jwt
+from flask import json
+from sqlalchemy import event
+from src import create_app, meeting_acl, meeting_cache, meeting_events
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant
+
+class TestEndMeeting(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+
+        users = [User(email=f'end{i}@example.com', name=f'End {i}', password='End-pass1!') for i in range(4)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id = users[0].id
+
+        now = datetime.now(UTC)
+        meeting = Meeting(title='Standup', description='', start_time=now - timedelta(minutes=30),
+                          end_time=now + timedelta(minutes=30), created_by=self.host_id)
+        db.session.add(meeting)
+        db.session.commit()
+        self.meeting_id = meeting.id
+
+        # In the meeting for 10 minutes, with 60 seconds from an earlier visit
+        present = MeetingParticipant(meeting_id=self.meeting_id, user_id=users[1].id, status='approved')
+        present.joined_at = now - timedelta(minutes=10)
+        present.total_time = 60
+        # Still in the waiting room
+        waiting = MeetingParticipant(meeting_id=self.meeting_id, user_id=users[2].id)
+        # Already left
+        left = MeetingParticipant(meeting_id=self.meeting_id, user_id=users[3].id, status='approved')
+        left.joined_at = now - timedelta(minutes=20)
+        left.left_at = now - timedelta(minutes=15)
+        left.total_time = 300
+        db.session.add_all([present, waiting, left])
+        db.session.commit()
+        self.present_id, self.waiting_id, self.left_id = present.id, waiting.id, left.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def end(self):
+        token = jwt.encode({'user_id': self.host_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return self.client.post(f'/api/meetings/{self.meeting_id}/end',
+                                headers={'Authorization': f'Bearer {token}'})
+
+    def test_end_closes_open_participations(self):
+        """Test that ending a meeting sets left_at and accumulates total_time"""
+        with mock.patch.object(meeting_events, 'publish') as publish:
+            response = self.end()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['closed_participations'], 2)
+        publish.assert_called_once()
+        self.assertEqual(publish.call_args[0][1], 'meeting_ended')
+
+        db.session.expire_all()
+        present = db.session.get(MeetingParticipant, (self.present_id, self.meeting_id))
+        waiting = db.session.get(MeetingParticipant, (self.waiting_id, self.meeting_id))
+        left = db.session.get(MeetingParticipant, (self.left_id, self.meeting_id))
+        self.assertIsNotNone(present.left_at)
+        self.assertAlmostEqual(present.total_time, 660, delta=2)
+        self.assertIsNotNone(waiting.left_at)
+        self.assertIsNone(waiting.total_time)
+        self.assertEqual(left.total_time, 300)
+        self.assertEqual(MeetingParticipant.query.filter_by(meeting_id=self.meeting_id, left_at=None).count(), 0)
+
+        self.assertEqual(self.end().status_code, 400)
+
+    def test_end_is_one_participant_update(self):
+        """Test that participations are closed with a single UPDATE"""
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            self.end()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        updates = [s for s in statements if s.lstrip().upper().startswith('UPDATE MEETING_PARTICIPANTS')]
+        self.assertEqual(len(updates), 1)
+
+if __name__ == '__main__':
+    unittest.main()
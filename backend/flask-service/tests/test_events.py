@@ -0,0 +1,229 @@
+import queue
+import time
+import unittest
+from datetime import datetime, timedelta, UTC
+from unittest import mock
+import jwt
+import redis
+from src import create_app, event_hub, meeting_acl, meeting_cache, meeting_events
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingCoHost
+from src.routes.events import format_event
+from src.utils.events import EventHub, MeetingEvents, Subscription, parse_event_id
+
+def redis_available():
+    try:
+        return redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class FakePubSub:
+    """Just enough of redis-py's PubSub for EventHub: confirmations and messages."""
+
+    def __init__(self):
+        self.channels = set()
+        self.inbox = queue.Queue()
+
+    @property
+    def subscribed(self):
+        return bool(self.channels)
+
+    def subscribe(self, channel):
+        self.channels.add(channel)
+        self.inbox.put({'type': 'subscribe', 'channel': channel.encode(), 'data': 1})
+
+    def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    def get_message(self, timeout):
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+class TestEventHub(unittest.TestCase):
+    def setUp(self):
+        self.pubsub = FakePubSub()
+        self.hub = EventHub(redis=mock.Mock(pubsub=lambda: self.pubsub))
+        self.hub.queue_size = 2
+
+    def deliver(self, channel, data):
+        self.pubsub.inbox.put({'type': 'message', 'channel': channel.encode(), 'data': data.encode()})
+
+    def test_subscribers_share_a_channel(self):
+        first = self.hub.subscribe('user:1:events')
+        second = self.hub.subscribe('user:1:events')
+        self.assertEqual(self.pubsub.channels, {'user:1:events'})
+        self.deliver('user:1:events', '1-0 {}')
+        self.assertEqual(first.get(timeout=1), '1-0 {}')
+        self.assertEqual(second.get(timeout=1), '1-0 {}')
+
+        self.hub.unsubscribe(first)
+        self.hub.unsubscribe(second)
+        deadline = time.monotonic() + 1
+        while self.pubsub.channels and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.pubsub.channels, set())
+
+    def test_slow_subscriber_is_closed(self):
+        subscription = self.hub.subscribe('user:2:events')
+        for i in range(3):
+            self.deliver('user:2:events', f'{i}-0 {{}}')
+        deadline = time.monotonic() + 1
+        while not subscription.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual([subscription.get(timeout=0.1) for _ in range(2)], ['0-0 {}', '1-0 {}'])
+        with self.assertRaises(EOFError):
+            subscription.get(timeout=0.05)
+
+    def test_event_ids_and_format(self):
+        self.assertLess(parse_event_id('1700000000000-1'), parse_event_id('1700000000001-0'))
+        self.assertIsNone(parse_event_id('abc'))
+        self.assertIsNone(parse_event_id('1700000000000'))
+        self.assertEqual(format_event('5-0', '{"a":1}'), 'id: 5-0\ndata: {"a":1}\n\n')
+
+class TestMeetingEventFanOut(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+
+        users = [User(email=f'events{i}@example.com', name=f'Events {i}', password='Events-pass1!') for i in range(4)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.co_host_id, self.guest_id, self.waiting_id = (user.id for user in users)
+
+        now = datetime.now(UTC)
+        meeting = Meeting(title='Events', description='', start_time=now - timedelta(minutes=5),
+                          end_time=now + timedelta(hours=1), created_by=self.host_id, requires_approval=True)
+        db.session.add(meeting)
+        db.session.commit()
+        self.meeting_id = meeting.id
+        db.session.add(MeetingCoHost(meeting_id=self.meeting_id, user_id=self.co_host_id))
+        db.session.add(MeetingParticipant(meeting_id=self.meeting_id, user_id=self.guest_id, status='approved'))
+        waiting = MeetingParticipant(meeting_id=self.meeting_id, user_id=self.waiting_id)
+        db.session.add(waiting)
+        db.session.commit()
+        self.waiting_participant_id = waiting.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def token(self, user_id, minutes=60):
+        return jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(minutes=minutes)},
+                          TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+
+    def auth(self, user_id):
+        return {'Authorization': f'Bearer {self.token(user_id)}'}
+
+    def published(self, method, path):
+        # A truthy redis makes the routes resolve audiences; publish itself is mocked
+        with mock.patch.object(meeting_events, 'redis', mock.Mock()), \
+             mock.patch.object(meeting_events, 'publish') as publish:
+            response = getattr(self.client, method)(path, headers=self.auth(self.host_id))
+        self.assertEqual(response.status_code, 200)
+        publish.assert_called_once()
+        return publish.call_args[0]
+
+    def test_roster_events_go_to_managers_and_the_participant(self):
+        _, event, data, user_ids = self.published(
+            'post', f'/api/meetings/{self.meeting_id}/participants/{self.waiting_participant_id}/approve')
+        self.assertEqual(event, 'roster_delta')
+        self.assertEqual(data['approved'][0]['user_id'], self.waiting_id)
+        self.assertEqual(user_ids, {self.host_id, self.co_host_id, self.waiting_id})
+
+    def test_meeting_events_go_to_everyone(self):
+        _, event, _, user_ids = self.published('post', f'/api/meetings/{self.meeting_id}/end')
+        self.assertEqual(event, 'meeting_ended')
+        self.assertEqual(user_ids, {self.host_id, self.co_host_id, self.guest_id, self.waiting_id})
+
+    def test_deleted_meeting_reaches_its_former_audience(self):
+        _, event, _, user_ids = self.published('delete', f'/api/meetings/{self.meeting_id}')
+        self.assertEqual(event, 'meeting_deleted')
+        self.assertEqual(set(user_ids), {self.host_id, self.co_host_id, self.guest_id, self.waiting_id})
+
+    def test_removed_co_host_is_notified(self):
+        _, event, data, user_ids = self.published(
+            'delete', f'/api/meetings/{self.meeting_id}/co-hosts/{self.co_host_id}')
+        self.assertEqual((event, data), ('co_hosts_changed', {'removed': [self.co_host_id]}))
+        self.assertIn(self.co_host_id, user_ids)
+
+    def test_stream_rejects_bad_requests(self):
+        self.assertEqual(self.client.get('/api/events/stream?token=nope').status_code, 401)
+        self.assertEqual(self.client.get('/api/events/stream', headers={
+            **self.auth(self.guest_id), 'Last-Event-ID': 'yesterday'}).status_code, 400)
+        # No Redis: clients fall back to /api/meetings/sync
+        self.assertEqual(self.client.get(f'/api/events/stream?token={self.token(self.guest_id)}').status_code, 503)
+
+    def test_open_streams_are_capped(self):
+        url = f'/api/events/stream?token={self.token(self.guest_id)}'
+        with mock.patch.object(meeting_events, 'redis', mock.Mock()), \
+             mock.patch.object(event_hub, 'redis', mock.Mock()), \
+             mock.patch.object(event_hub, 'max_streams', 2), \
+             mock.patch.object(event_hub, 'subscribe', return_value=Subscription('test', 4)), \
+             mock.patch.object(event_hub, 'unsubscribe'):
+            streams = [self.client.get(url) for _ in range(2)]
+            self.assertEqual([s.status_code for s in streams], [200, 200])
+            full = self.client.get(url)
+            self.assertEqual(full.status_code, 503)
+            self.assertEqual(full.headers['Retry-After'], '30')
+            self.assertEqual(event_hub.open_streams, 2)
+
+            # Closing a stream, even one never read from, frees its slot.
+            # Streams keep their request context pushed, so close them in
+            # reverse order on this one thread
+            streams.pop().close()
+            self.assertEqual(event_hub.open_streams, 1)
+            again = self.client.get(url)
+            self.assertEqual(again.status_code, 200)
+            for response in (again, streams.pop()):
+                response.close()
+            # Failing to subscribe gives the slot back at once
+            with mock.patch.object(event_hub, 'subscribe', return_value=None):
+                self.assertEqual(self.client.get(url).status_code, 503)
+        self.assertEqual(event_hub.open_streams, 0)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_stream_replays_then_delivers_live_events(self):
+        client = redis.from_url(TestConfig.REDIS_URL)
+        meeting_events.redis = event_hub.redis = client
+        key = MeetingEvents.user_key(self.guest_id)
+        client.delete(key)
+        self.app.config['EVENTS_HEARTBEAT_SECONDS'] = 0.2
+        try:
+            meeting_events.publish(self.meeting_id, 'first', {}, [self.guest_id])
+            meeting_events.publish(self.meeting_id, 'second', {}, [self.guest_id])
+            first_id = client.xrange(key)[0][0].decode()
+
+            response = self.client.get(f'/api/events/stream?token={self.token(self.guest_id, minutes=0.05)}',
+                                       headers={'Last-Event-ID': first_id})
+            self.assertEqual(response.status_code, 200)
+            chunks = response.response
+            self.assertTrue(next(chunks).startswith(b'retry:'))
+            replayed = next(chunks).decode()
+            self.assertIn('"event":"second"', replayed)
+            meeting_events.publish(self.meeting_id, 'third', {}, [self.guest_id])
+            live = next(chunk for chunk in chunks if not chunk.startswith(b':')).decode()
+            self.assertIn('"event":"third"', live)
+            response.close()
+
+            # A position older than the buffer asks the client to resynchronize
+            stale = self.client.get(f'/api/events/stream?token={self.token(self.guest_id, minutes=0.01)}',
+                                    headers={'Last-Event-ID': '1-0'})
+            self.assertIn(b'event: reset', b''.join(stale.response))
+        finally:
+            client.delete(key)
+            meeting_events.redis = event_hub.redis = None
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import csv
+import gzip
+import io
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from flask import json
+from src import create_app, meeting_acl, meeting_cache
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingAuditLog
+
+class TestMeetingExport(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+
+        users = [User(email=f'export{i}@example.com', name=f'Export {i}', password='Export-pass1!')
+                 for i in range(26)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.outsider_id = users[0].id, users[-1].id
+
+        now = datetime.now(UTC)
+        meeting = Meeting(title='All hands', description='', start_time=now,
+                          end_time=now + timedelta(hours=1), created_by=self.host_id)
+        db.session.add(meeting)
+        db.session.commit()
+        self.meeting_id = meeting.id
+
+        for user in users[1:-1]:
+            participant = MeetingParticipant(meeting_id=self.meeting_id, user_id=user.id, status='approved')
+            participant.joined_at = now
+            db.session.add(participant)
+            db.session.add(MeetingAuditLog(meeting_id=self.meeting_id, user_id=user.id, action='joined',
+                                           details={'role': 'attendee'}))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def export(self, kind, user_id=None, headers=None, **params):
+        token = jwt.encode({'user_id': user_id or self.host_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return self.client.get(f'/api/meetings/{self.meeting_id}/export/{kind}', query_string=params,
+                               headers={'Authorization': f'Bearer {token}', **(headers or {})})
+
+    def test_attendance_csv(self):
+        """Test CSV attendance export"""
+        response = self.export('attendance')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(len(rows), 24)
+        self.assertEqual(rows[0]['email'], 'export1@example.com')
+        self.assertEqual(rows[0]['status'], 'approved')
+
+    def test_audit_ndjson_resumes_from_cursor(self):
+        """Test NDJSON audit export with limit and cursor resumption"""
+        first = [json.loads(line) for line in self.export('audit', format='ndjson', limit=10).get_data(as_text=True).splitlines()]
+        self.assertEqual(len(first), 10)
+        self.assertEqual(first[0]['details'], {'role': 'attendee'})
+
+        rest = [json.loads(line) for line in
+                self.export('audit', format='ndjson', cursor=first[-1]['id']).get_data(as_text=True).splitlines()]
+        self.assertEqual(len(rest), 14)
+        self.assertEqual([r['id'] for r in first + rest], sorted({r['id'] for r in first + rest}))
+
+    def test_gzip(self):
+        """Test gzip-encoded streaming"""
+        response = self.export('attendance', format='ndjson', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(response.get_data()).decode().splitlines()
+        self.assertEqual(len(lines), 24)
+
+    def test_access_and_validation(self):
+        """Test export permissions and parameter validation"""
+        self.assertEqual(self.export('attendance', user_id=self.outsider_id).status_code, 403)
+        self.assertEqual(self.export('attendance', format='xml').status_code, 400)
+        self.assertEqual(self.export('attendance', cursor='abc').status_code, 400)
+        self.assertEqual(self.export('participants').status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from flask import json
+from src import create_app, health_prober
+from src.config import TestConfig
+from src.models import db
+
+class TestHealthProber(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.redis_up = True
+        health_prober.checks.pop('redis')
+        health_prober.register('redis', self._fake_redis_check, critical=False)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _fake_redis_check(self):
+        if not self.redis_up:
+            raise ConnectionError('redis down')
+
+    def _fake_database_down(self):
+        raise ConnectionError('database down')
+
+    def test_not_ready_before_first_probe(self):
+        """Test readiness before any probe has completed"""
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 503)
+        data = json.loads(response.data)
+        self.assertEqual(data['dependencies']['redis']['status'], 'unknown')
+
+    def test_ready_serves_cached_snapshot(self):
+        """Test readiness payload after a successful probe"""
+        health_prober.probe_once()
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['status'], 'ready')
+        self.assertIsNotNone(data['dependencies']['database']['latency_ms'])
+        self.assertIn('pool', data)
+
+    def test_hysteresis(self):
+        """Test that state flips only after fall failures and rise successes"""
+        health_prober.fall = 3
+        health_prober.rise = 2
+        health_prober.probe_once()
+
+        self.redis_up = False
+        health_prober.probe_once()
+        health_prober.probe_once()
+        self.assertEqual(self.client.get('/health/redis').status_code, 200)
+        health_prober.probe_once()
+        response = self.client.get('/health/redis')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(json.loads(response.data)['message'], 'redis down')
+
+        self.redis_up = True
+        health_prober.probe_once()
+        self.assertEqual(self.client.get('/health/redis').status_code, 500)
+        health_prober.probe_once()
+        self.assertEqual(self.client.get('/health/redis').status_code, 200)
+
+    def test_redis_outage_degrades_without_failing_readiness(self):
+        """Test that only the database gates readiness"""
+        health_prober.fall = 1
+        self.redis_up = False
+        health_prober.probe_once()
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['status'], 'ready')
+        self.assertEqual(data['degraded'], ['redis'])
+        self.assertFalse(data['dependencies']['redis']['critical'])
+
+        health_prober.checks['database'].check = self._fake_database_down
+        health_prober.probe_once()
+        self.assertEqual(self.client.get('/health/ready').status_code, 503)
+
+    def test_probes_do_not_start_threads(self):
+        """Test that serving a probe has no side effects"""
+        from src import meeting_sweeper
+        self.client.get('/health/ready')
+        self.assertIsNone(health_prober._thread)
+        self.assertIsNone(meeting_sweeper.task._thread)
+
+    def test_stale_results_are_not_ready(self):
+        """Test that an old snapshot is reported as stale"""
+        health_prober.probe_once()
+        health_prober.stale_after = -1
+        data = json.loads(self.client.get('/health/ready').data)
+        self.assertEqual(data['status'], 'not_ready')
+        self.assertEqual(data['dependencies']['database']['status'], 'stale')
+
+if __name__ == '__main__':
+    unittest.main()
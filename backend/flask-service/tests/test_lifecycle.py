@@ -0,0 +1,131 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+from unittest import mock
+import redis
+from sqlalchemy import event
+from src import create_app, meeting_acl, meeting_cache, meeting_events, meeting_sweeper
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingAuditLog
+from src.utils.lifecycle import MeetingSweeper
+
+def redis_available():
+    try:
+        return redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class TestMeetingSweeper(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+        meeting_sweeper.redis = None
+
+        self.host = User(email='sweeper@example.com', name='Sweeper Host', password='Sweeper-pass1!')
+        self.guest = User(email='sweeper-guest@example.com', name='Sweeper Guest', password='Sweeper-pass1!')
+        db.session.add_all([self.host, self.guest])
+        db.session.commit()
+        self.now = datetime.now(UTC).replace(tzinfo=None)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def meeting(self, ends_ago, ended=False):
+        end_time = self.now - ends_ago
+        meeting = Meeting(title='Sweep', description='', start_time=end_time - timedelta(hours=1),
+                          end_time=end_time, created_by=self.host.id)
+        meeting.ended_at = end_time if ended else None
+        db.session.add(meeting)
+        db.session.commit()
+        return meeting
+
+    def test_overdue_meetings_are_ended_at_their_scheduled_end(self):
+        overdue = self.meeting(timedelta(hours=2))
+        in_grace = self.meeting(timedelta(minutes=5))
+        for meeting in (overdue, in_grace):
+            participant = MeetingParticipant(meeting_id=meeting.id, user_id=self.guest.id, status='approved')
+            participant.joined_at = meeting.end_time - timedelta(minutes=30)
+            db.session.add(participant)
+        db.session.commit()
+        overdue_id, in_grace_id = overdue.id, in_grace.id
+
+        self.assertEqual(meeting_sweeper.sweep(), 1)
+        db.session.expire_all()
+
+        overdue = db.session.get(Meeting, overdue_id)
+        self.assertEqual(overdue.ended_at, overdue.end_time)
+        self.assertIsNone(db.session.get(Meeting, in_grace_id).ended_at)
+
+        participation = MeetingParticipant.query.filter_by(meeting_id=overdue_id).one()
+        self.assertEqual(participation.left_at, overdue.end_time)
+        self.assertEqual(participation.total_time, 30 * 60)
+        self.assertIsNone(MeetingParticipant.query.filter_by(meeting_id=in_grace_id).one().left_at)
+
+        audit = MeetingAuditLog.query.filter_by(meeting_id=overdue_id, action='ended').one()
+        self.assertEqual(audit.user_id, self.host.id)
+        self.assertEqual(audit.details, {'reason': 'expired', 'closed_participations': 1})
+
+        # Nothing left to do
+        self.assertEqual(meeting_sweeper.sweep(), 0)
+
+    def test_batches_are_bounded(self):
+        for hours in range(1, 8):
+            self.meeting(timedelta(hours=hours))
+        self.meeting(timedelta(hours=9), ended=True)
+        with mock.patch.multiple(meeting_sweeper, batch_size=3, max_batches=2):
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                self.assertEqual(meeting_sweeper.sweep(), 6)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            # Select, count, update, close and audit per batch, whatever its size
+            self.assertEqual(len([s for s in statements if s.lstrip().upper().startswith('UPDATE')]), 4)
+            self.assertEqual(meeting_sweeper.sweep(), 1)
+        self.assertEqual(Meeting.query.filter(Meeting.ended_at.is_(None)).count(), 0)
+        self.assertEqual(MeetingAuditLog.query.filter_by(action='ended').count(), 7)
+
+    def test_ended_meetings_are_announced(self):
+        overdue = self.meeting(timedelta(hours=2))
+        db.session.add(MeetingParticipant(meeting_id=overdue.id, user_id=self.guest.id, status='approved'))
+        db.session.commit()
+        with mock.patch.object(meeting_events, 'redis', mock.Mock()), \
+             mock.patch.object(meeting_events, 'publish_many') as publish_many, \
+             mock.patch.object(meeting_cache, 'bump') as bump:
+            meeting_sweeper.sweep()
+        bump.assert_called_once_with(overdue.id)
+        (meeting_id, name, data, user_ids), = list(publish_many.call_args[0][0])
+        self.assertEqual((meeting_id, name, data['reason']), (overdue.id, 'meeting_ended', 'expired'))
+        self.assertEqual(set(user_ids), {self.host.id, self.guest.id})
+
+    def test_tick_requires_leadership(self):
+        self.meeting(timedelta(hours=2))
+        self.assertEqual(meeting_sweeper.tick(), 0)
+        self.assertEqual(Meeting.query.filter(Meeting.ended_at.is_(None)).count(), 1)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_only_one_process_leads(self):
+        client = redis.from_url(TestConfig.REDIS_URL)
+        client.delete(MeetingSweeper.LOCK_KEY)
+        first, second = MeetingSweeper(redis=client), MeetingSweeper(redis=client)
+        try:
+            self.assertTrue(first.acquire_leadership())
+            self.assertFalse(second.acquire_leadership())
+            # Renewal keeps the lock with its holder
+            self.assertTrue(first.acquire_leadership())
+            second.release_leadership()
+            self.assertFalse(second.acquire_leadership())
+            first.release_leadership()
+            self.assertTrue(second.acquire_leadership())
+        finally:
+            client.delete(MeetingSweeper.LOCK_KEY)
+
+if __name__ == '__main__':
+    unittest.main()
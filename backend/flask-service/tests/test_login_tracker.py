@@ -0,0 +1,87 @@
+import unittest
+import redis
+from flask import json
+from src import create_app, login_tracker
+from src.config import TestConfig
+from src.models import db, User
+
+def redis_available():
+    try:
+        return redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class TestLoginBookkeeping(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.user = User(email='tracked@example.com', name='Tracked User', password='Tracked-pass1!')
+        db.session.add(self.user)
+        db.session.commit()
+        self.user_id = self.user.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def login(self, password):
+        return self.client.post('/api/auth/login', json={'email': 'tracked@example.com', 'password': password})
+
+    def test_lockout_without_redis(self):
+        """Test that lockout falls back to the users row when Redis is unavailable"""
+        login_tracker.redis = None
+        for remaining in [4, 3, 2, 1, 0]:
+            response = self.login('Wrong-pass1!')
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(json.loads(response.data)['remaining_attempts'], remaining)
+        response = self.login('Tracked-pass1!')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(json.loads(response.data)['code'], 'account_locked')
+
+    def test_success_resets_without_redis(self):
+        """Test that a successful fallback login records bookkeeping in one commit"""
+        login_tracker.redis = None
+        self.login('Wrong-pass1!')
+        self.assertEqual(self.login('Tracked-pass1!').status_code, 200)
+        user = db.session.get(User, self.user_id)
+        self.assertEqual(user.login_count, 1)
+        self.assertEqual(user.failed_login_attempts, 0)
+        self.assertIsNotNone(user.last_login_at)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_coalesced_bookkeeping(self):
+        """Test that logins are buffered in Redis and flushed in a batch"""
+        login_tracker.redis.delete(login_tracker.DIRTY_KEY, login_tracker.user_key(self.user_id),
+                                   login_tracker.fail_key('tracked@example.com'))
+        self.assertEqual(self.login('Wrong-pass1!').status_code, 401)
+        self.assertEqual(self.login('Tracked-pass1!').status_code, 200)
+        self.assertEqual(self.login('Tracked-pass1!').status_code, 200)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(User, self.user_id).login_count, 0)
+
+        self.assertEqual(login_tracker.flush(), 1)
+        db.session.expire_all()
+        user = db.session.get(User, self.user_id)
+        self.assertEqual(user.login_count, 2)
+        self.assertEqual(user.failed_login_attempts, 0)
+        self.assertIsNotNone(user.last_login_at)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_lockout_with_redis(self):
+        """Test that Redis-tracked failures lock the account and flush the lock"""
+        login_tracker.redis.delete(login_tracker.DIRTY_KEY, login_tracker.user_key(self.user_id),
+                                   login_tracker.fail_key('tracked@example.com'))
+        for _ in range(5):
+            self.login('Wrong-pass1!')
+        self.assertEqual(self.login('Tracked-pass1!').status_code, 429)
+        login_tracker.flush()
+        db.session.expire_all()
+        self.assertTrue(db.session.get(User, self.user_id).is_locked)
+        login_tracker.redis.delete(login_tracker.fail_key('tracked@example.com'))
+
+if __name__ == '__main__':
+    unittest.main()
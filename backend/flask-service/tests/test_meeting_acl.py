@@ -0,0 +1,126 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from sqlalchemy import event
+from src import create_app, meeting_acl
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingCoHost
+
+class TestMeetingACL(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+
+        self.users = {}
+        for name in ['host', 'cohost', 'attendee', 'banned', 'outsider']:
+            user = User(email=f'{name}@example.com', name=f'{name} user', password='Acl-pass1!')
+            db.session.add(user)
+            self.users[name] = user
+        db.session.commit()
+
+        now = datetime.now(UTC)
+        self.meeting = Meeting(title='ACL', description='', start_time=now,
+                               end_time=now + timedelta(hours=1), created_by=self.users['host'].id)
+        db.session.add(self.meeting)
+        db.session.commit()
+
+        db.session.add(MeetingCoHost(meeting_id=self.meeting.id, user_id=self.users['cohost'].id))
+        db.session.add(MeetingParticipant(meeting_id=self.meeting.id, user_id=self.users['attendee'].id,
+                                          status='approved'))
+        banned = MeetingParticipant(meeting_id=self.meeting.id, user_id=self.users['banned'].id,
+                                    status='approved')
+        banned.is_banned = True
+        db.session.add(banned)
+        db.session.commit()
+        self.meeting_dict = self.meeting.to_dict()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def headers(self, name):
+        token = jwt.encode({'user_id': self.users[name].id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_roles(self):
+        """Test role resolution for each kind of member"""
+        expected = {'host': 'host', 'cohost': 'co-host', 'attendee': 'approved',
+                    'banned': 'banned', 'outsider': 'none'}
+        for name, role in expected.items():
+            self.assertEqual(meeting_acl.role(self.users[name].id, self.meeting_dict), role)
+
+    def test_actions(self):
+        """Test the action policy"""
+        can = lambda name, action: meeting_acl.can(self.users[name].id, self.meeting_dict, action)
+        self.assertTrue(can('host', 'delete'))
+        self.assertFalse(can('cohost', 'delete'))
+        self.assertTrue(can('cohost', 'manage_participants'))
+        self.assertFalse(can('attendee', 'manage_participants'))
+        self.assertTrue(can('attendee', 'view'))
+        self.assertFalse(can('outsider', 'view'))
+
+    def test_role_lookup_is_one_query_then_cached(self):
+        """Test that a lookup issues one query and repeats hit the role map"""
+        user_id = self.users['attendee'].id
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            meeting_acl.role(user_id, self.meeting_dict)
+            meeting_acl.role(user_id, self.meeting_dict)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(len(statements), 1)
+        self.assertIn('EXISTS', statements[0])
+
+    def test_co_host_removal_revokes_access(self):
+        """Test that membership changes invalidate the cached role"""
+        url = f'/api/meetings/{self.meeting.id}/waiting-room'
+        self.assertEqual(self.client.get(url, headers=self.headers('cohost')).status_code, 200)
+
+        response = self.client.delete(f"/api/meetings/{self.meeting.id}/co-hosts/{self.users['cohost'].id}",
+                                      headers=self.headers('host'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url, headers=self.headers('cohost')).status_code, 403)
+
+    def test_banned_co_host_is_banned(self):
+        """Test that a ban outranks co-host status"""
+        participant = MeetingParticipant(meeting_id=self.meeting.id, user_id=self.users['cohost'].id,
+                                         status='approved')
+        participant.is_banned = True
+        db.session.add(participant)
+        db.session.commit()
+
+        self.assertEqual(meeting_acl.role(self.users['cohost'].id, self.meeting_dict), 'banned')
+        self.assertFalse(meeting_acl.can(self.users['cohost'].id, self.meeting_dict, 'manage_participants'))
+        response = self.client.get(f'/api/meetings/join/{self.meeting.id}', headers=self.headers('cohost'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_stale_none_role_does_not_duplicate_participant(self):
+        """Test that join finds an existing participant even if a cached role says 'none'"""
+        outsider_id = self.users['outsider'].id
+        self.assertEqual(meeting_acl.role(outsider_id, self.meeting_dict), 'none')
+        # Joined through another process, whose invalidation never reached this one
+        db.session.add(MeetingParticipant(meeting_id=self.meeting.id, user_id=outsider_id, status='approved'))
+        db.session.commit()
+        self.assertEqual(meeting_acl.role(outsider_id, self.meeting_dict), 'none')
+
+        response = self.client.get(f'/api/meetings/join/{self.meeting.id}', headers=self.headers('outsider'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(MeetingParticipant.query.filter_by(meeting_id=self.meeting.id,
+                                                            user_id=outsider_id).count(), 1)
+
+    def test_get_meeting_access(self):
+        """Test view access through the endpoint"""
+        url = f'/api/meetings/{self.meeting.id}'
+        self.assertEqual(self.client.get(url, headers=self.headers('attendee')).status_code, 200)
+        self.assertEqual(self.client.get(url, headers=self.headers('outsider')).status_code, 403)
+
+if __name__ == '__main__':
+    unittest.main()
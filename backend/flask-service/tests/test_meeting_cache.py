@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+import redis
+from flask import json
+from src import create_app, meeting_cache
+from src.config import TestConfig
+from src.models import db, User, Meeting
+
+def redis_available():
+    try:
+        return redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class TestMeetingCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.host = User(email='host@example.com', name='Host User', password='Host-pass1!')
+        db.session.add(self.host)
+        db.session.commit()
+        now = datetime.now(UTC)
+        self.meeting = Meeting(title='Cached', description='', start_time=now,
+                               end_time=now + timedelta(hours=1), created_by=self.host.id)
+        db.session.add(self.meeting)
+        db.session.commit()
+
+        token = jwt.encode({'user_id': self.host.id, 'exp': now + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_local_tier_serves_repeat_reads(self):
+        """Test that repeat reads within the local TTL skip the database"""
+        loads = []
+        def loader():
+            loads.append(1)
+            return self.meeting.to_dict()
+
+        meeting_cache.redis = None
+        meeting_cache.get(self.meeting.id, loader)
+        meeting_cache.get(self.meeting.id, loader)
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(meeting_cache.get_stats()['local_hits'], 1)
+
+    def test_end_meeting_bumps_version(self):
+        """Test that ending a meeting invalidates the cached copy"""
+        response = self.client.get(f'/api/meetings/{self.meeting.id}', headers=self.headers)
+        self.assertIsNone(json.loads(response.data)['ended_at'])
+
+        response = self.client.post(f'/api/meetings/{self.meeting.id}/end', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(f'/api/meetings/{self.meeting.id}', headers=self.headers)
+        self.assertIsNotNone(json.loads(response.data)['ended_at'])
+
+    def test_stats_endpoint(self):
+        """Test that hit ratio is exposed"""
+        self.client.get(f'/api/meetings/{self.meeting.id}', headers=self.headers)
+        self.client.get(f'/api/meetings/{self.meeting.id}', headers=self.headers)
+        stats = json.loads(self.client.get('/health/cache').data)['meeting_cache']
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_redis_version_invalidation(self):
+        """Test that a bump invalidates copies held by other processes"""
+        meeting_cache.redis.delete(meeting_cache.version_key(self.meeting.id),
+                                   meeting_cache.data_key(self.meeting.id))
+        loader = lambda: self.meeting.to_dict()
+
+        meeting_cache.get(self.meeting.id, loader)
+        meeting_cache.clear()  # simulate another process: empty local tier
+        meeting_cache.get(self.meeting.id, loader)
+        self.assertEqual(meeting_cache.get_stats()['redis_hits'], 1)
+
+        meeting_cache.bump(self.meeting.id)
+        meeting_cache.clear()
+        meeting_cache.get(self.meeting.id, loader)
+        self.assertEqual(meeting_cache.get_stats()['misses'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from flask import json
+from sqlalchemy import event
+from src import create_app, meeting_acl, meeting_cache, meeting_events, tokens
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingCoHost, MeetingAuditLog
+from src.utils.meeting_import import batch_conflicts
+
+class TestMeetingImport(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+        tokens.redis = None
+
+        users = [User(email=f'import{i}@example.com', name=f'Import {i}', password='Import-pass1!') for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.co_host_id, self.other_id = (user.id for user in users)
+        self.base = (datetime.now(UTC) + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def item(self, hour, minutes=30, **overrides):
+        start = self.base + timedelta(hours=hour)
+        return {'title': f'Imported {hour}', 'description': '', 'start_time': start.isoformat(),
+                'end_time': (start + timedelta(minutes=minutes)).isoformat(), **overrides}
+
+    def import_meetings(self, items):
+        token = jwt.encode({'user_id': self.host_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return self.client.post('/api/meetings/import', json={'meetings': items},
+                                headers={'Authorization': f'Bearer {token}'})
+
+    def test_imports_meetings_with_co_hosts_and_audit_rows(self):
+        response = self.import_meetings([self.item(0, co_hosts=[self.co_host_id, self.host_id]), self.item(1)])
+        self.assertEqual(response.status_code, 201)
+        body = json.loads(response.data)
+        self.assertEqual([c['index'] for c in body['created']], [0, 1])
+        self.assertEqual(body['errors'], [])
+
+        first = db.session.get(Meeting, body['created'][0]['id'])
+        self.assertEqual(first.title, 'Imported 0')
+        self.assertEqual(first.start_time, self.base.replace(tzinfo=None))
+        self.assertEqual([c.user_id for c in MeetingCoHost.query.filter_by(meeting_id=first.id)], [self.co_host_id])
+        actions = sorted(a.action for a in MeetingAuditLog.query.all())
+        self.assertEqual(actions, ['added_co_hosts', 'created', 'created'])
+
+    def test_reports_errors_per_item(self):
+        existing = Meeting(title='Existing', description='', start_time=self.base + timedelta(hours=5),
+                           end_time=self.base + timedelta(hours=6), created_by=self.host_id)
+        db.session.add(existing)
+        db.session.commit()
+
+        response = self.import_meetings([
+            self.item(0, minutes=90),         # kept
+            self.item(1),                     # overlaps item 0
+            self.item(5, title=''),           # invalid
+            self.item(5, minutes=15),         # overlaps the existing meeting
+            self.item(7, co_hosts=[99999]),   # unknown co-host
+            self.item(8),                     # kept
+        ])
+        self.assertEqual(response.status_code, 201)
+        body = json.loads(response.data)
+        self.assertEqual([c['index'] for c in body['created']], [0, 5])
+        errors = {e['index']: e['errors'] for e in body['errors']}
+        self.assertEqual(set(errors), {1, 2, 3, 4})
+        self.assertEqual(errors[1], {'start_time': 'Overlaps meeting 0 of this batch'})
+        self.assertIn('title', errors[2])
+        self.assertEqual(errors[3], {'start_time': 'You have another meeting scheduled during this time'})
+        self.assertIn('co_hosts', errors[4])
+        self.assertEqual(Meeting.query.count(), 3)
+
+    def test_active_meeting_limit(self):
+        self.app.config['MAX_ACTIVE_MEETINGS'] = 2
+        response = self.import_meetings([self.item(i) for i in range(3)])
+        body = json.loads(response.data)
+        self.assertEqual(len(body['created']), 2)
+        self.assertEqual(body['errors'][0]['index'], 2)
+        self.assertEqual(self.import_meetings([self.item(10)]).status_code, 400)
+
+    def test_statement_count_does_not_grow_with_batch(self):
+        def count(items):
+            statements = []
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                self.assertEqual(self.import_meetings(items).status_code, 201)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            return len(statements)
+        small = count([self.item(i, co_hosts=[self.co_host_id]) for i in range(2)])
+        large = count([self.item(i, co_hosts=[self.co_host_id]) for i in range(20, 45)])
+        self.assertEqual(small, large)
+
+    def test_invalid_batches(self):
+        self.assertEqual(self.import_meetings([]).status_code, 400)
+        self.assertEqual(self.import_meetings([self.item(0)] * 501).status_code, 400)
+        self.assertEqual(self.import_meetings([{'title': 'x'}]).status_code, 400)
+
+    def test_batch_conflicts_keep_earliest(self):
+        t = lambda h: datetime(2030, 1, 1, h)
+        self.assertEqual(batch_conflicts({0: (t(9), t(12)), 1: (t(10), t(11)), 2: (t(11), t(13)), 3: (t(12), t(13))}),
+                         {1: 0, 2: 0})
+
+if __name__ == '__main__':
+    unittest.main()
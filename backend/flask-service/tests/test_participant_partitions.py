@@ -0,0 +1,133 @@
+import re
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from sqlalchemy import event, inspect as sa_inspect, update
+from src import create_app, meeting_acl, meeting_cache, meeting_events, tokens
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant
+
+# Statements reading or writing participant rows
+PARTICIPANT_STATEMENT = re.compile(r'\b(FROM|UPDATE|JOIN)\s+meeting_participants\b')
+MEETING_FILTER = re.compile(r'meeting_participants\.meeting_id (=|IN)')
+
+class TestPartitionAwareQueries(unittest.TestCase):
+    """Hot participant paths name meeting_id, so PostgreSQL prunes to one partition."""
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+        tokens.redis = None
+
+        users = [User(email=f'partition{i}@example.com', name=f'Partition {i}', password='Partition-pass1!')
+                 for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.guest_id, self.waiting_id = (user.id for user in users)
+
+        now = datetime.now(UTC)
+        self.open_id = self.meeting(now, requires_approval=False)
+        self.webinar_id = self.meeting(now, requires_approval=True)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def meeting(self, now, requires_approval):
+        meeting = Meeting(title='Partitions', description='', start_time=now - timedelta(minutes=1),
+                          end_time=now + timedelta(hours=1), created_by=self.host_id,
+                          requires_approval=requires_approval)
+        db.session.add(meeting)
+        db.session.commit()
+        return meeting.id
+
+    def auth(self, user_id):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return {'Authorization': f'Bearer {token}'}
+
+    def participant_statements(self, requests):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            for method, path, user_id, expected in requests:
+                response = getattr(self.client, method)(path, headers=self.auth(user_id))
+                self.assertEqual(response.status_code, expected, path)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return [s for s in statements if PARTICIPANT_STATEMENT.search(s)]
+
+    def test_join_and_rejoin(self):
+        path = f'/api/meetings/join/{self.open_id}'
+        statements = self.participant_statements([('get', path, self.guest_id, 200)])
+        participant = MeetingParticipant.query.filter_by(meeting_id=self.open_id, user_id=self.guest_id).one()
+        self.assertEqual(participant.status, 'approved')
+        self.assertIsNotNone(participant.joined_at)
+
+        db.session.execute(update(MeetingParticipant).where(MeetingParticipant.id == participant.id)
+                           .values(left_at=datetime.now(UTC).replace(tzinfo=None)))
+        db.session.commit()
+        statements += self.participant_statements([('get', path, self.guest_id, 200)])
+        db.session.expire_all()
+        self.assertIsNone(db.session.get(MeetingParticipant, (participant.id, self.open_id)).left_at)
+
+        # The one-active-meeting check spans meetings by design
+        scoped = [s for s in statements if 'JOIN meetings' not in s]
+        self.assertTrue(scoped)
+        for statement in scoped:
+            self.assertRegex(statement, MEETING_FILTER)
+
+    def test_waiting_room_and_decisions(self):
+        self.client.get(f'/api/meetings/join/{self.webinar_id}', headers=self.auth(self.waiting_id))
+        participant_id = MeetingParticipant.query.filter_by(meeting_id=self.webinar_id).one().id
+        base = f'/api/meetings/{self.webinar_id}'
+        statements = self.participant_statements([
+            ('get', f'{base}/waiting-room', self.host_id, 200),
+            ('post', f'{base}/participants/{participant_id}/approve', self.host_id, 200),
+            ('post', f'{base}/participants/{participant_id}/reject', self.host_id, 400),
+        ])
+        self.assertTrue(statements)
+        for statement in statements:
+            self.assertRegex(statement, MEETING_FILTER)
+        self.assertEqual(db.session.get(MeetingParticipant, (participant_id, self.webinar_id)).status, 'approved')
+
+    def test_identity_carries_the_partition_key(self):
+        self.assertEqual([c.name for c in sa_inspect(MeetingParticipant).primary_key], ['id', 'meeting_id'])
+        participant = MeetingParticipant(meeting_id=self.open_id, user_id=self.guest_id, status='approved')
+        db.session.add(participant)
+        db.session.commit()
+        self.assertIsNone(db.session.get(MeetingParticipant, (participant.id, self.webinar_id)))
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            participant = db.session.get(MeetingParticipant, (participant.id, self.open_id))
+            participant.status = 'declined'
+            db.session.commit()
+            db.session.delete(participant)
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        statements = [s for s in statements if PARTICIPANT_STATEMENT.search(s)]
+        self.assertEqual(len(statements), 3)
+        for statement in statements:
+            self.assertRegex(statement, MEETING_FILTER)
+
+    def test_participant_of_another_meeting_is_not_found(self):
+        self.client.get(f'/api/meetings/join/{self.webinar_id}', headers=self.auth(self.waiting_id))
+        participant_id = MeetingParticipant.query.filter_by(meeting_id=self.webinar_id).one().id
+        response = self.client.post(f'/api/meetings/{self.open_id}/participants/{participant_id}/reject',
+                                    headers=self.auth(self.host_id))
+        self.assertEqual(response.status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import time
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+import redis
+from sqlalchemy import event
+from src import create_app, meeting_acl, meeting_cache, meeting_events, meeting_sweeper, presence, tokens
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant
+from src.utils.socket_events import socketio
+
+def redis_store():
+    """The server at TEST_REDIS_URL when reachable, else fakeredis (with Lua) when installed."""
+    try:
+        client = redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2)
+        client.ping()
+        return client
+    except Exception:
+        pass
+    try:
+        import fakeredis
+    except ImportError:
+        return None
+    return fakeredis.FakeRedis()
+
+REDIS_STORE = redis_store()
+
+class PresenceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        for extension in (meeting_acl, meeting_cache, meeting_events, meeting_sweeper, presence, tokens):
+            extension.redis = None
+
+        users = [User(email=f'presence{i}@example.com', name=f'Presence {i}', password='Presence-pass1!')
+                 for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.guest_id, self.other_id = (user.id for user in users)
+
+        self.now = datetime.now(UTC).replace(tzinfo=None)
+        self.first_id = self.meeting()
+        self.second_id = self.meeting()
+
+    def meeting(self):
+        meeting = Meeting(title='Presence', description='', start_time=self.now - timedelta(minutes=1),
+                          end_time=self.now + timedelta(hours=1), created_by=self.host_id)
+        db.session.add(meeting)
+        db.session.commit()
+        return meeting.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def token(self, user_id):
+        return jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                          TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+
+    def auth(self, user_id):
+        return {'Authorization': f'Bearer {self.token(user_id)}'}
+
+    def participant(self, meeting_id, user_id, joined_at):
+        participant = MeetingParticipant(meeting_id=meeting_id, user_id=user_id, status='approved')
+        participant.joined_at = joined_at
+        db.session.add(participant)
+        db.session.commit()
+        return participant.id
+
+class TestCloseParticipations(PresenceTestCase):
+    def test_bulk_close_at_each_users_time(self):
+        joined = self.now - timedelta(minutes=10)
+        guest = self.participant(self.first_id, self.guest_id, joined)
+        other = self.participant(self.first_id, self.other_id, joined)
+        # Rejoined after the departure being applied: stays open
+        rejoined = self.participant(self.second_id, self.guest_id, self.now)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            MeetingParticipant.close_participations([
+                (self.first_id, self.guest_id, joined + timedelta(minutes=4)),
+                (self.first_id, self.other_id, joined + timedelta(minutes=6)),
+                (self.second_id, self.guest_id, self.now - timedelta(minutes=1)),
+            ])
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(len(statements), 1)
+
+        db.session.expire_all()
+        self.assertEqual(db.session.get(MeetingParticipant, (guest, self.first_id)).total_time, 240)
+        self.assertEqual(db.session.get(MeetingParticipant, (other, self.first_id)).total_time, 360)
+        self.assertEqual(db.session.get(MeetingParticipant, (other, self.first_id)).left_at, joined + timedelta(minutes=6))
+        self.assertIsNone(db.session.get(MeetingParticipant, (rejoined, self.second_id)).left_at)
+
+class TestPresenceWithoutRedis(PresenceTestCase):
+    def test_join_falls_back_to_open_participations(self):
+        self.participant(self.first_id, self.guest_id, self.now)
+        self.assertIsNone(presence.other_meeting(self.guest_id, self.second_id))
+        response = self.client.get(f'/api/meetings/join/{self.second_id}', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 400)
+
+    def test_presence_endpoint_is_unavailable(self):
+        response = self.client.get(f'/api/meetings/{self.first_id}/presence', headers=self.auth(self.host_id))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(presence.reconcile(), 0)
+
+@unittest.skipUnless(REDIS_STORE, 'Redis not reachable at TEST_REDIS_URL and fakeredis not installed')
+class TestPresenceRegistry(PresenceTestCase):
+    def setUp(self):
+        super().setUp()
+        REDIS_STORE.flushdb()
+        presence.redis = REDIS_STORE
+        presence.heartbeats = True
+
+    def tearDown(self):
+        REDIS_STORE.flushdb()
+        super().tearDown()
+
+    def left_at(self, meeting_id, user_id):
+        db.session.expire_all()
+        return MeetingParticipant.query.filter_by(meeting_id=meeting_id, user_id=user_id).one().left_at
+
+    def test_join_registers_and_blocks_other_meetings(self):
+        response = self.client.get(f'/api/meetings/join/{self.first_id}', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(presence.other_meeting(self.guest_id, self.second_id), self.first_id)
+        self.assertEqual(presence.other_meeting(self.guest_id, self.first_id), 0)
+
+        response = self.client.get(f'/api/meetings/{self.first_id}/presence', headers=self.auth(self.host_id))
+        self.assertEqual(response.get_json()['user_ids'], [self.guest_id])
+        response = self.client.get(f'/api/meetings/join/{self.second_id}', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 400)
+
+        # Leaving frees the user without waiting for reconcile to touch the database
+        presence.leave(self.guest_id, self.first_id)
+        response = self.client.get(f'/api/meetings/join/{self.second_id}', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 200)
+
+    def test_heartbeats_only_extend_a_registration(self):
+        self.assertFalse(presence.heartbeat(self.guest_id, self.first_id))
+        self.assertEqual(presence.members(self.first_id), [])
+        presence.register(self.guest_id, self.first_id)
+        self.assertTrue(presence.heartbeat(self.guest_id, self.first_id))
+        self.assertFalse(presence.heartbeat(self.guest_id, self.second_id))
+
+    def test_reconcile_closes_departures_and_expired_members(self):
+        joined = self.now - timedelta(minutes=5)
+        left = self.participant(self.first_id, self.guest_id, joined)
+        expired = self.participant(self.first_id, self.other_id, joined)
+        staying = self.participant(self.second_id, self.guest_id, joined)
+        presence.register(self.guest_id, self.first_id)
+        presence.register(self.other_id, self.first_id)
+        # Switching meetings records a departure from the first
+        presence.register(self.guest_id, self.second_id)
+        self.assertEqual(presence.members(self.first_id), [self.other_id])
+
+        presence.ttl = 0.2
+        time.sleep(0.3)
+        presence.heartbeat(self.guest_id, self.second_id)
+        self.assertEqual(presence.reconcile(), 2)
+        db.session.expire_all()
+
+        self.assertIsNotNone(db.session.get(MeetingParticipant, (left, self.first_id)).left_at)
+        self.assertIsNotNone(db.session.get(MeetingParticipant, (expired, self.first_id)).left_at)
+        self.assertIsNone(db.session.get(MeetingParticipant, (staying, self.second_id)).left_at)
+        self.assertEqual(presence.reconcile(), 0)
+
+    def test_heartbeats_keep_joined_users_in(self):
+        meeting_sweeper.redis = REDIS_STORE
+        presence.ttl = 0.5
+        for user_id in (self.guest_id, self.other_id):
+            response = self.client.get(f'/api/meetings/join/{self.first_id}', headers=self.auth(user_id))
+            self.assertEqual(response.status_code, 200)
+
+        url = f'/api/meetings/{self.first_id}/presence'
+        for _ in range(3):
+            time.sleep(0.3)
+            self.assertEqual(self.client.post(url, headers=self.auth(self.guest_id)).status_code, 200)
+
+        # Only the user whose client went quiet is closed
+        meeting_sweeper.tick()
+        self.assertIsNone(self.left_at(self.first_id, self.guest_id))
+        self.assertIsNotNone(self.left_at(self.first_id, self.other_id))
+
+        response = self.client.post(url, headers=self.auth(self.other_id))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json()['code'], 'presence_expired')
+
+    def test_socket_heartbeats_match_the_endpoint(self):
+        presence.register(self.guest_id, self.first_id)
+        socket = socketio.test_client(self.app, flask_test_client=self.client)
+        self.assertTrue(socket.is_connected())
+        socket.emit('heartbeat', {'token': self.token(self.guest_id), 'meeting_id': self.first_id})
+        self.assertEqual(socket.get_received(), [])
+        socket.emit('heartbeat', {'token': self.token(self.other_id), 'meeting_id': self.first_id})
+        self.assertEqual([message['name'] for message in socket.get_received()], ['presence_expired'])
+        socket.disconnect()
+
+    def test_leave_frees_the_user_at_once(self):
+        response = self.client.get(f'/api/meetings/join/{self.first_id}', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.delete(f'/api/meetings/{self.first_id}/presence', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(presence.members(self.first_id), [])
+        response = self.client.get(f'/api/meetings/join/{self.second_id}', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 200)
+
+    def test_lapsed_registrations_are_unknown_without_heartbeats(self):
+        presence.heartbeats = False
+        meeting_sweeper.redis = REDIS_STORE
+        presence.ttl = 0.2
+        for user_id in (self.host_id, self.guest_id):
+            response = self.client.get(f'/api/meetings/join/{self.first_id}', headers=self.auth(user_id))
+            self.assertEqual(response.status_code, 200)
+        time.sleep(0.3)
+        self.assertIsNone(presence.other_meeting(self.guest_id, self.second_id))
+
+        # Nothing is closed, and the database decides who may join elsewhere
+        meeting_sweeper.tick()
+        self.assertIsNone(self.left_at(self.first_id, self.guest_id))
+        response = self.client.get(f'/api/meetings/join/{self.second_id}', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 400)
+        # The host has no participant row in their own meeting
+        response = self.client.get(f'/api/meetings/join/{self.second_id}', headers=self.auth(self.host_id))
+        self.assertEqual(response.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
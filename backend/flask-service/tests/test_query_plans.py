@@ -0,0 +1,190 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from flask_migrate import upgrade
+from sqlalchemy import func, insert, select, text, update
+from src import create_app
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingTombstone
+from src.utils.sync import changed_meeting_ids
+
+POSTGRES_URL = os.getenv('TEST_DATABASE_URL', '')
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+class PostgresTestConfig(TestConfig):
+    SQLALCHEMY_DATABASE_URI = POSTGRES_URL
+    MIGRATIONS_ENABLED = True
+
+def reset_schema():
+    """Drop everything in the test database, alembic_version included."""
+    db.session.remove()
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql('DROP SCHEMA public CASCADE')
+        connection.exec_driver_sql('CREATE SCHEMA public')
+
+def hot_queries(user_id, meeting_id):
+    """(name, statement) for each hot access path."""
+    now = datetime(2024, 3, 18, 12, 0)
+    mp = MeetingParticipant
+    return [
+        ('open participants', select(func.count(mp.id)).where(
+            mp.meeting_id == meeting_id, mp.left_at.is_(None)
+        )),
+        ('approved capacity', select(func.count(mp.id)).where(
+            mp.meeting_id == meeting_id, mp.left_at.is_(None), mp.status == 'approved'
+        )),
+        ('close open participations', update(mp).where(
+            mp.meeting_id == meeting_id, mp.left_at.is_(None)
+        ).values(left_at=now)),
+        ('participant lookup', select(mp.id).where(
+            mp.meeting_id == meeting_id, mp.user_id == user_id
+        )),
+        ('concurrent meetings', select(mp.id).join(Meeting, Meeting.id == mp.meeting_id).where(
+            mp.user_id == user_id, Meeting.ended_at.is_(None), Meeting.id != meeting_id, mp.left_at.is_(None)
+        ).limit(1)),
+        ('creator overlap', select(Meeting.id).where(
+            Meeting.created_by == user_id, Meeting.ended_at.is_(None),
+            Meeting.end_time > now, Meeting.start_time < now + timedelta(hours=1)
+        ).limit(1)),
+        ('creator active count', select(func.count(Meeting.id)).where(
+            Meeting.created_by == user_id, Meeting.ended_at.is_(None)
+        )),
+        ('sync changes', select(Meeting.id).where(
+            Meeting.id.in_(changed_meeting_ids(user_id, now))
+        )),
+        ('overdue meetings', select(Meeting.id, Meeting.created_by, Meeting.end_time).where(
+            Meeting.ended_at.is_(None), Meeting.end_time < now
+        ).order_by(Meeting.end_time).limit(200)),
+        ('archivable meetings', select(Meeting.id).where(
+            Meeting.ended_at < now
+        ).order_by(Meeting.ended_at).limit(500)),
+        ('sync tombstones', select(MeetingTombstone.meeting_id).where(
+            MeetingTombstone.user_id == user_id, MeetingTombstone.created_at > now
+        )),
+    ]
+
+def seed(users=200, meetings_per_user=10, participants_per_meeting=10):
+    """Insert a realistically skewed dataset: most meetings ended, most participations closed."""
+    start = datetime(2024, 1, 1, 9, 0)
+    db.session.execute(insert(User.__table__), [
+        {'email': f'plan{i}@example.com', 'name': f'Plan {i}', 'password_hash': 'x',
+         'created_at': start, 'updated_at': start, 'is_active': True, 'is_email_verified': False,
+         'failed_login_attempts': 0, 'login_count': 0, 'last_password_change': start}
+        for i in range(users)
+    ])
+    user_ids = db.session.execute(select(User.id).order_by(User.id)).scalars().all()
+
+    meetings = []
+    for n, creator in enumerate(user_ids):
+        for k in range(meetings_per_user):
+            begins = start + timedelta(hours=n * meetings_per_user + k)
+            meetings.append({
+                'title': 'Plan', 'start_time': begins, 'end_time': begins + timedelta(hours=1),
+                'created_by': creator, 'created_at': begins, 'updated_at': begins,
+                'ended_at': None if k == meetings_per_user - 1 else begins + timedelta(hours=1),
+                'meeting_type': 'regular', 'requires_approval': False, 'is_recorded': False
+            })
+    db.session.execute(insert(Meeting.__table__), meetings)
+    meeting_ids = db.session.execute(select(Meeting.id).order_by(Meeting.id)).scalars().all()
+
+    participants = []
+    for n, meeting_id in enumerate(meeting_ids):
+        still_open = n % meetings_per_user == meetings_per_user - 1
+        for k in range(participants_per_meeting):
+            joined = start + timedelta(hours=n)
+            participants.append({
+                'meeting_id': meeting_id, 'user_id': user_ids[(n + k) % len(user_ids)],
+                'status': 'approved', 'role': 'attendee', 'joined_at': joined,
+                'left_at': None if still_open else joined + timedelta(minutes=50),
+                'is_banned': False, 'created_at': joined, 'updated_at': joined
+            })
+    db.session.execute(insert(MeetingParticipant.__table__), participants)
+    db.session.commit()
+    return user_ids[len(user_ids) // 2], meeting_ids[len(meeting_ids) // 2]
+
+class TestSqliteQueryPlans(unittest.TestCase):
+    """The model indexes serve every hot path without a full table scan."""
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.user_id, self.meeting_id = seed(users=50)
+        db.session.execute(text('ANALYZE'))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def explain(self, stmt):
+        compiled = stmt.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+        params = tuple(
+            value.isoformat(' ') if isinstance(value, datetime) else value
+            for value in (compiled.params[key] for key in compiled.positiontup)
+        )
+        rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).all()
+        return [row[-1] for row in rows]
+
+    def test_hot_queries_use_indexes(self):
+        for name, stmt in hot_queries(self.user_id, self.meeting_id):
+            with self.subTest(query=name):
+                plan = self.explain(stmt)
+                scans = [step for step in plan if step.startswith('SCAN')]
+                self.assertEqual(scans, [], f'{name}: {plan}')
+
+@unittest.skipUnless(POSTGRES_URL.startswith('postgresql'), 'TEST_DATABASE_URL must point at PostgreSQL')
+class TestPostgresQueryPlans(unittest.TestCase):
+    """
+    Same check against PostgreSQL's planner with real statistics, on the
+    schema the migrations build (indexes, partitioned meeting_participants),
+    not the one create_all() derives from the models.
+    """
+
+    def setUp(self):
+        self.app = create_app(PostgresTestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        reset_schema()
+        upgrade(directory=MIGRATIONS_DIRECTORY)
+        self.user_id, self.meeting_id = seed()
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+    def tearDown(self):
+        reset_schema()
+        self.app_context.pop()
+
+    def explain(self, stmt):
+        compiled = stmt.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+        plan = db.session.connection().exec_driver_sql(
+            f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params
+        ).scalar()
+        return plan[0]['Plan']
+
+    def nodes(self, plan):
+        yield plan
+        for child in plan.get('Plans', []):
+            yield from self.nodes(child)
+
+    def test_hot_queries_use_indexes(self):
+        for name, stmt in hot_queries(self.user_id, self.meeting_id):
+            with self.subTest(query=name):
+                nodes = list(self.nodes(self.explain(stmt)))
+                seq_scans = [node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan']
+                self.assertEqual(seq_scans, [], f'{name}: sequential scan on {seq_scans}')
+
+    def test_schema_comes_from_the_migrations(self):
+        relkind = db.session.execute(text(
+            "SELECT relkind FROM pg_class WHERE relname = 'meeting_participants'"
+        )).scalar()
+        self.assertEqual(relkind, 'p')
+        # Superseded by idx_meeting_participants_meeting_user in hot_path_indexes
+        dropped = db.session.execute(text(
+            "SELECT count(*) FROM pg_indexes WHERE indexname = 'idx_meeting_participants_meeting_id'"
+        )).scalar()
+        self.assertEqual(dropped, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from flask import json
+from src import create_app, meeting_acl, meeting_cache
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingCoHost
+from src.utils.search import decode_cursor, encode_cursor
+
+class TestMeetingSearch(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+
+        users = [User(email=f'search{i}@example.com', name=f'Search {i}', password='Search-pass1!') for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.user_id, self.other_id, self.co_host_id = (user.id for user in users)
+
+        now = datetime.now(UTC)
+        def meeting(title, description, created_by):
+            m = Meeting(title=title, description=description, start_time=now,
+                        end_time=now + timedelta(hours=1), created_by=created_by)
+            db.session.add(m)
+            return m
+        self.own_title = meeting('Budget review', 'Quarterly numbers', self.user_id)
+        self.own_description = meeting('Weekly sync', 'Walk through the budget', self.user_id)
+        self.joined = meeting('Budget planning', 'Next year', self.other_id)
+        self.co_hosted = meeting('Budget retro', '', self.other_id)
+        self.hidden = meeting('Budget secrets', 'Not for everyone', self.other_id)
+        db.session.commit()
+        db.session.add(MeetingParticipant(meeting_id=self.joined.id, user_id=self.user_id))
+        db.session.add(MeetingCoHost(meeting_id=self.co_hosted.id, user_id=self.user_id))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def search(self, query_string):
+        token = jwt.encode({'user_id': self.user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return self.client.get(f'/api/meetings/search?{query_string}', headers={'Authorization': f'Bearer {token}'})
+
+    def test_search_only_returns_visible_meetings(self):
+        response = self.search('q=budget')
+        self.assertEqual(response.status_code, 200)
+        ids = {result['id'] for result in json.loads(response.data)['results']}
+        self.assertEqual(ids, {self.own_title.id, self.own_description.id, self.joined.id, self.co_hosted.id})
+
+    def test_title_matches_rank_above_description_matches(self):
+        results = json.loads(self.search('q=budget').data)['results']
+        self.assertEqual(results[-1]['id'], self.own_description.id)
+        self.assertGreater(results[0]['rank'], results[-1]['rank'])
+
+    def test_every_term_must_match(self):
+        results = json.loads(self.search('q=budget+quarterly').data)['results']
+        self.assertEqual([result['id'] for result in results], [self.own_title.id])
+
+    def test_keyset_pagination_covers_all_results_once(self):
+        seen = []
+        query = 'q=budget&limit=1'
+        while True:
+            page = json.loads(self.search(query).data)
+            seen.extend(result['id'] for result in page['results'])
+            if not page['next_cursor']:
+                break
+            query = f"q=budget&limit=1&cursor={page['next_cursor']}"
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.search('q=').status_code, 400)
+        self.assertEqual(self.search('q=budget&limit=0').status_code, 400)
+        self.assertEqual(self.search('q=budget&limit=500').status_code, 400)
+        self.assertEqual(self.search('q=budget&cursor=@@@').status_code, 400)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(0.1 + 0.2, 42)), (0.1 + 0.2, 42))
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+
+if __name__ == '__main__':
+    unittest.main()
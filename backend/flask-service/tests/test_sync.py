@@ -0,0 +1,147 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from flask import json
+from src import create_app, meeting_acl, meeting_cache, meeting_events
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingCoHost, MeetingTombstone
+from src.utils.sync import encode_token, parse_token, prune_tombstones
+
+class TestMeetingSync(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+
+        users = [User(email=f'sync{i}@example.com', name=f'Sync {i}', password='Sync-pass1!') for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.guest_id, self.other_id = (user.id for user in users)
+
+        # Everything below last changed an hour ago
+        past = datetime.now(UTC) - timedelta(hours=1)
+        def meeting(title, created_by):
+            m = Meeting(title=title, description='', start_time=past + timedelta(hours=2),
+                        end_time=past + timedelta(hours=3), created_by=created_by)
+            m.created_at = m.updated_at = past
+            db.session.add(m)
+            return m
+        self.hosted = meeting('Hosted', self.host_id)
+        self.joined = meeting('Joined', self.other_id)
+        self.co_hosted = meeting('Co-hosted', self.other_id)
+        self.unrelated = meeting('Unrelated', self.other_id)
+        db.session.commit()
+
+        participant = MeetingParticipant(meeting_id=self.joined.id, user_id=self.guest_id)
+        participant.created_at = participant.updated_at = past
+        db.session.add(participant)
+        guest_on_hosted = MeetingParticipant(meeting_id=self.hosted.id, user_id=self.guest_id, status='approved')
+        guest_on_hosted.created_at = guest_on_hosted.updated_at = past
+        db.session.add(guest_on_hosted)
+        co_host = MeetingCoHost(meeting_id=self.co_hosted.id, user_id=self.guest_id)
+        co_host.created_at = co_host.updated_at = past
+        db.session.add(co_host)
+        db.session.commit()
+        self.participant_id = participant.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def auth(self, user_id):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return {'Authorization': f'Bearer {token}'}
+
+    def sync(self, user_id, since=None):
+        url = '/api/meetings/sync' + (f'?since={since}' if since else '')
+        response = self.client.get(url, headers=self.auth(user_id))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.data)
+
+    def test_snapshot_then_empty_delta(self):
+        snapshot = self.sync(self.guest_id)
+        self.assertTrue(snapshot['reset'])
+        self.assertEqual({m['id'] for m in snapshot['meetings']},
+                         {self.hosted.id, self.joined.id, self.co_hosted.id})
+
+        delta = self.sync(self.guest_id, snapshot['sync_token'])
+        self.assertFalse(delta['reset'])
+        self.assertEqual(delta['meetings'], [])
+        self.assertEqual(delta['tombstones'], [])
+
+    def test_delta_contains_only_changed_meetings(self):
+        token = self.sync(self.guest_id)['sync_token']
+        response = self.client.post(f'/api/meetings/{self.hosted.id}/end', headers=self.auth(self.host_id))
+        self.assertEqual(response.status_code, 200)
+
+        delta = self.sync(self.guest_id, token)
+        self.assertEqual([m['id'] for m in delta['meetings']], [self.hosted.id])
+        self.assertIsNotNone(delta['meetings'][0]['ended_at'])
+
+    def test_deleted_meeting_leaves_tombstones(self):
+        token = self.sync(self.guest_id)['sync_token']
+        response = self.client.delete(f'/api/meetings/{self.hosted.id}', headers=self.auth(self.host_id))
+        self.assertEqual(response.status_code, 200)
+
+        for user_id in (self.guest_id, self.host_id):
+            delta = self.sync(user_id, token)
+            self.assertEqual(delta['meetings'], [])
+            self.assertEqual(delta['tombstones'][0]['meeting_id'], self.hosted.id)
+            self.assertEqual(delta['tombstones'][0]['reason'], 'deleted')
+
+    def test_declined_participation_leaves_tombstone(self):
+        token = self.sync(self.guest_id)['sync_token']
+        response = self.client.post(f'/api/meetings/{self.joined.id}/participants/{self.participant_id}/reject',
+                                    headers=self.auth(self.other_id))
+        self.assertEqual(response.status_code, 200)
+
+        delta = self.sync(self.guest_id, token)
+        self.assertEqual(delta['meetings'], [])
+        self.assertEqual([(t['meeting_id'], t['reason']) for t in delta['tombstones']], [(self.joined.id, 'declined')])
+        self.assertNotIn(self.joined.id, {m['id'] for m in self.sync(self.guest_id)['meetings']})
+
+    def test_tombstone_omitted_while_meeting_still_listed(self):
+        # Removed as co-host but still a participant of the same meeting
+        db.session.add(MeetingParticipant(meeting_id=self.co_hosted.id, user_id=self.guest_id, status='approved'))
+        db.session.commit()
+        token = self.sync(self.guest_id)['sync_token']
+        response = self.client.delete(f'/api/meetings/{self.co_hosted.id}/co-hosts/{self.guest_id}',
+                                      headers=self.auth(self.other_id))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.sync(self.guest_id, token)['tombstones'], [])
+
+    def test_new_participation_appears_in_delta(self):
+        token = self.sync(self.guest_id)['sync_token']
+        db.session.add(MeetingParticipant(meeting_id=self.unrelated.id, user_id=self.guest_id))
+        db.session.commit()
+
+        delta = self.sync(self.guest_id, token)
+        self.assertEqual([m['id'] for m in delta['meetings']], [self.unrelated.id])
+
+    def test_expired_or_invalid_token(self):
+        stale = encode_token(datetime.now(UTC).replace(tzinfo=None) - timedelta(days=60))
+        self.assertTrue(self.sync(self.guest_id, stale)['reset'])
+        response = self.client.get('/api/meetings/sync?since=yesterday', headers=self.auth(self.guest_id))
+        self.assertEqual(response.status_code, 400)
+
+    def test_token_round_trip_and_prune(self):
+        moment = datetime(2024, 4, 2, 10, 30, 15, 123000)
+        self.assertEqual(parse_token(encode_token(moment)), moment)
+
+        old = MeetingTombstone(meeting_id=999, user_id=self.guest_id, reason='deleted')
+        old.created_at = datetime.now(UTC) - timedelta(days=40)
+        db.session.add_all([old, MeetingTombstone(meeting_id=998, user_id=self.guest_id, reason='deleted')])
+        db.session.commit()
+        self.assertEqual(prune_tombstones(db.session, timedelta(days=30)), 1)
+        self.assertEqual(MeetingTombstone.query.count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
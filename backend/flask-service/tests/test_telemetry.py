@@ -0,0 +1,110 @@
+import time
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+import redis
+from flask import json
+from src import create_app, meeting_acl, meeting_cache, telemetry
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant
+from src.utils.telemetry import downsample, quality_score, validate_samples
+
+def redis_available():
+    try:
+        return redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class TestTelemetryFunctions(unittest.TestCase):
+    def test_quality_score(self):
+        """Test the quality heuristic bounds"""
+        self.assertEqual(quality_score(20, 0, 0), 100.0)
+        self.assertEqual(quality_score(450, 10, 0), 55.0)
+        self.assertEqual(quality_score(2000, 100, 1), 0.0)
+
+    def test_validate_samples(self):
+        """Test that malformed and skewed samples are dropped"""
+        now = 1_700_000_000.0
+        samples = [
+            {'ts': now, 'rtt_ms': 80, 'jitter_ms': 4, 'packet_loss': 0.01},
+            {'ts': now, 'rtt_ms': 'fast'},
+            {'ts': now - 3600, 'rtt_ms': 80},
+            {'ts': now, 'packet_loss': 2},
+            {'ts': now, 'rtt_ms': True},
+            'sample'
+        ]
+        valid, rejected = validate_samples(samples, max_batch=200, max_skew=600, now=now)
+        self.assertEqual(len(valid), 1)
+        self.assertEqual(rejected, 5)
+
+    def test_downsample(self):
+        """Test folding samples into fixed buckets of sums"""
+        samples = [{'ts': 1000.0 + i, 'rtt_ms': 50.0, 'jitter_ms': 0.0, 'packet_loss': 0.0} for i in range(25)]
+        buckets = downsample(samples, 10)
+        self.assertEqual([b['b'] for b in buckets], [1000, 1010, 1020])
+        self.assertEqual([b['n'] for b in buckets], [10, 10, 5])
+        self.assertEqual(buckets[0]['q'], 1000.0)
+
+class TestTelemetryIngest(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+
+        users = [User(email=f'telemetry{i}@example.com', name=f'Telemetry {i}', password='Telemetry-pass1!')
+                 for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id, self.attendee_id, self.outsider_id = [u.id for u in users]
+
+        now = datetime.now(UTC)
+        meeting = Meeting(title='Call', description='', start_time=now,
+                          end_time=now + timedelta(hours=1), created_by=self.host_id)
+        db.session.add(meeting)
+        db.session.commit()
+        self.meeting_id = meeting.id
+        db.session.add(MeetingParticipant(meeting_id=self.meeting_id, user_id=self.attendee_id, status='approved'))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def post(self, user_id, samples):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return self.client.post(f'/api/meetings/{self.meeting_id}/telemetry', json={'samples': samples},
+                                headers={'Authorization': f'Bearer {token}'})
+
+    def samples(self, count, rtt_ms=450):
+        now = time.time()
+        return [{'ts': now - i, 'rtt_ms': rtt_ms, 'jitter_ms': 10, 'packet_loss': 0} for i in range(count)]
+
+    def test_access_and_unavailable_redis(self):
+        """Test participant-only access and 503 without Redis"""
+        telemetry.redis = None
+        self.assertEqual(self.post(self.outsider_id, self.samples(1)).status_code, 403)
+        self.assertEqual(self.post(self.attendee_id, 'samples').status_code, 400)
+        self.assertEqual(self.post(self.attendee_id, self.samples(1)).status_code, 503)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_ingest_and_flush(self):
+        """Test that buffered samples are flushed into connection_quality"""
+        telemetry.redis.delete(telemetry.DIRTY_KEY, telemetry.totals_key(self.meeting_id),
+                               telemetry.ring_key(self.meeting_id, self.attendee_id))
+        response = self.post(self.attendee_id, self.samples(20))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(json.loads(response.data)['accepted'], 20)
+        self.assertTrue(telemetry.series(self.meeting_id, self.attendee_id))
+
+        self.assertEqual(telemetry.flush(), 1)
+        participant = MeetingParticipant.query.filter_by(meeting_id=self.meeting_id, user_id=self.attendee_id).one()
+        self.assertEqual(participant.connection_quality, 55.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import redis
+from flask import json
+from sqlalchemy import event
+from src import create_app, tokens
+from src.config import TestConfig
+from src.models import db, User
+
+def redis_available():
+    try:
+        return redis.from_url(TestConfig.REDIS_URL, socket_connect_timeout=0.2).ping()
+    except Exception:
+        return False
+
+class TestTokens(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.user = User(email='tokens@example.com', name='Token User', password='Tokens-pass1!')
+        db.session.add(self.user)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def auth(self, token):
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_token_types_are_not_interchangeable(self):
+        """Test that refresh tokens are rejected as access tokens and vice versa"""
+        pair = tokens.issue(self.user)
+        self.assertEqual(pair['expires_in'], 15 * 60)
+        self.assertEqual(self.client.get('/api/meetings/list', headers=self.auth(pair['refresh_token'])).status_code, 401)
+        response = self.client.post('/api/auth/refresh', json={'refresh_token': pair['token']})
+        self.assertEqual(response.status_code, 401)
+
+    def test_verify_token_skips_database(self):
+        """Test that verify-token checks the token without querying the database"""
+        tokens.redis = None
+        token = tokens.issue(self.user)['token']
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            response = self.client.post('/api/auth/verify-token', headers=self.auth(token))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['user']['id'], self.user.id)
+        self.assertEqual(statements, [])
+
+    def test_refresh_fails_closed_without_redis(self):
+        """Test that refresh is refused when reuse cannot be detected"""
+        tokens.redis = None
+        pair = tokens.issue(self.user)
+        response = self.client.post('/api/auth/refresh', json={'refresh_token': pair['refresh_token']})
+        self.assertEqual(response.status_code, 503)
+
+    def test_login_returns_refresh_token(self):
+        """Test that login issues an access/refresh pair"""
+        response = self.client.post('/api/auth/login', json={'email': 'tokens@example.com',
+                                                              'password': 'Tokens-pass1!'})
+        data = json.loads(response.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('refresh_token', data)
+        self.assertEqual(tokens.decode_access(data['token'])['user_id'], self.user.id)
+
+    @unittest.skipUnless(redis_available(), 'Redis not reachable at TEST_REDIS_URL')
+    def test_rotation_reuse_and_logout(self):
+        """Test refresh rotation, reuse detection and logout revocation"""
+        first = tokens.issue(self.user)
+        response = self.client.post('/api/auth/refresh', json={'refresh_token': first['refresh_token']})
+        self.assertEqual(response.status_code, 200)
+        second = json.loads(response.data)
+
+        # Reusing the consumed refresh token revokes the whole family
+        response = self.client.post('/api/auth/refresh', json={'refresh_token': first['refresh_token']})
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get('/api/meetings/list', headers=self.auth(second['token']))
+        self.assertEqual(json.loads(response.data)['code'], 'token_revoked')
+
+        other = tokens.issue(self.user)
+        self.assertEqual(self.client.post('/api/auth/logout', headers=self.auth(other['token'])).status_code, 200)
+        response = self.client.post('/api/auth/verify-token', headers=self.auth(other['token']))
+        self.assertEqual(response.status_code, 401)
+
+if __name__ == '__main__':
+    unittest.main()
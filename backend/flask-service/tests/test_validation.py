@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+import jwt
+from flask import json
+from src import create_app, meeting_acl, meeting_cache, meeting_events, tokens
+from src.config import TestConfig
+from src.models import db, User
+from src.routes.auth import REGISTER_SCHEMA
+from src.routes.meetings import CREATE_MEETING_SCHEMA
+from src.utils.schema import Field, Schema, clean_html
+
+def meeting_body(**overrides):
+    start = datetime.now(UTC) + timedelta(hours=1)
+    return {'title': 'Planning', 'description': 'Q3', 'start_time': start.isoformat(),
+            'end_time': (start + timedelta(hours=1)).isoformat(), **overrides}
+
+class TestSchema(unittest.TestCase):
+    def test_reports_every_error(self):
+        values, errors = CREATE_MEETING_SCHEMA.validate(meeting_body(
+            title='  ', start_time='tomorrow', meeting_type='webinar', max_participants=0, co_hosts=[1, '2']))
+        self.assertEqual(set(errors), {'title', 'start_time', 'meeting_type', 'max_participants', 'co_hosts'})
+        self.assertEqual(errors['start_time'], 'Invalid datetime format. Please use ISO format')
+        self.assertEqual(errors['co_hosts'], 'Co-hosts must be a list of user ids')
+
+    def test_coerces_and_fills_defaults(self):
+        values, errors = CREATE_MEETING_SCHEMA.validate(meeting_body(title=' <script>Plan</script> ', start_time='2099-01-01T10:00:00Z'))
+        self.assertEqual(errors, {'end_time': 'Start time must be before end time'})
+        self.assertEqual(values['title'], '&lt;script&gt;Plan&lt;/script&gt;')
+        self.assertEqual(values['start_time'], datetime(2099, 1, 1, 10, tzinfo=UTC))
+        self.assertEqual((values['meeting_type'], values['requires_approval'], values['co_hosts']), ('regular', False, []))
+
+    def test_cross_field_checks(self):
+        naive = meeting_body(start_time='2099-01-01T10:00:00')
+        self.assertEqual(CREATE_MEETING_SCHEMA.validate(naive)[1], {'start_time': 'Timezone information is required'})
+        start = datetime.now(UTC) + timedelta(hours=1)
+        short = meeting_body(end_time=(start + timedelta(minutes=2)).isoformat(), start_time=start.isoformat())
+        self.assertEqual(CREATE_MEETING_SCHEMA.validate(short)[1], {'end_time': 'Meeting must be at least 5 minutes long'})
+        recurring = meeting_body(meeting_type='recurring')
+        self.assertIn('recurring_pattern', CREATE_MEETING_SCHEMA.validate(recurring)[1])
+
+    def test_register_schema(self):
+        values, errors = REGISTER_SCHEMA.validate({'email': ' Ann@Example.COM ', 'name': 'Ann Lee', 'password': 'Str0ng!pass'})
+        self.assertEqual(errors, {})
+        self.assertEqual(values['email'], 'ann@example.com')
+        _, errors = REGISTER_SCHEMA.validate({'email': 'nope', 'password': 'weakpassword'})
+        self.assertEqual(set(errors), {'email', 'name', 'password'})
+        self.assertEqual(errors['name'], 'name is required')
+
+    def test_field_rules(self):
+        schema = Schema({'n': Field(int, required=True), 'tags': Field(list, items=Field(str, max_length=3))})
+        self.assertEqual(schema.validate({'n': True})[1], {'n': 'n must be an integer'})
+        self.assertEqual(schema.validate({'n': 1, 'tags': ['abcd']})[1], {'tags': 'tags items too long (max 3)'})
+        self.assertEqual(schema.validate(['n'])[1], {'body': 'No data provided'})
+
+    def test_clean_html_matches_bleach(self):
+        import bleach
+        for text in ['plain "text" é', 'a <b>b</b> & c', 'nul\x00 and\r\n', '<script>x</script>']:
+            self.assertEqual(clean_html(text), bleach.clean(text))
+
+class TestValidationResponses(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+        tokens.redis = None
+        user = User(email='validate@example.com', name='Validate', password='Validate-pass1!')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_create_meeting_lists_all_errors(self):
+        token = jwt.encode({'user_id': self.user_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        response = self.client.post('/api/meetings/create', headers={'Authorization': f'Bearer {token}'},
+                                    json=meeting_body(title='', is_recorded='yes', description=None))
+        self.assertEqual(response.status_code, 400)
+        body = json.loads(response.data)
+        self.assertEqual(set(body['errors']), {'title', 'description', 'is_recorded'})
+        self.assertEqual(body['error'], body['errors']['title'])
+
+        response = self.client.post('/api/meetings/create', headers={'Authorization': f'Bearer {token}'},
+                                    json=meeting_body(title='<u>Kickoff</u> & more'))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data)['title'], '&lt;u&gt;Kickoff&lt;/u&gt; &amp; more')
+
+    def test_register_lists_all_errors(self):
+        response = self.client.post('/api/auth/register', json={'email': 'bad', 'name': 'x', 'password': 'short'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(json.loads(response.data)['errors']), {'email', 'name', 'password'})
+        self.assertEqual(self.client.post('/api/auth/register', data='nope').status_code, 400)
+
+        response = self.client.post('/api/auth/register', json={
+            'email': 'New.User@Example.com', 'name': 'New User', 'password': 'New-pass1!'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data)['user']['email'], 'new.user@example.com')
+
+if __name__ == '__main__':
+    unittest.main()
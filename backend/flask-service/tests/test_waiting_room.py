@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime, timedelta, UTC
+from unittest import mock
+import jwt
+from flask import json
+from sqlalchemy import event
+from src import create_app, meeting_acl, meeting_cache, meeting_events
+from src.config import TestConfig
+from src.models import db, User, Meeting, MeetingParticipant, MeetingAuditLog
+
+class TestWaitingRoomDecisions(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        meeting_acl.redis = None
+        meeting_cache.redis = None
+        meeting_events.redis = None
+
+        users = [User(email=f'waiting{i}@example.com', name=f'Waiting {i}', password='Waiting-pass1!')
+                 for i in range(6)]
+        db.session.add_all(users)
+        db.session.commit()
+        self.host_id = users[0].id
+
+        now = datetime.now(UTC)
+        meeting = Meeting(title='Webinar', description='', start_time=now,
+                          end_time=now + timedelta(hours=1), created_by=self.host_id,
+                          requires_approval=True, max_participants=3)
+        db.session.add(meeting)
+        db.session.commit()
+        self.meeting_id = meeting.id
+
+        self.participant_ids = []
+        for i, user in enumerate(users[1:]):
+            participant = MeetingParticipant(meeting_id=self.meeting_id, user_id=user.id)
+            participant.created_at = now + timedelta(seconds=i)
+            db.session.add(participant)
+            db.session.flush()
+            self.participant_ids.append(participant.id)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def decide(self, body):
+        token = jwt.encode({'user_id': self.host_id, 'exp': datetime.now(UTC) + timedelta(hours=1)},
+                           TestConfig.JWT_SECRET_KEY, algorithm='HS256')
+        return self.client.post(f'/api/meetings/{self.meeting_id}/waiting-room/decisions', json=body,
+                                headers={'Authorization': f'Bearer {token}'})
+
+    def statuses(self):
+        db.session.expire_all()
+        return [db.session.get(MeetingParticipant, (i, self.meeting_id)).status for i in self.participant_ids]
+
+    def test_approve_next_is_capped_by_capacity(self):
+        """Test that approve-next takes the earliest arrivals up to capacity"""
+        with mock.patch.object(meeting_events, 'publish') as publish:
+            response = self.decide({'action': 'approve', 'next': 10})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['approved'], self.participant_ids[:3])
+        self.assertEqual(data['remaining_capacity'], 0)
+        self.assertEqual(self.statuses(), ['approved'] * 3 + ['pending'] * 2)
+
+        publish.assert_called_once()
+        self.assertEqual(len(publish.call_args[0][2]['approved']), 3)
+        self.assertEqual(MeetingAuditLog.query.filter_by(action='approved_participants').count(), 1)
+
+        response = self.decide({'action': 'approve', 'next': 1})
+        self.assertEqual(response.status_code, 400)
+
+    def test_reject_list_skips_non_pending(self):
+        """Test that a rejection list ignores unknown and already decided ids"""
+        self.decide({'action': 'approve', 'participant_ids': [self.participant_ids[0]]})
+        response = self.decide({'action': 'reject',
+                                'participant_ids': self.participant_ids[:2] + [9999]})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['declined'], [self.participant_ids[1]])
+        self.assertEqual(data['skipped'], [self.participant_ids[0], 9999])
+        self.assertEqual(self.statuses()[:2], ['approved', 'declined'])
+
+    def test_decision_is_one_update(self):
+        """Test that a batch issues a single UPDATE"""
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            response = self.decide({'action': 'reject', 'participant_ids': self.participant_ids})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len([s for s in statements if s.lstrip().upper().startswith('UPDATE')]), 1)
+
+    def test_validation(self):
+        """Test malformed decision requests"""
+        self.assertEqual(self.decide({'action': 'ban', 'next': 1}).status_code, 400)
+        self.assertEqual(self.decide({'action': 'approve'}).status_code, 400)
+        self.assertEqual(self.decide({'action': 'approve', 'next': 0}).status_code, 400)
+        self.assertEqual(self.decide({'action': 'approve', 'participant_ids': 'all'}).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
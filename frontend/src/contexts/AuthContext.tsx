@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useState, useEffect } from 'react';
+import React, { createContext, useContext, useState, useEffect, useCallback } from 'react';
 import { User } from '@/types/user';
 
 interface AuthContextType {
@@ -14,18 +14,79 @@ const AuthContext = createContext<AuthContextType | undefined>(undefined);
 export function AuthProvider({ children }: { children: React.ReactNode }) {
   const [user, setUser] = useState<User | null>(null);
   const [token, setToken] = useState<string | null>(null);
+  const [expiresAt, setExpiresAt] = useState<number | null>(null);
+
+  const storeSession = (data: { token: string; refresh_token?: string; expires_in?: number }) => {
+    setToken(data.token);
+    localStorage.setItem('token', data.token);
+    if (data.refresh_token) {
+      localStorage.setItem('refresh_token', data.refresh_token);
+    }
+    if (data.expires_in) {
+      const at = Date.now() + data.expires_in * 1000;
+      setExpiresAt(at);
+      localStorage.setItem('token_expires_at', String(at));
+    }
+  };
+
+  const clearSession = () => {
+    setUser(null);
+    setToken(null);
+    setExpiresAt(null);
+    localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
+    localStorage.removeItem('token_expires_at');
+    localStorage.removeItem('user');
+  };
+
+  const refresh = useCallback(async () => {
+    const apiUrl = process.env.NEXT_PUBLIC_API_URL;
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!apiUrl || !refreshToken) {
+      return;
+    }
+
+    const response = await fetch(`${apiUrl}/api/auth/refresh`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    });
+
+    if (response.status === 401) {
+      clearSession();
+      return;
+    }
+    if (response.ok) {
+      storeSession(await response.json());
+    }
+  }, []);
 
   useEffect(() => {
     // Load user data from localStorage on mount
     const storedToken = localStorage.getItem('token');
     const storedUser = localStorage.getItem('user');
+    const storedExpiry = localStorage.getItem('token_expires_at');
     
     if (storedToken && storedUser) {
       setToken(storedToken);
       setUser(JSON.parse(storedUser));
+      setExpiresAt(storedExpiry ? Number(storedExpiry) : null);
     }
   }, []);
 
+  useEffect(() => {
+    // Rotate the access token a minute before it expires
+    if (!expiresAt) {
+      return;
+    }
+    const timer = setTimeout(() => {
+      refresh().catch(() => undefined);
+    }, Math.max(expiresAt - Date.now() - 60000, 0));
+    return () => clearTimeout(timer);
+  }, [expiresAt, refresh]);
+
   const login = async (email: string, password: string) => {
     try {
       const apiUrl = process.env.NEXT_PUBLIC_API_URL;
@@ -47,10 +108,9 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
       }
 
       const data = await response.json();
-      setToken(data.token);
+      storeSession(data);
       setUser(data.user);
       
-      localStorage.setItem('token', data.token);
       localStorage.setItem('user', JSON.stringify(data.user));
     } catch (error) {
       throw error;
@@ -78,10 +138,9 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
       }
 
       const data = await response.json();
-      setToken(data.token);
+      storeSession(data);
       setUser(data.user);
       
-      localStorage.setItem('token', data.token);
       localStorage.setItem('user', JSON.stringify(data.user));
     } catch (error) {
       throw error;
@@ -89,10 +148,17 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
   };
 
   const logout = async () => {
-    setUser(null);
-    setToken(null);
-    localStorage.removeItem('token');
-    localStorage.removeItem('user');
+    const apiUrl = process.env.NEXT_PUBLIC_API_URL;
+    if (apiUrl && token) {
+      // Revoke server-side; the local session is cleared regardless
+      await fetch(`${apiUrl}/api/auth/logout`, {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${token}`,
+        },
+      }).catch(() => undefined);
+    }
+    clearSession();
   };
 
   return (
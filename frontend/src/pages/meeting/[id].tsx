@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useRouter } from 'next/router';
 import { useAuth } from '@/contexts/AuthContext';
 import Layout from '@/components/layout/Layout';
@@ -6,6 +6,10 @@ import VideoConference from '@/components/meeting/VideoConference';
 import Whiteboard from '@/components/meeting/Whiteboard';
 import Chat from '@/components/meeting/Chat';
 
+// The API forgets a participant PRESENCE_TTL_SECONDS (45 s) after their
+// last heartbeat; send one every third of that
+const HEARTBEAT_INTERVAL_MS = 15000;
+
 interface Meeting {
   id: number;
   title: string;
@@ -25,17 +29,61 @@ export default function MeetingRoom() {
   const [activeTab, setActiveTab] = useState<'whiteboard' | 'chat'>('chat');
   const [error, setError] = useState('');
 
+  // The access token rotates every few minutes; requests read the current
+  // one here so that a rotation does not re-run the join and presence effects
+  const tokenRef = useRef(token);
+  tokenRef.current = token;
+  const signedIn = Boolean(token);
+
   useEffect(() => {
-    if (id && token) {
+    if (id && signedIn) {
       fetchMeetingDetails();
     }
-  }, [id, token]);
+  }, [id, signedIn]);
+
+  // Keep this user's presence in the meeting alive while the room is open
+  useEffect(() => {
+    if (!meeting || !signedIn) return;
+
+    const presenceUrl = `${process.env.NEXT_PUBLIC_API_URL}/api/meetings/${meeting.id}/presence`;
+    const heartbeat = async () => {
+      try {
+        const response = await fetch(presenceUrl, {
+          method: 'POST',
+          headers: {
+            Authorization: `Bearer ${tokenRef.current}`
+          }
+        });
+        // Registration lapsed (e.g. the tab slept): join again to restore it
+        if (response.status === 409) {
+          fetchMeetingDetails();
+        }
+      } catch {
+        // The next heartbeat retries
+      }
+    };
+    const timer = setInterval(heartbeat, HEARTBEAT_INTERVAL_MS);
+
+    // Runs when the user leaves the room or signs out
+    return () => {
+      clearInterval(timer);
+      if (!tokenRef.current) return;
+      // keepalive lets the request outlive the page it was sent from
+      fetch(presenceUrl, {
+        method: 'DELETE',
+        keepalive: true,
+        headers: {
+          Authorization: `Bearer ${tokenRef.current}`
+        }
+      }).catch(() => {});
+    };
+  }, [meeting?.id, signedIn]);
 
   const fetchMeetingDetails = async () => {
     try {
       const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/meetings/join/${id}`, {
         headers: {
-          Authorization: `Bearer ${token}`
+          Authorization: `Bearer ${tokenRef.current}`
         }
       });
 